@@ -0,0 +1,76 @@
+from django.db.models import Count, DateTimeField, F, Max, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from app_articles.batches import DeleteBatch
+from app_articles.cache import invalidate_articles_list
+from app_articles.models import Article, ArticleComment
+
+
+def comment_added(comment):
+    """
+    Counts a new comment in Article.comment_count, reply_count and last_comment_at, with one atomic UPDATE ... F()
+    run by the post_save of ArticleComment, inside the transaction of the INSERT.
+    The comment count is part of the articles list, so its `updated` (and `changed_at`) is bumped and the cached pages
+    are dropped.
+    """
+    created = Value(comment.created, output_field=DateTimeField())
+    Article.objects.filter(pk=comment.article_id).update(
+        comment_count=F('comment_count') + 1,
+        reply_count=F('reply_count') + int(comment.is_reply),
+        last_comment_at=Greatest(Coalesce('last_comment_at', created), created),
+        updated=timezone.now(),
+        changed_at=timezone.now(),
+    )
+    invalidate_articles_list()
+
+
+class RemovedCommentsBatch(DeleteBatch):
+    """
+    Articles whose comments are being deleted, rebuilt with one rebuild_comment_counts() after the last deleted row,
+    in the transaction of the delete. Django sends pre_delete for every comment deleted by CASCADE too (replies of a
+    deleted comment, comments of a deleted article): counting them one UPDATE at a time cost one statement per deleted
+    comment. The articles being deleted themselves are left out.
+    """
+    connection_attribute = 'removed_comments_batch'
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.article_ids = set()
+        self.deleted_article_ids = set()
+
+    def add(self, instance):
+        if isinstance(instance, Article):
+            self.deleted_article_ids.add(instance.pk)
+        else:
+            self.article_ids.add(instance.article_id)
+
+    def run(self):
+        article_ids = self.article_ids - self.deleted_article_ids
+        if article_ids:
+            rebuild_comment_counts(article_ids)
+
+
+def rebuild_comment_counts(article_ids=None):
+    """
+    Recomputes Article.comment_count, reply_count and last_comment_at from the comments table with a single UPDATE.
+    If article_ids is None every article is rebuilt. Their `updated` is bumped, as in comment_added.
+    Returns the number of updated articles.
+    """
+    comments = ArticleComment.objects.filter(article=OuterRef('pk')).order_by().values('article')
+
+    def aggregate(expression):
+        return Subquery(comments.annotate(value=expression).values('value'))
+
+    articles = Article.objects.all()
+    if article_ids is not None:
+        articles = articles.filter(pk__in=article_ids)
+    updated = articles.update(
+        comment_count=Coalesce(aggregate(Count('id')), 0),
+        reply_count=Coalesce(aggregate(Count('id', filter=Q(is_reply=True))), 0),
+        last_comment_at=aggregate(Max('created')),
+        updated=timezone.now(),
+        changed_at=timezone.now(),
+    )
+    invalidate_articles_list()
+    return updated
@@ -0,0 +1,113 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+
+class LocalTokenCache:
+    """
+    Bounded LRU of token key -> credentials (see CachedTokenAuthentication), kept in process memory. Entries expire
+    after AUTH_TOKEN_LOCAL_CACHE_TIMEOUT seconds, which bounds how long another process may keep using a token that
+    was deleted or a user that was deactivated (this process and the shared cache are invalidated right away).
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        timeout = settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT
+        if timeout <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > settings.AUTH_TOKEN_LOCAL_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_token_cache = LocalTokenCache()
+
+
+def get_token_cache():
+    return caches[settings.AUTH_TOKEN_CACHE_ALIAS]
+
+
+def token_cache_key(key):
+    # Tokens are credentials, they are not stored in plain text as keys of the shared cache.
+    return 'auth:credentials:' + hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def invalidate_token(key):
+    local_token_cache.delete(key)
+    get_token_cache().delete(token_cache_key(key))
+
+
+def instance_from_values(model, values):
+    """
+    Builds an instance of model as if it was loaded from the database with only the fields in values (attname ->
+    value): the rest are deferred, and loaded with one query if they are ever read.
+    """
+    names = [field.attname for field in model._meta.concrete_fields if field.attname in values]
+    return model.from_db(None, names, [values[name] for name in names])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that keeps the result of the Token -> CustomUser lookup in two cache tiers: a local LRU
+    (LocalTokenCache) and the shared Django cache AUTH_TOKEN_CACHE_ALIAS. So most authenticated requests run no query
+    to authenticate.
+    Only what authentication and permissions read is cached (CACHED_USER_FIELDS and the creation of the token), never
+    the password hash, and every request gets new instances built from it: model instances carry caches of their
+    related objects, which must not be shared between requests.
+    Entries are dropped when their Token is deleted or their user is saved (e.g. is_active changed), see the
+    receivers in app_articles.models.
+    """
+    CACHED_USER_FIELDS = ['id', 'username', 'is_active', 'is_staff', 'is_superuser']
+
+    def authenticate_credentials(self, key):
+        credentials = local_token_cache.get(key)
+        if credentials is None:
+            credentials = get_token_cache().get(token_cache_key(key))
+            if credentials is not None:
+                local_token_cache.set(key, credentials)
+
+        if credentials is None:
+            user, token = super().authenticate_credentials(key)
+            credentials = ({name: getattr(user, name) for name in self.CACHED_USER_FIELDS}, token.created)
+            get_token_cache().set(token_cache_key(key), credentials, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+            local_token_cache.set(key, credentials)
+
+        user_values, created = credentials
+        if not user_values['is_active']:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        user = instance_from_values(get_user_model(), user_values)
+        token = instance_from_values(self.get_model(), {'key': key, 'user_id': user.pk, 'created': created})
+        token.user = user
+        return user, token
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+
+from app_articles.exceptions import LoginUnavailable
+
+UserModel = get_user_model()
+
+
+class PasswordVerifier:
+    """
+    Bounded pool of threads that run the password hashing of the logins.
+
+    At most LOGIN_HASH_WORKERS hashes run at once and at most LOGIN_HASH_QUEUE more wait for a thread, so a burst of
+    logins can only take that much CPU; the login requests beyond that are rejected right away with a 503
+    (LoginUnavailable) instead of piling up and starving the rest of the endpoints.
+    Only CPU work is done in the pool: database queries stay in the request thread (and its connection).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor = None
+        self.slots = None
+
+    def start(self):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=settings.LOGIN_HASH_WORKERS,
+                                                   thread_name_prefix='password-hashing')
+                self.slots = threading.BoundedSemaphore(settings.LOGIN_HASH_WORKERS + settings.LOGIN_HASH_QUEUE)
+
+    def run(self, function, *args):
+        self.start()
+        if not self.slots.acquire(blocking=False):
+            raise LoginUnavailable()
+
+        future = self.executor.submit(function, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+        try:
+            return future.result(timeout=settings.LOGIN_HASH_TIMEOUT)
+        except TimeoutError:
+            raise LoginUnavailable()
+
+
+password_verifier = PasswordVerifier()
+
+
+def verify_password(password, encoded):
+    """
+    Returns (is_correct, new_encoded). Same as django.contrib.auth.hashers.check_password, but instead of saving the
+    rehashed password it returns it (None if no rehash is needed), so that the caller saves it with its own database
+    connection.
+    """
+    rehashed = []
+    is_correct = check_password(password, encoded, setter=lambda raw: rehashed.append(make_password(raw)))
+    return is_correct, rehashed[0] if rehashed else None
+
+
+def run_default_hasher(password):
+    make_password(password)
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that verifies passwords in the bounded password_verifier pool.
+    As in ModelBackend, a password stored with another hasher or other work factors than the current policy
+    (PASSWORD_HASHER and PASSWORD_* settings) is transparently rehashed after a successful login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            password_verifier.run(run_default_hasher, password)
+        else:
+            is_correct, new_encoded = password_verifier.run(verify_password, password, user.password)
+            if new_encoded is not None:
+                user.password = new_encoded
+                user.save(update_fields=['password'])
+            if is_correct and self.user_can_authenticate(user):
+                return user
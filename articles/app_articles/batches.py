@@ -0,0 +1,53 @@
+from django.db import transaction
+
+
+class DeleteBatch:
+    """
+    Work collected by the pre_delete of many rows (e.g. every row deleted by CASCADE) and done at once, by run(), from
+    the post_delete of the last of them. Django sends both signals inside the transaction of the delete, so run() is
+    committed or rolled back with the rows it was collected from.
+    The receivers call collect(instance) from pre_delete and deleted() from post_delete.
+    """
+    # Attribute of the connection holding the batch of the delete in progress, one per subclass.
+    connection_attribute = None
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.pending = 0
+
+    @classmethod
+    def collect(cls, instance):
+        connection = transaction.get_connection()
+        batch = getattr(connection, cls.connection_attribute, None)
+        if batch is None or not batch.in_transaction():
+            batch = cls(connection)
+            setattr(connection, cls.connection_attribute, batch)
+            transaction.on_commit(batch)
+        batch.pending += 1
+        batch.add(instance)
+
+    @classmethod
+    def deleted(cls):
+        connection = transaction.get_connection()
+        batch = getattr(connection, cls.connection_attribute, None)
+        if batch is not None:
+            batch.pending -= 1
+            if not batch.pending:
+                setattr(connection, cls.connection_attribute, None)
+                batch.run()
+
+    def __call__(self):
+        # Registered with on_commit only to tell whether the transaction of the batch is still open (see
+        # in_transaction): the batch has already been run by the post_delete of its last row.
+        pass
+
+    def in_transaction(self):
+        # A delete that failed leaves its batch behind, with rows that were never deleted. Its transaction (or
+        # savepoint) was rolled back, which dropped the on_commit callbacks registered in it, this batch included.
+        return any(callback[1] is self for callback in self.connection.run_on_commit)
+
+    def add(self, instance):
+        raise NotImplementedError
+
+    def run(self):
+        raise NotImplementedError
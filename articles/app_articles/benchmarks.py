@@ -0,0 +1,307 @@
+import io
+import json
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+from django.contrib.auth.hashers import make_password
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from app_articles.activity import rebuild_comment_counts
+from app_articles.cache import invalidate_articles_list
+from app_articles.models import Article, ArticleComment, CustomUser, make_summary
+from app_articles.reports import rebuild_report_counts
+from app_articles.threads import fill_comment_paths
+
+# Every seeded user is named BENCHMARK_USER_PREFIX<n> and logs in with BENCHMARK_PASSWORD, the first one is staff.
+# The users registered by the benchmark share the prefix, so that seeding again deletes them too.
+BENCHMARK_USER_PREFIX = 'bench_user_'
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+WORDS = ['django', 'python', 'database', 'index', 'query', 'cache', 'latency', 'thread', 'server', 'request',
+         'article', 'comment', 'report', 'token', 'replica', 'pool', 'serializer', 'pagination', 'search', 'async']
+
+
+def benchmark_users():
+    return CustomUser.objects.filter(username__startswith=BENCHMARK_USER_PREFIX)
+
+
+def seed_dataset(users, articles_per_user, comments_per_article, reply_depth, reports_per_article, seed=0,
+                 batch_size=1000):
+    """
+    Creates the benchmark dataset with bulk_create, replacing the previous one (every row of the benchmark users is
+    deleted by CASCADE):
+        users (with their tokens), articles_per_user articles of each user (public ones and private ones),
+        comments_per_article comments on each article, each one followed by a chain of reply_depth replies, and
+        reports_per_article reports of each article.
+    bulk_create() sends no signals, so the denormalized columns and the search index are rebuilt at the end.
+    The texts are drawn from a random.Random(seed), so the same arguments always seed the same data.
+    Returns the number of rows created per model.
+    """
+    rng = random.Random(seed)
+
+    def sentence(words):
+        return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+    with transaction.atomic():
+        benchmark_users().delete()
+
+        password = make_password(BENCHMARK_PASSWORD)
+        now = timezone.now()
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'{BENCHMARK_USER_PREFIX}{i}', email=f'{BENCHMARK_USER_PREFIX}{i}@example.com',
+                       password=password, birth=now, level=CustomUser.SENIOR, gender=CustomUser.OTHER,
+                       is_staff=i == 0)
+            for i in range(users)
+        ], batch_size=batch_size)
+        user_ids = list(benchmark_users().order_by('pk').values_list('pk', flat=True))
+        Token.objects.bulk_create([Token(key=Token.generate_key(), user_id=pk) for pk in user_ids],
+                                  batch_size=batch_size)
+
+        articles = []
+        for user_id in user_ids:
+            for _ in range(articles_per_user):
+                text = sentence(80)
+                articles.append(Article(title=f'Bench {len(articles)}', text=text,
+                                        summary=make_summary(text, 200), is_public=rng.random() < 0.8,
+                                        author_id=user_id))
+        article_ids = bulk_create_ids(Article, articles, batch_size)
+
+        comment_count = 0
+        replied = [(article_id, None) for article_id in article_ids for _ in range(comments_per_article)]
+        for level in range(reply_depth + 1):
+            comments = [ArticleComment(message=sentence(12), article_id=article_id, is_reply=level > 0,
+                                       comment_reply_id=replied_id, author_comment_id=rng.choice(user_ids))
+                        for article_id, replied_id in replied]
+            comment_ids = bulk_create_ids(ArticleComment, comments, batch_size)
+            replied = [(comment.article_id, pk) for comment, pk in zip(comments, comment_ids)]
+            comment_count += len(comments)
+
+        reporters = user_ids[:reports_per_article]
+        through = Article.users_reports.through
+        through.objects.bulk_create([through(article_id=article_id, customuser_id=user_id)
+                                     for article_id in article_ids for user_id in reporters], batch_size=batch_size)
+
+        fill_comment_paths(article_ids)
+        rebuild_comment_counts(article_ids)
+        rebuild_report_counts(article_ids)
+        invalidate_articles_list()
+
+    call_command('rebuild_search_index', stdout=io.StringIO())
+    return {'users': len(user_ids), 'articles': len(article_ids), 'comments': comment_count,
+            'reports': len(article_ids) * len(reporters)}
+
+
+def bulk_create_ids(model, objects, batch_size):
+    """
+    bulk_create() that returns the ids of the created objects, in order, also on the databases that do not return
+    them from the INSERT (SQLite): ids are sequential, and the dataset is written in a single transaction.
+    """
+    last_id = model.objects.aggregate(last_id=Max('pk'))['last_id'] or 0
+    model.objects.bulk_create(objects, batch_size=batch_size)
+    return list(model.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True))
+
+
+class BenchmarkData:
+    """
+    Ids and tokens of the seeded dataset the scenarios send requests about.
+    """
+
+    def __init__(self):
+        self.users = list(benchmark_users().order_by('pk').values_list('pk', 'username', 'auth_token__key'))
+        if not self.users:
+            raise LookupError('There is no benchmark dataset, run python manage.py seed_benchmark_data first.')
+        self.admin_token = self.users[0][2]
+        articles = Article.objects.filter(author__username__startswith=BENCHMARK_USER_PREFIX)
+        self.article_ids = list(articles.filter(is_public=True).order_by('pk').values_list('pk', flat=True))
+        self.comment_ids = list(ArticleComment.objects.filter(article_id__in=self.article_ids[:100], depth=0)
+                                .order_by('pk').values_list('pk', flat=True))
+        self.run = uuid.uuid4().hex[:6]
+
+    def user(self, i):
+        return self.users[i % len(self.users)]
+
+    def article(self, i):
+        return self.article_ids[i % len(self.article_ids)]
+
+    def comment(self, i):
+        return self.comment_ids[i % len(self.comment_ids)]
+
+
+def report_targets(data, requests):
+    """
+    Setup of the report scenario: fresh articles, so that every (user, article) pair is reported once only.
+    """
+    author_id = data.users[0][0]
+    articles = [Article(title=f'Bench report {data.run} {i}', text='Reported', summary='Reported', is_public=True,
+                        author_id=author_id) for i in range(requests // len(data.users) + 1)]
+    return bulk_create_ids(Article, articles, 1000)
+
+
+# name: (method, setup or None, request(data, context, i) -> (path, body, token)). The names are the keys of the
+# baselines, keep them stable.
+SCENARIOS = {
+    'articles.list': ('GET', None, lambda data, context, i: ('/articles/', None, None)),
+    'articles.retrieve': ('GET', None, lambda data, context, i: (f'/articles/{data.article(i)}/', None, None)),
+    'articles.search': ('GET', None, lambda data, context, i: (f'/articles/search/?q={WORDS[i % len(WORDS)]}',
+                                                               None, None)),
+    'articles.create': ('POST', None, lambda data, context, i: (
+        '/articles/', {'title': f'Bench {data.run} {i}', 'text': 'Benchmark text', 'is_public': True},
+        data.admin_token)),
+    'comments.list': ('GET', None, lambda data, context, i: (f'/articles-comments/?article={data.article(i)}', None,
+                                                             data.user(i)[2])),
+    'comments.retrieve': ('GET', None, lambda data, context, i: (f'/articles-comments/{data.comment(i)}/', None,
+                                                                 data.user(i)[2])),
+    'comments.tree': ('GET', None, lambda data, context, i: (f'/articles-comments/tree/?article={data.article(i)}',
+                                                             None, data.user(i)[2])),
+    'comments.create': ('POST', None, lambda data, context, i: (
+        '/articles-comments/', {'message': 'Benchmark comment', 'article': data.article(i)}, data.user(i)[2])),
+    'replies.create': ('POST', None, lambda data, context, i: (
+        '/reply/articles-comments/', {'message': 'Benchmark reply', 'comment_reply': data.comment(i)},
+        data.user(i)[2])),
+    'users.list': ('GET', None, lambda data, context, i: ('/users/', None, data.user(i)[2])),
+    'users.retrieve': ('GET', None, lambda data, context, i: (f'/users/{data.user(i + 1)[1]}/', None,
+                                                              data.user(i)[2])),
+    'users.create': ('POST', None, lambda data, context, i: (
+        '/users/', {'username': f'{BENCHMARK_USER_PREFIX}{data.run}_{i}',
+                    'email': f'{BENCHMARK_USER_PREFIX}{data.run}_{i}@example.com',
+                    'password': BENCHMARK_PASSWORD, 'gender': 'O', 'birth': '2000-01-01T00:00:00Z', 'level': 'SR'},
+        None)),
+    'reports.list': ('GET', None, lambda data, context, i: ('/report/', None, None)),
+    'reports.retrieve': ('GET', None, lambda data, context, i: (f'/report/{data.article(i)}', None, None)),
+    'reports.create': ('POST', report_targets, lambda data, context, i: (
+        f'/report/{context[i // len(data.users)]}', None, data.user(i)[2])),
+    'login': ('POST', None, lambda data, context, i: (
+        '/api/login/', {'username': data.user(i)[1], 'password': BENCHMARK_PASSWORD}, None)),
+}
+
+
+class WSGITransport:
+    """
+    Sends the requests to the WSGI application of this process, without any network or server in between.
+    """
+
+    def __init__(self):
+        self.handler = WSGIHandler()
+
+    def send(self, method, path, body=None, token=None):
+        url = urlsplit(path)
+        data = json.dumps(body).encode() if body is not None else b''
+        environ = {
+            'REQUEST_METHOD': method, 'PATH_INFO': url.path, 'QUERY_STRING': url.query, 'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(data), 'CONTENT_LENGTH': str(len(data)), 'CONTENT_TYPE': 'application/json',
+        }
+        if token:
+            environ['HTTP_AUTHORIZATION'] = f'Token {token}'
+        started = []
+        response = self.handler(environ, lambda status, headers, *_: started.append((status, headers)))
+        try:
+            b''.join(response)
+        finally:
+            response.close()
+        status, headers = started[0]
+        return int(status.split()[0]), dict(headers)
+
+
+class HTTPTransport:
+    """
+    Sends the requests to a running server (runserver, gunicorn, uvicorn...) at base_url.
+    """
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def send(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Token {token}'
+        data = json.dumps(body).encode() if body is not None else None
+        request = Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with urlopen(request) as response:
+                response.read()
+                return response.status, dict(response.headers)
+        except HTTPError as error:
+            return error.code, dict(error.headers)
+
+
+def run_scenario(transport, data, name, requests, concurrency):
+    """
+    Sends `requests` requests of the scenario name, `concurrency` at once, and returns its figures (see summarize).
+    """
+    method, setup, make_request = SCENARIOS[name]
+    context = setup(data, requests) if setup is not None else None
+
+    def send(i):
+        path, body, token = make_request(data, context, i)
+        start = time.perf_counter()
+        status, headers = transport.send(method, path, body, token)
+        queries = headers.get('X-DB-Queries')
+        return time.perf_counter() - start, status, int(queries) if queries is not None else None
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(send, range(requests)))
+    else:
+        samples = [send(i) for i in range(requests)]
+    return summarize(samples, time.perf_counter() - start)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def summarize(samples, elapsed):
+    """
+    Figures of a scenario from its (latency in seconds, status, queries or None) samples: throughput (requests/s),
+    latencies in ms, errors (status >= 400) and the queries per request (X-DB-Queries header).
+    """
+    latencies = [latency * 1000 for latency, _, _ in samples]
+    queries = [count for _, _, count in samples if count is not None]
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, status, _ in samples if status >= 400),
+        'throughput': round(len(samples) / elapsed, 2),
+        'mean_ms': round(statistics.mean(latencies), 3),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'queries_mean': round(statistics.mean(queries), 2) if queries else None,
+        'queries_max': max(queries) if queries else None,
+    }
+
+
+def compare_baselines(baseline, current, threshold):
+    """
+    Returns the regressions of the scenarios of current against the same scenarios of baseline, as messages:
+    throughput down, or p95/p99 latency up, by more than threshold percent, more queries per request than the
+    baseline's max, or new errors.
+    """
+    regressions = []
+    for name, now in current['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        if now['throughput'] < before['throughput'] * (1 - threshold / 100):
+            regressions.append(f"{name}: throughput {before['throughput']} -> {now['throughput']} requests/s")
+        for figure in ('p95_ms', 'p99_ms'):
+            if now[figure] > before[figure] * (1 + threshold / 100):
+                regressions.append(f'{name}: {figure} {before[figure]} -> {now[figure]}')
+        if before['queries_max'] is not None and (now['queries_max'] or 0) > before['queries_max']:
+            regressions.append(f"{name}: queries per request {before['queries_max']} -> {now['queries_max']}")
+        if now['errors'] > before['errors']:
+            regressions.append(f"{name}: errors {before['errors']} -> {now['errors']}")
+    return regressions
@@ -0,0 +1,57 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+ARTICLES_LIST_VERSION_KEY = 'articles:list:version'
+
+
+def get_cache():
+    return caches[settings.ARTICLES_CACHE_ALIAS]
+
+
+def new_version():
+    # Versions start from the current time, so a version key lost by the cache (evicted, restarted) can never be
+    # recreated with the number of a version whose pages are still stored.
+    return int(time.time() * 1e9)
+
+
+def articles_list_version(cache):
+    version = cache.get(ARTICLES_LIST_VERSION_KEY)
+    if version is None:
+        cache.add(ARTICLES_LIST_VERSION_KEY, new_version(), timeout=None)
+        version = cache.get(ARTICLES_LIST_VERSION_KEY)
+    return version
+
+
+def articles_list_cache_key(request, logged, version):
+    """
+    Key of a page of the articles list. Pages are stored under the current version of the list, so bumping the version
+    (see invalidate_articles_list) makes every stored page unreachable at once, with no need to know their keys.
+    The key depends on everything that changes the response: auth state, Sort header, query parameters (limit,
+    offset, cursor, count...), host and path, because pagination links are absolute urls.
+    """
+    params = sorted((key, value) for key, values in request.query_params.lists() for value in values)
+    raw = repr((request.get_host(), request.path, logged, request.headers.get('Sort'), params))
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'articles:list:{version}:{digest}'
+
+
+def bump_articles_list_version():
+    cache = get_cache()
+    try:
+        cache.incr(ARTICLES_LIST_VERSION_KEY)
+    except ValueError:
+        cache.set(ARTICLES_LIST_VERSION_KEY, new_version(), timeout=None)
+
+
+def invalidate_articles_list():
+    """
+    Drops every cached page of the articles list.
+    The version is bumped right away and again once the current transaction is committed: a list request running
+    between the write and the commit still reads the old rows, and could store them under the new version.
+    """
+    bump_articles_list_version()
+    transaction.on_commit(bump_articles_list_version)
@@ -0,0 +1,87 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5(repr(parts).encode('utf-8')).hexdigest())
+
+
+def object_validators(instance):
+    """
+    Returns (etag, last_modified) of a model instance with an auto_now `updated` field. Every write through save()
+    refreshes `updated`, so it is a natural version of the instance.
+    """
+    return make_etag(instance._meta.label, instance.pk, instance.updated.isoformat()), int(instance.updated.timestamp())
+
+
+def queryset_validators(request, queryset, *vary):
+    """
+    Returns (etag, count) of a list, from MAX(updated) and COUNT(*) of queryset in one aggregate query. Editing an
+    object changes the max, deleting one changes the count. The requested page (query parameters) and any other value
+    the response depends on (vary) are part of the etag too.
+    Lists have no Last-Modified: MAX(updated) is unchanged by deleting any row but the latest, so If-Modified-Since
+    alone would get a 304 for a stale list. The count is returned so that the pagination does not need to run its own
+    COUNT(*).
+    """
+    validators = queryset.order_by().aggregate(last_updated=Max('updated'), count=Count('pk'))
+    last_updated = validators['last_updated']
+    etag = make_etag(queryset.model._meta.label, last_updated and last_updated.isoformat(), validators['count'],
+                     request.get_full_path(), request.headers.get('Sort'), *vary)
+    return etag, validators['count']
+
+
+def not_modified_response(request, etag, last_modified):
+    """
+    Returns a 304 response if the If-None-Match/If-Modified-Since headers of the request match the validators
+    (or a 412 if If-Match/If-Unmodified-Since do not), None otherwise.
+    """
+    response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    retrieve() with ETag/Last-Modified validators. A matching conditional GET gets a 304 without running the
+    serializer.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = object_validators(instance)
+
+        response = not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+
+class ConditionalListMixin:
+    """
+    list() with an ETag built from MAX(updated) and the count of the listed queryset (see queryset_validators). A
+    matching conditional GET gets a 304 without fetching nor serializing the page.
+    """
+
+    def list(self, request, *args, **kwargs):
+        etag, count = queryset_validators(request, self.filter_queryset(self.get_queryset()))
+
+        response = not_modified_response(request, etag, None)
+        if response is not None:
+            return response
+
+        self.paginator.known_count = count
+        return set_validators(super().list(request, *args, **kwargs), etag, None)
@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.db import connections
+
+from app_articles.exceptions import DatabasePoolExhausted
+
+logger = logging.getLogger(__name__)
+
+
+def is_usable(raw_connection):
+    """
+    Health check of a DB-API connection: runs SELECT 1 on it.
+    """
+    try:
+        cursor = raw_connection.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        finally:
+            cursor.close()
+    except Exception:
+        return False
+    return True
+
+
+def check_connections():
+    """
+    Health check of the persistent connections (CONN_MAX_AGE), run at the start of every request: a connection not
+    checked for DATABASE_HEALTH_CHECK_INTERVAL seconds runs a SELECT 1, and is closed if it fails (restarted or
+    failed over server, connection dropped by a proxy...), so that the request opens a new one instead of failing.
+    """
+    interval = settings.DATABASE_HEALTH_CHECK_INTERVAL
+    if interval is None:
+        return
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if now - getattr(connection, 'health_checked_at', now - interval) < interval:
+            continue
+        if not connection.is_usable():
+            logger.warning('Closing the unusable connection of the %s database.', connection.alias)
+            connection.close()
+        connection.health_checked_at = now
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of DB-API connections of a database, shared by the threads of the process.
+
+    At most max_size connections are open at once: acquire() reuses an idle connection, opens a new one while there is
+    room, and otherwise waits up to timeout seconds for one to be released before raising DatabasePoolExhausted.
+    Idle connections not used for check_interval seconds are health checked (SELECT 1) before being reused.
+    `stats` holds the metrics of the pool: created, reused, discarded connections, acquisitions that had to wait
+    (waits, wait_seconds) and that timed out (exhausted).
+    """
+
+    def __init__(self, max_size, timeout, check_interval=None):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self.condition = threading.Condition()
+        self.idle = deque()  # (connection, released at), the most recently released last.
+        self.size = 0
+        self.peak = 0
+        self.stats = Counter({stat: 0 for stat in ('created', 'reused', 'discarded', 'waits', 'wait_seconds',
+                                                   'exhausted')})
+
+    def acquire(self, connect):
+        """
+        Returns an idle connection, or a new one made by connect().
+        """
+        while True:
+            connection, released = self.reserve()
+            if connection is None:
+                break
+            # Checked outside of the lock, the other threads do not wait for its SELECT 1.
+            fresh = self.check_interval is None or time.monotonic() - released < self.check_interval
+            if fresh or is_usable(connection):
+                self.count('reused')
+                return connection
+            self.discard(connection)
+
+        try:
+            connection = connect()
+        except Exception:
+            self.free_slot()
+            raise
+        self.count('created')
+        return connection
+
+    def reserve(self):
+        """
+        Takes the most recently released idle connection, returned with its release time, or reserves room for a new
+        connection, returned as (None, None). Waits for a release when the pool is full.
+        """
+        deadline = None
+        with self.condition:
+            while True:
+                if self.idle:
+                    return self.idle.pop()
+                if self.size < self.max_size:
+                    self.size += 1
+                    self.peak = max(self.peak, self.size)
+                    return None, None
+
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.timeout
+                    self.stats['waits'] += 1
+                elif now >= deadline:
+                    self.stats['exhausted'] += 1
+                    logger.warning('Database connection pool exhausted: %s connections in use.', self.size)
+                    raise DatabasePoolExhausted()
+                self.condition.wait(deadline - now)
+                self.stats['wait_seconds'] += time.monotonic() - now
+
+    def release(self, connection):
+        """
+        Gives back a connection acquired from the pool. Its transaction, if any, is rolled back.
+        """
+        try:
+            connection.rollback()
+        except Exception:
+            self.discard(connection)
+            return
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, connection):
+        """
+        Closes a broken connection acquired from the pool, and makes room for a new one.
+        """
+        self.close_quietly(connection)
+        self.free_slot()
+        self.count('discarded')
+
+    def free_slot(self):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+
+    def count(self, stat):
+        with self.condition:
+            self.stats[stat] += 1
+
+    def close_quietly(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def get_stats(self):
+        with self.condition:
+            return {'max_size': self.max_size, 'size': self.size, 'idle': len(self.idle),
+                    'in_use': self.size - len(self.idle), 'peak': self.peak, **self.stats}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, options):
+    """
+    Returns the pool of the database alias, created from the POOL options of its settings on first use.
+    """
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool(options['MAX_SIZE'], options['TIMEOUT'],
+                                                      options.get('HEALTH_CHECK_INTERVAL'))
+    return pool
+
+
+def pool_stats():
+    """
+    Returns {alias: stats} of the connection pools of this process.
+    """
+    return {alias: pool.get_stats() for alias, pool in sorted(_pools.items())}
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixin of the DatabaseWrapper of a Django backend that takes its connections from a ConnectionPool (POOL entry of
+    the database settings) instead of opening them, and gives them back to it instead of closing them.
+    """
+
+    def get_pool(self):
+        return get_pool(self.alias, self.settings_dict['POOL'])
+
+    def get_new_connection(self, conn_params):
+        return self.get_pool().acquire(lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params))
+
+    def _close(self):
+        if self.connection is None:
+            return
+        if self.errors_occurred and not self.is_usable():
+            self.get_pool().discard(self.connection)
+        else:
+            self.get_pool().release(self.connection)
@@ -0,0 +1,158 @@
+import atexit
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import BigIntegerField, Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from app_articles.models import ArticleComment, CommentReaction
+
+# Counters of ArticleComment maintained from CommentReaction.
+COUNTER_FIELDS = ['likes', 'dislikes']
+REACTION_COUNTERS = {CommentReaction.LIKE: 'likes', CommentReaction.DISLIKE: 'dislikes'}
+
+
+def update_counters(deltas):
+    """
+    Applies {comment_id: {'likes': delta, 'dislikes': delta}} with one UPDATE ... SET likes = likes + CASE id WHEN ...
+    per batch of comments, atomic on each row. `updated` is bumped too, so the ETags of the comments change.
+    """
+    comment_ids = sorted(deltas)
+    batch_size = settings.COMMENT_COUNTERS_BATCH_SIZE
+    for start in range(0, len(comment_ids), batch_size):
+        batch = comment_ids[start:start + batch_size]
+        values = {'updated': timezone.now()}
+        for field in COUNTER_FIELDS:
+            whens = [When(pk=pk, then=Value(deltas[pk][field])) for pk in batch if deltas[pk].get(field)]
+            if whens:
+                values[field] = F(field) + Case(*whens, default=Value(0), output_field=BigIntegerField())
+        ArticleComment.objects.filter(pk__in=batch).update(**values)
+
+
+class CounterBuffer:
+    """
+    In-process buffer of the likes and dislikes of the comments.
+
+    Every reaction adds its delta to the buffer, and a timer flushes the whole buffer every
+    COMMENT_COUNTERS_FLUSH_INTERVAL seconds (or as soon as COMMENT_COUNTERS_MAX_BUFFER comments are waiting) in
+    batched UPDATEs. So a hot comment gets one UPDATE per interval instead of one per like, and the requests never
+    wait for its row lock. The deltas are only added once the transaction of the reaction commits.
+    The buffer is lost if the process dies before a flush, CommentReaction is the source of truth and
+    python manage.py rebuild_comment_counters recomputes the counters from it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.deltas = defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+        self.timer = None
+        atexit.register(self.flush)
+
+    def add(self, comment_id, **deltas):
+        with self.lock:
+            counters = self.deltas[comment_id]
+            for field, delta in deltas.items():
+                counters[field] += delta
+            full = len(self.deltas) >= settings.COMMENT_COUNTERS_MAX_BUFFER
+            if not full and self.timer is None:
+                self.timer = threading.Timer(settings.COMMENT_COUNTERS_FLUSH_INTERVAL, self.flush_in_thread)
+                self.timer.daemon = True
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered deltas, returns the number of updated comments.
+        """
+        with self.lock:
+            deltas, self.deltas = self.deltas, defaultdict(lambda: dict.fromkeys(COUNTER_FIELDS, 0))
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        deltas = {pk: counters for pk, counters in deltas.items() if any(counters.values())}
+        if deltas:
+            with transaction.atomic():
+                update_counters(deltas)
+        return len(deltas)
+
+    def flush_in_thread(self):
+        try:
+            self.flush()
+        finally:
+            # The timer thread has its own connection, it must not be left open.
+            connection.close()
+
+
+counter_buffer = CounterBuffer()
+
+
+def add_reaction_deltas(comment_id, **deltas):
+    """
+    Adds deltas (likes=1, dislikes=-1, ...) to the counters of a comment: right away with an UPDATE ... F() when
+    COMMENT_COUNTERS_FLUSH_INTERVAL is 0, through counter_buffer otherwise.
+    """
+    if settings.COMMENT_COUNTERS_FLUSH_INTERVAL <= 0:
+        update_counters({comment_id: deltas})
+    else:
+        transaction.on_commit(lambda: counter_buffer.add(comment_id, **deltas))
+
+
+def set_reaction(user, comment_id, value):
+    """
+    Likes (CommentReaction.LIKE) or dislikes (CommentReaction.DISLIKE) a comment on behalf of user.
+    A user has one reaction per comment at most (unique constraint), so repeating it is a no-op and switching it
+    moves one unit from a counter to the other. The comment row is not locked here, its counters are changed by
+    add_reaction_deltas. Returns False if user had already reacted with value.
+    """
+    reactions = CommentReaction.objects.filter(comment_id=comment_id, user=user)
+    previous = reactions.values_list('value', flat=True).first()
+    if previous == value:
+        return False
+
+    try:
+        with transaction.atomic():
+            if previous is None:
+                CommentReaction.objects.create(comment_id=comment_id, user=user, value=value)
+                deltas = {REACTION_COUNTERS[value]: 1}
+            elif reactions.filter(value=previous).update(value=value):
+                deltas = {REACTION_COUNTERS[value]: 1, REACTION_COUNTERS[previous]: -1}
+            else:  # Changed by a concurrent request of the same user.
+                return False
+            add_reaction_deltas(comment_id, **deltas)
+    except IntegrityError:  # Created by a concurrent request of the same user.
+        return False
+    return True
+
+
+def remove_reaction(user, comment_id, value):
+    """
+    Undoes the like or dislike (value) of user on a comment. Returns False if user had not reacted with value.
+    """
+    with transaction.atomic():
+        deleted, _ = CommentReaction.objects.filter(comment_id=comment_id, user=user, value=value).delete()
+        if not deleted:
+            return False
+        add_reaction_deltas(comment_id, **{REACTION_COUNTERS[value]: -1})
+    return True
+
+
+def rebuild_comment_counters(comment_ids=None):
+    """
+    Recomputes ArticleComment.likes and dislikes from CommentReaction with a single UPDATE. If comment_ids is None
+    every comment is rebuilt. Only the comments whose counters were wrong are written, with their `updated` bumped as
+    in update_counters, so their ETags change. Returns the number of corrected comments.
+    """
+    reactions = CommentReaction.objects.filter(comment=OuterRef('pk')).order_by().values('comment')
+
+    def count(value):
+        return Coalesce(Subquery(reactions.annotate(count=Count('id', filter=Q(value=value))).values('count')), 0)
+
+    comments = ArticleComment.objects.all()
+    if comment_ids is not None:
+        comments = comments.filter(pk__in=comment_ids)
+    likes, dislikes = count(CommentReaction.LIKE), count(CommentReaction.DISLIKE)
+    return comments.exclude(likes=likes, dislikes=dislikes).update(likes=likes, dislikes=dislikes,
+                                                                   updated=timezone.now())
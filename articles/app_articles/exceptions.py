@@ -1,6 +1,25 @@
+from rest_framework.exceptions import APIException
+
+
 class UserNotFound(Exception):
     pass
 
 
 class NullRequest(Exception):
     pass
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class LoginUnavailable(APIException):
+    status_code = 503
+    default_detail = 'Too many logins at once, try again later.'
+    default_code = 'login_unavailable'
+
+
+class DatabasePoolExhausted(APIException):
+    status_code = 503
+    default_detail = 'Too many requests at once, try again later.'
+    default_code = 'database_unavailable'
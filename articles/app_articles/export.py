@@ -0,0 +1,79 @@
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from app_articles.batches import DeleteBatch
+from app_articles.models import Article, ArticleComment, DeletedRow
+
+# Exportable models: name of the 'type' of their rows -> (model, exported fields, field bumped by every write of them).
+EXPORTS = {
+    'article': (Article, ['id', 'title', 'text', 'created', 'updated', 'is_public', 'author', 'report_count'],
+                'changed_at'),
+    'comment': (ArticleComment, ['id', 'message', 'created', 'updated', 'likes', 'dislikes', 'is_reply', 'article',
+                                 'author_comment', 'comment_reply'], 'updated'),
+}
+EXPORT_TYPES = {model: name for name, (model, fields, changed_field) in EXPORTS.items()}
+
+
+def export_lines(types=None, updated_after=None, chunk_size=2000):
+    """
+    Yields the NDJSON lines of the export, one JSON object per row with its 'type' ('article' or 'comment').
+    Rows are read with .values().iterator(chunk_size), so memory does not grow with the size of the tables (on
+    PostgreSQL a server side cursor is used). With updated_after, only rows changed after that datetime are exported,
+    followed by the rows deleted after it, as {"type": ..., "id": ..., "deleted": <datetime>}, which allows
+    incremental exports. Every write of an exported field, counters included, bumps the changed field of its model:
+    `changed_at` of the articles (their `updated` is left to content edits), `updated` of the comments.
+    """
+    for name in types or EXPORTS:
+        model, fields, changed_field = EXPORTS[name]
+        queryset = model.objects.order_by('pk')
+        if updated_after is not None:
+            queryset = queryset.filter(**{f'{changed_field}__gt': updated_after})
+
+        for row in queryset.values(*fields).iterator(chunk_size=chunk_size):
+            row['type'] = name
+            yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+        if updated_after is not None:
+            deleted = DeletedRow.objects.filter(type=name, deleted__gt=updated_after).order_by('pk')
+            for row in deleted.values('object_id', 'deleted').iterator(chunk_size=chunk_size):
+                yield json.dumps({'type': name, 'id': row['object_id'], 'deleted': row['deleted']},
+                                 cls=DjangoJSONEncoder) + '\n'
+
+
+class DeletedRowsBatch(DeleteBatch):
+    """
+    DeletedRow of the exported rows of a delete, CASCADE included, inserted with one bulk_create after its last row,
+    in its transaction: a row is never gone without its tombstone.
+    """
+    connection_attribute = 'deleted_rows_batch'
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.rows = []
+
+    def add(self, instance):
+        self.rows.append(DeletedRow(type=EXPORT_TYPES[type(instance)], object_id=instance.pk))
+
+    def run(self):
+        DeletedRow.objects.bulk_create(self.rows, batch_size=1000)
+
+
+def gzip_lines(lines, batch_size=256 * 1024):
+    """
+    Gzips the lines on the fly. Output is yielded every batch_size bytes of input, to keep the memory bounded while
+    not yielding a tiny compressed chunk per line.
+    """
+    compressor = zlib.compressobj(wbits=31)  # 31: gzip header and trailer.
+    batch = []
+    size = 0
+    for line in lines:
+        data = line.encode('utf-8')
+        batch.append(data)
+        size += len(data)
+        if size >= batch_size:
+            yield compressor.compress(b''.join(batch))
+            batch = []
+            size = 0
+    yield compressor.compress(b''.join(batch)) + compressor.flush()
@@ -0,0 +1,107 @@
+from django.db.models.query import QuerySet
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+# Fields whose to_representation() returns the value read by .values() as it is.
+IDENTITY_FIELDS = (serializers.IntegerField, serializers.BooleanField, serializers.CharField, PrimaryKeyRelatedField)
+
+
+class ValuesSerializer:
+    """
+    Read only serializer of .values() rows, compiled from a ModelSerializer instance.
+
+    The readable fields of the serializer are turned once into a list of (name, column, mapper): no field is bound
+    nor looked up per row, foreign keys are their `<field>_id` column (what PrimaryKeyRelatedField sends) and plain
+    values (int, bool, str) are sent as they are read. Other fields (dates...) keep their own to_representation().
+    The output is the same as serializer.data, without the per field attribute lookups of DRF.
+    """
+
+    def __init__(self, serializer, mappers):
+        self.serializer = serializer
+        self.mappers = mappers
+        self.columns = [column for _, column, _ in mappers]
+
+    @classmethod
+    def compile(cls, serializer):
+        """
+        Returns the ValuesSerializer of serializer, or None if one of its fields can not be read from a single
+        column (SerializerMethodField, nested serializers, dotted sources, many to many fields...).
+        """
+        model = serializer.Meta.model
+        columns = {field.name for field in model._meta.concrete_fields}
+        mappers = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if field.source not in columns or isinstance(field, (serializers.SerializerMethodField,
+                                                                 serializers.BaseSerializer)):
+                return None
+            mapper = None if isinstance(field, IDENTITY_FIELDS) else field.to_representation
+            mappers.append((name, field.source, mapper))
+        return cls(serializer, mappers)
+
+    def to_representation(self, rows):
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, mapper in self.mappers:
+                value = row[column]
+                item[name] = value if mapper is None or value is None else mapper(value)
+            data.append(item)
+        return data
+
+
+class ValuesListData:
+    """
+    Stands for the `many=True` serializer of a page of .values() rows: views only read its `data`.
+    """
+
+    def __init__(self, values_serializer, rows):
+        self.values_serializer = values_serializer
+        self.rows = rows
+
+    @property
+    def data(self):
+        return serializers.ReturnList(self.values_serializer.to_representation(self.rows),
+                                      serializer=self.values_serializer.serializer)
+
+
+class FastReadMixin:
+    """
+    ViewSet mixin that serves the actions in fast_read_actions (list by default) from .values() rows serialized by a
+    ValuesSerializer, instead of model instances and ModelSerializer.to_representation(). The queryset is turned into
+    .values() right before the pagination, with the serialized columns plus the ordering ones (keyset pagination).
+    Writes, and serializers that can not be compiled, keep the usual path. ?fast=false forces the usual path too.
+    """
+    fast_read_actions = ['list']
+
+    def get_values_serializer(self):
+        if self.request.method != 'GET' or self.action not in self.fast_read_actions:
+            return None
+        if self.request.query_params.get('fast', '').lower() in ('false', '0', 'no'):
+            return None
+        if not hasattr(self, '_values_serializer'):
+            self._values_serializer = ValuesSerializer.compile(self.get_serializer())
+        return self._values_serializer
+
+    def to_values(self, queryset):
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None or not isinstance(queryset, QuerySet) or queryset._fields is not None:
+            return queryset
+        ordering = [field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str)]
+        columns = dict.fromkeys(values_serializer.columns + [queryset.model._meta.pk.name] + ordering)
+        return queryset.values(*[column for column in columns if column != 'pk'])
+
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(self.to_values(queryset))
+
+    def get_serializer(self, *args, **kwargs):
+        values_serializer = self.get_values_serializer() if kwargs.get('many') else None
+        if values_serializer is not None and args:
+            rows = self.to_values(args[0])
+            if isinstance(rows, QuerySet):
+                if rows._fields is not None:
+                    return ValuesListData(values_serializer, rows)
+            elif rows and isinstance(rows[0], dict):
+                return ValuesListData(values_serializer, rows)
+        return super().get_serializer(*args, **kwargs)
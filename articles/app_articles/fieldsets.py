@@ -0,0 +1,76 @@
+from rest_framework.exceptions import ValidationError
+
+
+def split_param(params, name):
+    return {field.strip() for field in params.get(name, '').split(',') if field.strip()}
+
+
+def is_true_param(params, name):
+    return params.get(name, '').lower() in ('true', '1', 'yes')
+
+
+class SparseFieldsetsSerializerMixin:
+    """
+    Sparse fieldsets for the GET requests (the writes keep every field):
+        ?fields=id,title: only these fields are sent.
+        ?exclude=text: every field but these ones is sent.
+        ?summary=true: the long fields are replaced by their excerpt, see Meta.summary_fields.
+
+    Meta.optional_fields are only sent when they are listed in ?fields=. Meta.summary_fields maps a long field to the
+    field holding its excerpt, e.g. {'text': 'summary'}.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is not None and request.method == 'GET':
+            self.apply_sparse_fieldsets(request.query_params)
+
+    def apply_sparse_fieldsets(self, params):
+        optional_fields = set(getattr(self.Meta, 'optional_fields', []))
+        summary_fields = getattr(self.Meta, 'summary_fields', {})
+        fields = split_param(params, 'fields')
+        exclude = split_param(params, 'exclude')
+
+        unknown = (fields | exclude) - set(self.fields)
+        if unknown:
+            raise ValidationError({'fields': [f"Unknown fields: {', '.join(sorted(unknown))}. Valid fields are: "
+                                              f"{', '.join(self.fields)}."]})
+
+        if fields:
+            sent = fields
+        else:
+            sent = set(self.fields) - optional_fields
+            if is_true_param(params, 'summary'):
+                for field, summary_field in summary_fields.items():
+                    if field in sent:
+                        sent.remove(field)
+                        sent.add(summary_field)
+        sent -= exclude
+
+        for name in list(self.fields):
+            if name not in sent:
+                self.fields.pop(name)
+
+
+class SparseFieldsetsMixin:
+    """
+    ViewSet mixin that loads only the columns sent by the serializer (SparseFieldsetsSerializerMixin) in list and
+    retrieve, with QuerySet.only(). So a list of titles never reads the text of the articles.
+    Besides the serialized fields, the ordering fields (needed by the keyset pagination) and sparse_fetch_fields are
+    loaded too.
+    """
+    # Columns read outside the serializer, e.g. 'updated' by the ETags of app_articles.conditional.
+    sparse_fetch_fields = ['updated']
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != 'GET' or self.action not in ('list', 'retrieve'):
+            return queryset
+        return queryset.only(*self.get_sparse_columns(queryset))
+
+    def get_sparse_columns(self, queryset):
+        columns = {field.source for field in self.get_serializer().fields.values() if not field.write_only}
+        columns.update(field.lstrip('-') for field in queryset.query.order_by if isinstance(field, str))
+        columns.update(self.sparse_fetch_fields)
+        return sorted(columns & {field.name for field in queryset.model._meta.concrete_fields})
@@ -0,0 +1,57 @@
+"""
+Password hashers whose work factors come from settings (PASSWORD_* in articles/settings.py), instead of being fixed
+in the Django release. must_update() of every Django hasher compares the work factor of a stored hash against these
+values, so changing them (or PASSWORD_HASHER) makes the next successful login rehash the password, see
+app_articles.backends.PooledModelBackend.
+"""
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import (Argon2PasswordHasher, BCryptSHA256PasswordHasher, PBKDF2PasswordHasher,
+                                         make_password)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Requires argon2-cffi (pip install django[argon2]).
+    """
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
+
+
+class TunedBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """
+    Requires bcrypt (pip install django[bcrypt]).
+    """
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_BCRYPT_ROUNDS
+
+
+def hash_password_in_process(password):
+    """
+    make_password() for the process pool of app_articles.user_import.UserImporter. It lives here, away from the models,
+    because processes started with 'spawn' (instead of 'fork') import it before the project is loaded; the first call
+    sets it up (ProcessPoolExecutor has no initializer before Python 3.7).
+    """
+    if not apps.ready:
+        django.setup()
+    return make_password(password)
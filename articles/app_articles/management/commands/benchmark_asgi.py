@@ -0,0 +1,100 @@
+import asyncio
+import io
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+
+
+def percentile(latencies, percent):
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = ('Load test of the read endpoints, in process: the same requests are sent to the WSGI handler from a pool '
+            'of threads (like a threaded WSGI server) and to the ASGI handler from concurrent tasks (like an ASGI '
+            'server), and requests/s and p50/p99 latencies are compared.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help='Path to request (repeatable). Default: /articles/.')
+        parser.add_argument('--requests', type=int, default=500, help='Requests sent for each path and handler.')
+        parser.add_argument('--concurrency', type=int, default=50, help='Requests in flight at once.')
+        parser.add_argument('--token', help='Token of the user sending the requests (Authorization: Token <token>).')
+
+    def handle(self, *args, **options):
+        headers = {'authorization': f"Token {options['token']}"} if options['token'] else {}
+        for path in options['paths'] or ['/articles/']:
+            for name, run in (('WSGI', self.run_wsgi), ('ASGI', self.run_asgi)):
+                start = time.perf_counter()
+                latencies, statuses = run(path, headers, options['requests'], options['concurrency'])
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f'{name} {path}: {len(latencies) / elapsed:.0f} requests/s, '
+                    f'p50 {statistics.median(latencies) * 1000:.1f} ms, '
+                    f'p99 {percentile(latencies, 99) * 1000:.1f} ms, statuses {sorted(set(statuses))}'
+                )
+
+    def run_wsgi(self, path, headers, requests, concurrency):
+        handler = WSGIHandler()
+        url = urlsplit(path)
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': url.path, 'QUERY_STRING': url.query, 'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.url_scheme': 'http',
+            **{'HTTP_' + key.upper().replace('-', '_'): value for key, value in headers.items()},
+        }
+
+        def request(_):
+            statuses = []
+            start = time.perf_counter()
+            response = handler({**environ, 'wsgi.input': io.BytesIO()}, lambda status, *_: statuses.append(status))
+            b''.join(response)
+            response.close()
+            return time.perf_counter() - start, int(statuses[0].split()[0])
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(request, range(requests)))
+        return [latency for latency, _ in results], [status for _, status in results]
+
+    def run_asgi(self, path, headers, requests, concurrency):
+        handler = ASGIHandler()
+        url = urlsplit(path)
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': url.path, 'query_string': url.query.encode(), 'scheme': 'http',
+            'server': ('localhost', 80), 'headers': [(key.encode(), value.encode()) for key, value in headers.items()],
+        }
+
+        async def request():
+            messages = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                messages.append(message)
+
+            start = time.perf_counter()
+            await handler(dict(scope), receive, send)
+            return time.perf_counter() - start, messages[0]['status']
+
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited():
+                async with semaphore:
+                    return await request()
+
+            return await asyncio.gather(*(limited() for _ in range(requests)))
+
+        # A loop of its own rather than asyncio.run(), which needs Python 3.7.
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        return [latency for latency, _ in results], [status for _, status in results]
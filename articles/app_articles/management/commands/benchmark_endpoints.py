@@ -0,0 +1,66 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from app_articles.benchmarks import SCENARIOS, BenchmarkData, HTTPTransport, WSGITransport, compare_baselines, \
+    run_scenario
+
+
+class Command(BaseCommand):
+    help = ('Load test of every endpoint (list, retrieve, create, report, login...) against the dataset of '
+            'python manage.py seed_benchmark_data: throughput, p50/p95/p99 latencies and queries per request of each '
+            'scenario, saved as a JSON baseline with --output. --compare checks the run against a previous baseline '
+            'and fails on regressions. The requests go to the WSGI application of this process, or to a running '
+            'server with --base-url. The writes are kept, seed the dataset again to start over.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests sent per scenario.')
+        parser.add_argument('--concurrency', type=int, default=10, help='Requests in flight at once.')
+        parser.add_argument('--scenario', action='append', dest='scenarios', choices=sorted(SCENARIOS),
+                            help='Scenario to run (repeatable). Default: all of them.')
+        parser.add_argument('--base-url', help='URL of a running server, e.g. http://127.0.0.1:8000.')
+        parser.add_argument('--output', help='File the JSON baseline of the run is written to.')
+        parser.add_argument('--compare', help='JSON baseline of a previous run to compare with.')
+        parser.add_argument('--threshold', type=float, default=10.0,
+                            help='Change (percent) of throughput or p95/p99 latency reported as a regression.')
+
+    def handle(self, *args, **options):
+        try:
+            data = BenchmarkData()
+        except LookupError as error:
+            raise CommandError(error)
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+
+        transport = HTTPTransport(options['base_url']) if options['base_url'] else WSGITransport()
+        result = {
+            'created': timezone.now().isoformat(),
+            'target': options['base_url'] or 'wsgi',
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'scenarios': {},
+        }
+        for name in options['scenarios'] or SCENARIOS:
+            figures = run_scenario(transport, data, name, options['requests'], options['concurrency'])
+            result['scenarios'][name] = figures
+            self.stdout.write(
+                f"{name}: {figures['throughput']:.0f} requests/s, p50 {figures['p50_ms']:.1f} ms, "
+                f"p95 {figures['p95_ms']:.1f} ms, p99 {figures['p99_ms']:.1f} ms, "
+                f"{figures['queries_mean']} queries, {figures['errors']} errors"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(result, file, indent=2)
+            self.stdout.write(f"Baseline written to {options['output']}.")
+
+        if baseline is not None:
+            regressions = compare_baselines(baseline, result, options['threshold'])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(regression))
+            if regressions:
+                raise CommandError(f"{len(regressions)} regressions against {options['compare']}.")
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}."))
@@ -0,0 +1,32 @@
+import time
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ('Measures how many logins per second one core can verify with each password hasher of PASSWORD_HASHERS, '
+            'using the work factors of the current settings.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=2.0, help='Time spent measuring each hasher.')
+
+    def handle(self, *args, **options):
+        password = 'benchmark-password'
+        for hasher in get_hashers():
+            try:
+                encoded = hasher.encode(password, hasher.salt())
+            except ValueError as error:
+                # The library of the hasher is not installed.
+                self.stdout.write(f'{hasher.algorithm}: skipped, {error}')
+                continue
+
+            verified = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < options['seconds']:
+                hasher.verify(password, encoded)
+                verified += 1
+            elapsed = time.perf_counter() - start
+
+            self.stdout.write(f'{hasher.algorithm}: {verified / elapsed:.1f} logins/s per core '
+                              f'({elapsed / verified * 1000:.1f} ms per login)')
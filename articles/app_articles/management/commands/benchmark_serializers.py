@@ -0,0 +1,69 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from app_articles.fast_serializers import ValuesSerializer
+from app_articles.models import Article, ArticleComment, CustomUser
+from app_articles.serializers import ArticleCommentSerializer, ArticleSerializer, UserSerializer
+
+
+class Command(BaseCommand):
+    help = ('Measures how many rows per second the list serializers turn into data, with the stock ModelSerializer '
+            'path (model instances) and with the .values() path of app_articles.fast_serializers. Missing rows are '
+            'created in a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Rows serialized by each pass.')
+        parser.add_argument('--seconds', type=float, default=2.0, help='Time spent measuring each path.')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with transaction.atomic():
+            self.seed(rows)
+            for serializer_class, queryset in [(ArticleSerializer, Article.objects.order_by('-created', '-id')),
+                                               (ArticleCommentSerializer, ArticleComment.objects.order_by('created')),
+                                               (UserSerializer, CustomUser.objects.order_by('id'))]:
+                serializer = serializer_class()
+                values_serializer = ValuesSerializer.compile(serializer)
+                instances = list(queryset[:rows])
+                values = list(queryset.values(*values_serializer.columns)[:rows])
+
+                stock = self.measure(lambda: serializer_class(instances, many=True).data, len(instances),
+                                     options['seconds'])
+                fast = self.measure(lambda: values_serializer.to_representation(values), len(values),
+                                    options['seconds'])
+                self.stdout.write(f'{serializer_class.__name__}: stock {stock:.0f} rows/s, values {fast:.0f} rows/s '
+                                  f'(x{fast / stock:.1f})')
+            transaction.set_rollback(True)
+
+    def measure(self, serialize, count, seconds):
+        passes = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            serialize()
+            passes += 1
+        return passes * count / (time.perf_counter() - start)
+
+    def seed(self, rows):
+        missing = rows - CustomUser.objects.count()
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f'benchmark{i}', email=f'benchmark{i}@example.com', password='!',
+                       birth=timezone.now(), level=CustomUser.SENIOR, gender=CustomUser.OTHER)
+            for i in range(missing)
+        ])
+        author = CustomUser.objects.order_by('id').first()
+
+        missing = rows - Article.objects.count()
+        Article.objects.bulk_create([
+            Article(title=f'Benchmark {i}', text='Benchmark text ' * 40, is_public=True, author=author)
+            for i in range(missing)
+        ])
+        article = Article.objects.order_by('id').first()
+
+        missing = rows - ArticleComment.objects.count()
+        ArticleComment.objects.bulk_create([
+            ArticleComment(message='Benchmark message', article=article, author_comment=author)
+            for _ in range(missing)
+        ])
@@ -0,0 +1,34 @@
+import os
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = ('Copies the SQLite primary database to the SQLite files of the DATABASE_REPLICAS, to try the read replicas '
+            'locally (a real replica is kept up to date by the replication of the database server).')
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('No DATABASE_REPLICAS configured.')
+        primary = connections[DEFAULT_DB_ALIAS]
+        for alias in [DEFAULT_DB_ALIAS] + settings.DATABASE_REPLICAS:
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'{alias} is not a SQLite database.')
+
+        primary.ensure_connection()
+        # A SQL dump rather than Connection.backup(), which needs Python 3.7.
+        dump = '\n'.join(primary.connection.iterdump())
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].close()
+            name = connections[alias].settings_dict['NAME']
+            if os.path.exists(name):
+                os.remove(name)
+            target = sqlite3.connect(name)
+            try:
+                target.executescript(dump)
+            finally:
+                target.close()
+            self.stdout.write(self.style.SUCCESS(f'Copied {primary.settings_dict["NAME"]} to {alias}.'))
@@ -0,0 +1,38 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from app_articles.export import EXPORTS, export_lines, gzip_lines
+
+
+class Command(BaseCommand):
+    help = 'Exports every article and comment as NDJSON (one JSON object per line), with constant memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='-', help='Output file, - (default) for the standard output.')
+        parser.add_argument('--type', action='append', choices=list(EXPORTS), dest='types',
+                            help='Exported type, may be repeated. Every type by default.')
+        parser.add_argument('--updated-after', help='ISO 8601 datetime, only rows updated (or deleted) after it are exported.')
+        parser.add_argument('--gzip', action='store_true', help='Gzip the output.')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database at once.')
+
+    def handle(self, *args, **options):
+        updated_after = options['updated_after']
+        if updated_after is not None:
+            updated_after = parse_datetime(updated_after)
+            if updated_after is None:
+                raise CommandError('--updated-after must be an ISO 8601 datetime.')
+
+        lines = export_lines(options['types'], updated_after, options['chunk_size'])
+        chunks = gzip_lines(lines) if options['gzip'] else (line.encode('utf-8') for line in lines)
+
+        if options['output'] == '-':
+            output = sys.stdout.buffer
+            for chunk in chunks:
+                output.write(chunk)
+            output.flush()
+        else:
+            with open(options['output'], 'wb') as output:
+                for chunk in chunks:
+                    output.write(chunk)
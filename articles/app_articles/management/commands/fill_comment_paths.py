@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_articles.threads import fill_comment_paths
+
+
+class Command(BaseCommand):
+    help = ('Sets the thread path of the comments that have none, e.g. comments inserted without post_save '
+            '(bulk_create, raw SQL).')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            filled = fill_comment_paths()
+        self.stdout.write(self.style.SUCCESS(f'Filled the thread path of {filled} comments.'))
@@ -0,0 +1,49 @@
+import csv
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_articles.user_import import UserImporter
+
+
+class Command(BaseCommand):
+    help = ('Registers the users of a NDJSON (one JSON object per line) or CSV file, with the fields of POST /users/. '
+            'The file is streamed and bad rows are reported without aborting the import.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='NDJSON or CSV file, the format is taken from the extension.')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Users created by each bulk INSERT.')
+        parser.add_argument('--processes', type=int, default=os.cpu_count(),
+                            help='Processes hashing the passwords, 0 hashes them in this process.')
+
+    def read_rows(self, file, path):
+        if path.endswith('.csv'):
+            for row in csv.DictReader(file):
+                # Empty cells are missing optional fields, not empty values.
+                yield {field: value for field, value in row.items() if value != ''}
+            return
+
+        for line in file:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # An invalid line is still a row, so UserImporter reports it with its index.
+                    yield None
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            file = open(path, newline='', encoding='utf-8')
+        except OSError as error:
+            raise CommandError(error)
+
+        with file:
+            importer = UserImporter(chunk_size=options['chunk_size'], processes=options['processes'])
+            result = importer.run(self.read_rows(file, path))
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(f"Created {result['created']} users, {len(result['errors'])} rows "
+                                             f"with errors."))
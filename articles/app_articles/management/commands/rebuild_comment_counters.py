@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_articles.counters import rebuild_comment_counters
+from app_articles.models import ArticleComment
+
+
+class Command(BaseCommand):
+    help = 'Recomputes ArticleComment.likes and dislikes from the reactions of the users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Number of comments rebuilt by each UPDATE statement.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        ids = ArticleComment.objects.order_by('pk').values_list('pk', flat=True)
+
+        updated = 0
+        last_id = 0
+        while True:
+            chunk = list(ids.filter(pk__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                updated += rebuild_comment_counters(chunk)
+            last_id = chunk[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt likes and dislikes, {updated} comments corrected.'))
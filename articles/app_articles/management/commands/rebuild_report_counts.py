@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_articles.models import Article
+from app_articles.reports import rebuild_report_counts
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized Article.report_count from the articles reports.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Number of articles rebuilt by each UPDATE statement.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        ids = Article.objects.order_by('pk').values_list('pk', flat=True)
+
+        updated = 0
+        last_id = 0
+        while True:
+            chunk = list(ids.filter(pk__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                updated += rebuild_report_counts(chunk)
+            last_id = chunk[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt report counts of {updated} articles.'))
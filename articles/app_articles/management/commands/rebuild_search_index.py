@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_articles.models import Article
+from app_articles.search import index_article, search_engine
+
+
+class Command(BaseCommand):
+    help = 'Indexes the title and text of every article for the search endpoint (/articles/search/).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help='Number of articles indexed by each transaction.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        articles = Article.objects.order_by('pk').only('id', 'title', 'text')
+
+        indexed = 0
+        last_id = 0
+        while True:
+            chunk = list(articles.filter(pk__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                for article in chunk:
+                    index_article(article)
+            indexed += len(chunk)
+            last_id = chunk[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} articles ({search_engine()} engine).'))
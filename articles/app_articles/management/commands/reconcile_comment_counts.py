@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_articles.activity import rebuild_comment_counts
+from app_articles.models import Article
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized Article.comment_count, reply_count and last_comment_at from the comments.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Number of articles rebuilt by each UPDATE statement.')
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        ids = Article.objects.order_by('pk').values_list('pk', flat=True)
+
+        updated = 0
+        last_id = 0
+        while True:
+            chunk = list(ids.filter(pk__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+            with transaction.atomic():
+                updated += rebuild_comment_counts(chunk)
+            last_id = chunk[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Reconciled comment counts of {updated} articles.'))
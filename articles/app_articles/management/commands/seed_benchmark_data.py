@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from app_articles.benchmarks import BENCHMARK_PASSWORD, BENCHMARK_USER_PREFIX, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (f'Seeds the dataset of python manage.py benchmark_endpoints with bulk inserts, replacing the previous one: '
+            f'users named {BENCHMARK_USER_PREFIX}<n> (password {BENCHMARK_PASSWORD!r}, the first one is staff), their '
+            f'articles, comments with chains of replies, and reports.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--articles-per-user', type=int, default=10)
+        parser.add_argument('--comments-per-article', type=int, default=5)
+        parser.add_argument('--reply-depth', type=int, default=3, help='Replies chained below every comment.')
+        parser.add_argument('--reports-per-article', type=int, default=2)
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random texts.')
+
+    def handle(self, *args, **options):
+        created = seed_dataset(options['users'], options['articles_per_user'], options['comments_per_article'],
+                               options['reply_depth'], options['reports_per_article'], seed=options['seed'])
+        self.stdout.write(self.style.SUCCESS(
+            'Seeded ' + ', '.join(f'{count} {name}' for name, count in created.items()) + '.'
+        ))
@@ -0,0 +1,164 @@
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from app_articles.connections import pool_stats
+from app_articles.exceptions import QueryBudgetExceeded
+from app_articles.routers import is_pinned_to_primary, pin_to_primary, use_replicas
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCounter:
+    """
+    Database execute wrapper that records how many queries were run, how long they took and how many times each
+    query shape (the SQL before its parameters are bound) was repeated, and how many queries each database alias ran.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self.aliases = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql] += 1
+            self.aliases[context['connection'].alias] += 1
+
+    def most_repeated(self):
+        """
+        Returns (sql, times) of the most repeated query shape, or (None, 0) if no query was run.
+        """
+        most_common = self.shapes.most_common(1)
+        return most_common[0] if most_common else (None, 0)
+
+
+def get_query_budget(view_class, action):
+    """
+    Views declare their budget with a `query_budget` attribute, either an int for every action or a dict
+    {<action or lowercase http method>: <max queries>}. Returns None if the view has no budget for action.
+    """
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(action)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the SQL queries of every request and their total time, in every database connection.
+
+    - The figures are sent in the 'X-DB-Queries' and 'Server-Timing' response headers (QUERY_COUNT_HEADERS setting),
+      and the queries of each database alias in 'X-DB-Queries-By-Alias' (e.g. 'default=1, replica_1=2').
+      With DATABASE_POOL, the metrics of the connection pools of the process are sent in 'X-DB-Pool'.
+    - A query shape repeated QUERY_N_PLUS_ONE_THRESHOLD times or more is reported as a possible N+1, in the
+      'X-DB-Duplicate-Queries' header and in the log.
+    - Going over the `query_budget` of the view is logged, or raises QueryBudgetExceeded when QUERY_BUDGET_RAISE is
+      True (the default when running the tests), so a regression makes the test of the endpoint fail. The queries of
+      a streamed response are counted until it has been sent.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+
+        self.check_duplicates(request, response, counter)
+        if response.streaming:
+            response.streaming_content = self.stream_counting_queries(request, response.streaming_content, counter)
+        else:
+            self.check_budget(request, counter)
+        if getattr(settings, 'QUERY_COUNT_HEADERS', True):
+            response['X-DB-Queries'] = str(counter.count)
+            response['Server-Timing'] = f'db;dur={counter.duration * 1000:.2f};desc="{counter.count} queries"'
+            response['X-DB-Queries-By-Alias'] = ', '.join(f'{alias}={count}'
+                                                          for alias, count in sorted(counter.aliases.items()))
+            pools = pool_stats()
+            if pools:
+                response['X-DB-Pool'] = ', '.join(
+                    f"{alias} {' '.join(f'{name}={value:g}' for name, value in stats.items())}"
+                    for alias, stats in pools.items()
+                )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is None:
+            return None
+
+        # ViewSets map http methods to actions ({'get': 'list'}), APIViews are budgeted by http method.
+        method = request.method.lower()
+        action = (getattr(view_func, 'actions', None) or {}).get(method, method)
+        request.query_budget = (f'{view_class.__name__}.{action}', get_query_budget(view_class, action))
+        return None
+
+    def stream_counting_queries(self, request, content, counter):
+        """
+        Streamed responses (e.g. ArticleCommentViewSet.tree) run their queries after the view returned: they are counted
+        while the content is sent, and the budget is checked once it has been sent. The headers only count the queries
+        run by the view.
+        """
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            yield from content
+        self.check_budget(request, counter)
+
+    def check_duplicates(self, request, response, counter):
+        sql, times = counter.most_repeated()
+        if times >= getattr(settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 5):
+            logger.warning('Possible N+1 in %s %s: query repeated %s times: %s', request.method, request.path,
+                           times, sql)
+            if getattr(settings, 'QUERY_COUNT_HEADERS', True):
+                response['X-DB-Duplicate-Queries'] = str(times)
+
+    def check_budget(self, request, counter):
+        route, budget = getattr(request, 'query_budget', (None, None))
+        if budget is None or counter.count <= budget:
+            return
+
+        message = f'{route} ran {counter.count} queries, its budget is {budget}.'
+        if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Enables the read replicas (app_articles.routers.ReplicaRouter) for the safe requests (GET, HEAD, OPTIONS).
+
+    Read-your-writes: after a request that writes (an unsafe method that succeeded, or any ORM write), its client is
+    pinned to the primary for DATABASE_REPLICA_PIN_SECONDS, so that its next reads do not hit a replica that has not
+    replicated the write yet; so is the token issued by the response, if any (login). Does nothing while
+    DATABASE_REPLICAS is empty.
+    """
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        safe = request.method in self.safe_methods
+        with use_replicas(safe and not is_pinned_to_primary(request)) as state:
+            response = self.get_response(request)
+        if state.wrote or (not safe and response.status_code < 400):
+            pin_to_primary(request, response)
+        return response
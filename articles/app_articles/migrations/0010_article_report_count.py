@@ -0,0 +1,28 @@
+# Generated by Django 3.1.5 on 2026-10-18 16:23
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_report_count(apps, schema_editor):
+    Article = apps.get_model('app_articles', 'Article')
+    reports = Article.users_reports.through.objects.filter(article=OuterRef('pk')).order_by().values('article')
+    count = reports.annotate(count=Count('id')).values('count')
+    Article.objects.update(report_count=Coalesce(Subquery(count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0009_article_users_reports'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='report_count',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(fill_report_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.1.5 on 2026-10-18 16:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0010_article_report_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(is_public=True), fields=['-created', '-id'], name='article_public_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created', '-id'], name='article_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlecomment',
+            index=models.Index(fields=['article', 'created', 'id'], name='comment_article_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlecomment',
+            index=models.Index(condition=models.Q(is_reply=True), fields=['created', 'id'], name='comment_is_reply_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='articlecomment',
+            index=models.Index(fields=['comment_reply', 'created', 'id'], name='comment_reply_created_idx'),
+        ),
+    ]
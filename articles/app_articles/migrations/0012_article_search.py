@@ -0,0 +1,50 @@
+# Generated by Django 3.1.5 on 2026-10-18 16:38
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_vector_index(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL, the other databases use ArticleSearchTerm instead.
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE INDEX article_search_vector_idx ON app_articles_articlesearchdocument '
+                              'USING gin (vector)')
+
+
+def drop_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS article_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0011_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleSearchDocument',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='app_articles.article')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArticleSearchTerm',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('field', models.CharField(choices=[('T', 'Title'), ('X', 'Text')], max_length=1)),
+                ('frequency', models.PositiveIntegerField()),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='app_articles.article')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='articlesearchterm',
+            index=models.Index(fields=['term', 'article'], name='search_term_article_idx'),
+        ),
+        migrations.RunPython(create_vector_index, drop_vector_index),
+        # Existing articles are indexed with: python manage.py rebuild_search_index
+    ]
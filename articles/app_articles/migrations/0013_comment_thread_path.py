@@ -0,0 +1,40 @@
+# Generated by Django 3.1.5 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+def fill_paths(apps, schema_editor):
+    # Same as app_articles.threads.fill_comment_paths, replied comments always have a lower id than their replies.
+    ArticleComment = apps.get_model('app_articles', 'ArticleComment')
+    paths = {}
+    comments = []
+    for pk, replied_id in ArticleComment.objects.order_by('pk').values_list('pk', 'comment_reply_id').iterator():
+        replied_path, replied_depth = paths[replied_id] if replied_id is not None else ('', -1)
+        paths[pk] = (replied_path + f'{pk:010d}', replied_depth + 1)
+        comments.append(ArticleComment(pk=pk, path=paths[pk][0], depth=paths[pk][1]))
+    ArticleComment.objects.bulk_update(comments, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0012_article_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlecomment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='articlecomment',
+            name='path',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='articlecomment',
+            index=models.Index(fields=['article', 'path'], name='comment_article_path_idx'),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
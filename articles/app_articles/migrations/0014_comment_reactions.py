@@ -0,0 +1,39 @@
+# Generated by Django 3.1.5 on 2026-10-18 16:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0013_comment_thread_path'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='articlecomment',
+            name='dislikes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='articlecomment',
+            name='likes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='CommentReaction',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.SmallIntegerField(choices=[(1, 'Like'), (-1, 'Dislike')])),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('comment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reactions', to='app_articles.articlecomment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comment_reactions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='commentreaction',
+            constraint=models.UniqueConstraint(fields=('comment', 'user'), name='comment_reaction_unique'),
+        ),
+    ]
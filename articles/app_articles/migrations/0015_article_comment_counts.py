@@ -0,0 +1,52 @@
+# Generated by Django 3.1.5 on 2026-10-18 16:44
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_counts(apps, schema_editor):
+    Article = apps.get_model('app_articles', 'Article')
+    ArticleComment = apps.get_model('app_articles', 'ArticleComment')
+    comments = ArticleComment.objects.filter(article=OuterRef('pk')).order_by().values('article')
+
+    def aggregate(expression):
+        return Subquery(comments.annotate(value=expression).values('value'))
+
+    Article.objects.update(comment_count=Coalesce(aggregate(Count('id')), 0),
+                           reply_count=Coalesce(aggregate(Count('id', filter=Q(is_reply=True))), 0),
+                           last_comment_at=aggregate(Max('created')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0014_comment_reactions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='last_comment_at',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-comment_count', '-id'], name='article_comment_count_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(last_comment_at__isnull=False), fields=['-last_comment_at', '-id'], name='article_last_comment_idx'),
+        ),
+        migrations.RunPython(fill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 3.1.5 on 2026-10-18 16:46
+
+from django.db import migrations, models
+
+
+def make_summary(text, length=200):
+    # Copy of app_articles.models.make_summary at the time of this migration.
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length - 1].rsplit(' ', 1)[0] + '…'
+
+
+def fill_summaries(apps, schema_editor):
+    Article = apps.get_model('app_articles', 'Article')
+    articles = []
+    for article in Article.objects.only('id', 'text').iterator(chunk_size=2000):
+        article.summary = make_summary(article.text)
+        articles.append(article)
+    Article.objects.bulk_update(articles, ['summary'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0015_article_comment_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='summary',
+            field=models.CharField(blank=True, default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
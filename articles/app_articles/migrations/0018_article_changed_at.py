@@ -0,0 +1,25 @@
+# Generated by Django 3.1.5 on 2026-10-18 17:35
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_changed_at(apps, schema_editor):
+    Article = apps.get_model('app_articles', 'Article')
+    Article.objects.update(changed_at=F('updated'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0017_deleted_rows'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='changed_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(fill_changed_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.1.5 on 2026-10-18 17:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_articles', '0018_article_changed_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='article',
+            name='report_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-report_count', '-id'], name='article_report_count_idx'),
+        ),
+    ]
@@ -1,13 +1,20 @@
 # For Token Authentication
 from django.conf import settings
-from django.db.models.signals import post_save
+from django.contrib.postgres.search import SearchVectorField
+from django.core.signals import request_started
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
 from django.dispatch import receiver
+from django.utils import timezone
 from rest_framework.authtoken.models import Token
 # For Models
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
 from django.db import models
 from django.contrib.auth.models import PermissionsMixin
 
+from app_articles.authentication import invalidate_token
+from app_articles.cache import invalidate_articles_list
+
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
@@ -140,11 +147,40 @@ def create_auth_token(sender, instance=None, created=False, **kwargs):
         Token.objects.create(user=instance)
 
 
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_token(sender, instance=None, created=False, **kwargs):
+    """
+    CachedTokenAuthentication caches the user of every token, so a saved user (e.g. is_active or is_staff changed)
+    must not be served from the cache anymore.
+    """
+    if not created:
+        for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+            invalidate_token(key)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance=None, **kwargs):
+    invalidate_token(instance.key)
+
+
+def make_summary(text, length):
+    """
+    Returns text with its whitespace collapsed, cut at the last whole word that fits in length characters.
+    """
+    text = ' '.join(text.split())
+    if len(text) <= length:
+        return text
+    return text[:length - 1].rsplit(' ', 1)[0] + '…'
+
+
 class Article(models.Model):
     title = models.CharField(max_length=30, unique=True, null=False)
     text = models.TextField(null=False)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
+    # Internal: last write of any exported column, content or not (e.g. report_count), bumped by save() and by the
+    # UPDATEs of the denormalized counts. Incremental exports read it, `updated` only changes with the content.
+    changed_at = models.DateTimeField(auto_now=True, db_index=True)
     is_public = models.BooleanField(null=False)
     """DOUBT: I thought that models.ForeignKey saves integers ids. However, in serializers.py I created the field
     as a CharField and a username was shown. I have an idea about what is probably happening here. When I create an 
@@ -154,22 +190,273 @@ class Article(models.Model):
     """
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     users_reports = models.ManyToManyField(CustomUser, related_name='reports_users')
+    # Denormalized len(users_reports). It is kept up to date by update_report_count (below) and it can be rebuilt with
+    # python manage.py rebuild_report_counts
+    report_count = models.PositiveIntegerField(default=0)
+    # Denormalized number of comments (replies included), number of replies and creation of the latest comment. They
+    # are kept up to date by update_comment_counts (below) and they can be rebuilt with
+    # python manage.py reconcile_comment_counts
+    comment_count = models.PositiveIntegerField(default=0)
+    reply_count = models.PositiveIntegerField(default=0)
+    last_comment_at = models.DateTimeField(null=True)
+    # First SUMMARY_LENGTH characters of text (cut at a word), set by save(). Sent instead of text with ?summary=true.
+    summary = models.CharField(max_length=200, blank=True, default='', editable=False)
+
+    # Fields maintained with UPDATE ... F() statements. A plain save() of an already loaded article must not write them
+    # back, otherwise a stale value would overwrite the increments done after the article was loaded.
+    COUNTER_FIELDS = ['report_count', 'comment_count', 'reply_count', 'last_comment_at']
+
+    class Meta:
+        indexes = [
+            # Anonymous list: WHERE is_public ORDER BY created, id (keyset pagination, see paginations.py).
+            # Partial instead of (is_public, created, id): Django filters with a bare 'WHERE is_public', which can not
+            # seek into a leading is_public column but does match the index condition.
+            models.Index(fields=['-created', '-id'], condition=models.Q(is_public=True),
+                         name='article_public_created_idx'),
+            # Logged users list: ORDER BY created, id.
+            models.Index(fields=['-created', '-id'], name='article_created_idx'),
+            # Moderation queue: ORDER BY report_count DESC, id DESC and its keyset (see ReportCountPagination).
+            models.Index(fields=['-report_count', '-id'], name='article_report_count_idx'),
+            # Most discussed: ORDER BY comment_count DESC, id DESC.
+            models.Index(fields=['-comment_count', '-id'], name='article_comment_count_idx'),
+            # Recently discussed: WHERE last_comment_at IS NOT NULL ORDER BY last_comment_at DESC, id DESC.
+            models.Index(fields=['-last_comment_at', '-id'], condition=models.Q(last_comment_at__isnull=False),
+                         name='article_last_comment_idx'),
+        ]
+
+    SUMMARY_LENGTH = 200
+
+    def save(self, *args, **kwargs):
+        self.summary = make_summary(self.text, self.SUMMARY_LENGTH)
+        if self.pk is not None and not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.title
 
 
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+def invalidate_articles_list_cache(sender, **kwargs):
+    """
+    Every cached page of the articles list may contain the saved or deleted article, so all of them are dropped.
+    Note that QuerySet.update() and bulk_create() do not send these signals, call invalidate_articles_list() after
+    them if they change what the list shows.
+    """
+    invalidate_articles_list()
+
+
+@receiver(post_save, sender=Article)
+def index_article_search(sender, instance, raw=False, **kwargs):
+    """
+    Keeps the search index (app_articles.search) up to date, deleted articles are removed from it by CASCADE.
+    Like the list cache, articles written with QuerySet.update() or bulk_create() are not reindexed, run
+    python manage.py rebuild_search_index after them.
+    """
+    from app_articles.search import index_article
+
+    if not raw:
+        index_article(instance)
+
+
+@receiver(m2m_changed, sender=Article.users_reports.through)
+def update_report_count(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keeps Article.report_count in sync with Article.users_reports.
+    On post_add, Django sends in pk_set only the rows that were really inserted, so the counter can be incremented
+    with an F() expression (UPDATE ... SET report_count = report_count + n), which is atomic and does not read the
+    reporters. Removals are less frequent, so the affected articles are just recounted.
+    """
+    from app_articles.reports import rebuild_report_counts
+
+    if action == 'pre_clear' and reverse:
+        # After the clear there is no way to know which articles the user had reported.
+        instance._cleared_report_ids = list(instance.reports_users.values_list('pk', flat=True))
+    elif action == 'post_add' and pk_set:
+        if reverse:
+            Article.objects.filter(pk__in=pk_set).update(report_count=F('report_count') + 1, changed_at=timezone.now())
+        else:
+            Article.objects.filter(pk=instance.pk).update(report_count=F('report_count') + len(pk_set),
+                                                          changed_at=timezone.now())
+    elif action == 'post_remove' and pk_set:
+        rebuild_report_counts(pk_set if reverse else [instance.pk])
+    elif action == 'post_clear':
+        rebuild_report_counts(instance.__dict__.pop('_cleared_report_ids', []) if reverse else [instance.pk])
+
+
 class ArticleComment(models.Model):
     message = models.TextField(null=False)
     created = models.DateTimeField(auto_now_add=True)
     updated = models.DateTimeField(auto_now=True)
-    likes = models.SmallIntegerField(default=0)
-    dislikes = models.SmallIntegerField(default=0)
+    # Maintained from CommentReaction by app_articles.counters, they can be rebuilt with
+    # python manage.py rebuild_comment_counters
+    likes = models.BigIntegerField(default=0)
+    dislikes = models.BigIntegerField(default=0)
     is_reply = models.BooleanField(default=False)
 
     article = models.ForeignKey(Article, on_delete=models.CASCADE)
     author_comment = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     comment_reply = models.ForeignKey('self', on_delete=models.CASCADE, null=True)
+    # Materialized path of the comment in its thread and number of replied comments above it, set on insert by
+    # set_comment_thread_path (below). See app_articles.threads.
+    path = models.TextField(default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Comments tree of an article: WHERE article_id = ? ORDER BY path.
+            models.Index(fields=['article', 'path'], name='comment_article_path_idx'),
+            # Comments of an article: WHERE article_id = ? ORDER BY created, id.
+            models.Index(fields=['article', 'created', 'id'], name='comment_article_created_idx'),
+            # Replies list: WHERE is_reply ORDER BY created, id. Partial, so plain comments are not indexed.
+            models.Index(fields=['created', 'id'], condition=models.Q(is_reply=True),
+                         name='comment_is_reply_created_idx'),
+            # Replies of a comment: WHERE comment_reply_id = ? ORDER BY created, id.
+            models.Index(fields=['comment_reply', 'created', 'id'], name='comment_reply_created_idx'),
+        ]
+
+    # Like Article.COUNTER_FIELDS: written by UPDATE ... F() statements and by the flush of the counter buffer, never by
+    # a plain save() of an already loaded comment.
+    COUNTER_FIELDS = ['likes', 'dislikes']
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None and not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [field.name for field in self._meta.concrete_fields
+                                       if not field.primary_key and field.name not in self.COUNTER_FIELDS]
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return str(self.id)
+
+
+class ArticleSearchDocument(models.Model):
+    """
+    Search index of the PostgreSQL engine: title (weight A) and text (weight B) of the article as a tsvector.
+    The GIN index is only created on PostgreSQL (see migration 0012), on other databases the table stays empty.
+    """
+    article = models.OneToOneField(Article, on_delete=models.CASCADE, primary_key=True, related_name='search_document')
+    vector = SearchVectorField(null=True)
+
+
+class ArticleSearchTerm(models.Model):
+    """
+    Search index of the inverted engine (databases other than PostgreSQL): one row per term of the title or the text
+    of an article, with the number of times it appears.
+    """
+    TITLE = 'T'
+    TEXT = 'X'
+    FIELDS = (
+        (TITLE, 'Title'),
+        (TEXT, 'Text')
+    )
+    term = models.CharField(max_length=64)
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='search_terms')
+    field = models.CharField(max_length=1, choices=FIELDS)
+    frequency = models.PositiveIntegerField()
+
+    class Meta:
+        indexes = [
+            # Search: WHERE term IN (...) GROUP BY article_id.
+            models.Index(fields=['term', 'article'], name='search_term_article_idx'),
+        ]
+
+
+class CommentReaction(models.Model):
+    """
+    Like or dislike of a user on a comment, at most one per user and comment.
+    """
+    LIKE = 1
+    DISLIKE = -1
+    VALUES = (
+        (LIKE, 'Like'),
+        (DISLIKE, 'Dislike')
+    )
+    comment = models.ForeignKey(ArticleComment, on_delete=models.CASCADE, related_name='reactions')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='comment_reactions')
+    value = models.SmallIntegerField(choices=VALUES)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['comment', 'user'], name='comment_reaction_unique'),
+        ]
+
+
+class DeletedRow(models.Model):
+    """
+    Tombstone of a deleted article or comment, sent by the incremental exports (app_articles.export) so that their
+    consumers delete it too. `type` is its type in the export ('article' or 'comment').
+    """
+    type = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    deleted = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Incremental export: WHERE type = ? AND deleted > ?.
+            models.Index(fields=['type', 'deleted'], name='deleted_row_type_deleted_idx'),
+        ]
+
+
+@receiver(post_save, sender=ArticleComment)
+def set_comment_thread_path(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Comments never move to another thread, so their path only has to be set once. bulk_create() does not send this
+    signal, call app_articles.threads.fill_comment_paths() after it.
+    """
+    from app_articles.threads import set_comment_path
+
+    if created and not raw:
+        set_comment_path(instance)
+
+
+@receiver(post_save, sender=ArticleComment)
+@receiver(pre_delete, sender=ArticleComment)
+@receiver(pre_delete, sender=Article)
+@receiver(post_delete, sender=ArticleComment)
+@receiver(post_delete, sender=Article)
+def update_comment_counts(sender, instance, created=False, raw=False, **kwargs):
+    """
+    Keeps Article.comment_count, reply_count and last_comment_at in sync with the comments of the article: a new
+    comment is counted right away, the articles of deleted comments are rebuilt once per delete, after its last row
+    and in its transaction (see app_articles.activity.RemovedCommentsBatch).
+    bulk_create() does not send post_save, call app_articles.activity.rebuild_comment_counts() after it.
+    """
+    from app_articles.activity import RemovedCommentsBatch, comment_added
+
+    if raw:
+        return
+    if kwargs['signal'] is pre_delete:
+        RemovedCommentsBatch.collect(instance)
+    elif kwargs['signal'] is post_delete:
+        RemovedCommentsBatch.deleted()
+    elif created:
+        comment_added(instance)
+
+
+@receiver(pre_delete, sender=ArticleComment)
+@receiver(pre_delete, sender=Article)
+@receiver(post_delete, sender=ArticleComment)
+@receiver(post_delete, sender=Article)
+def record_deleted_row(sender, instance, **kwargs):
+    """
+    Keeps a DeletedRow of every exported row deleted, written with one bulk_create per delete in its transaction.
+    """
+    from app_articles.export import DeletedRowsBatch
+
+    if kwargs['signal'] is pre_delete:
+        DeletedRowsBatch.collect(instance)
+    else:
+        DeletedRowsBatch.deleted()
+
+
+@receiver(request_started)
+def check_database_connections(sender, **kwargs):
+    """
+    Health check of the persistent database connections, before the request uses them (see DATABASE_CONN_MAX_AGE).
+    """
+    from app_articles.connections import check_connections
+
+    check_connections()
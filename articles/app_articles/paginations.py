@@ -1,22 +1,260 @@
-from rest_framework.pagination import LimitOffsetPagination, PageNumberPagination
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
 
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (BasePagination, CursorPagination, LimitOffsetPagination, PageNumberPagination,
+                                       _positive_int)
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
-class ArticlesPagination(LimitOffsetPagination):
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (a.k.a. seek) pagination on (keyset_field, id), (created, id) by default.
+
+    Instead of OFFSET n, every page is fetched with WHERE (created, id) < (<last created>, <last id>) ORDER BY created,
+    id LIMIT size, so deep pages cost the same as the first one. As id breaks the ties, rows sharing a value of
+    keyset_field are neither repeated nor skipped. The direction is taken from the ordering of the
+    queryset (for articles, the 'Sort: ASC|DESC' header applied by ArticleViewSet.get_asc_or_desc), falling back to
+    `ordering` when the queryset is not ordered.
+
+    Query parameters:
+        cursor: opaque cursor found in the 'next' and 'previous' links of the response.
+        limit: page size.
+        count=false: skips the COUNT(*) of the whole queryset, 'count' is not sent in the response.
+        pagination=offset (or any 'offset' parameter): the former LimitOffset pagination, see offset_pagination_class.
+        It is used as well for querysets not sorted by created.
+    """
+    page_size = 10
+    max_page_size = 20
+    keyset_field = 'created'
+    ordering = '-created'
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'limit'
+    count_query_param = 'count'
+    mode_query_param = 'pagination'
+    offset_pagination_class = None
+    # Count of the queryset when the view already knows it (e.g. app_articles.conditional.queryset_validators).
+    known_count = None
+
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.offset_paginator = None
+        if self.offset_pagination_class is not None and (self.use_offset_pagination(request)
+                                                         or not self.is_keyset_ordered(queryset)):
+            self.offset_paginator = self.offset_pagination_class()
+            return self.offset_paginator.paginate_queryset(queryset, request, view)
+
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.descending = self.get_descending(queryset)
+        self.count = self.get_count(queryset) if self.include_count(request) else None
+
+        position, backwards = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position, reverse=backwards))
+        ordering = ((f'-{self.keyset_field}', '-id') if self.descending != backwards
+                    else (self.keyset_field, 'id'))
+
+        # One extra row tells whether there is another page in the direction we are moving.
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if backwards:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            if has_more or backwards:
+                self.next_position = self.get_position(results[-1])
+            if position is not None and (has_more or not backwards):
+                self.previous_position = self.get_position(results[0])
+        elif backwards and position is not None:
+            self.next_position = position
+        return results
+
+    def get_paginated_response(self, data):
+        if self.offset_paginator is not None:
+            return self.offset_paginator.get_paginated_response(data)
+
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def use_offset_pagination(self, request):
+        return (request.query_params.get(self.mode_query_param) == 'offset'
+                or self.offset_pagination_class.offset_query_param in request.query_params)
+
+    def is_keyset_ordered(self, queryset):
+        """
+        False when the queryset is sorted by something else than keyset_field (e.g. ArticleViewSet ?sort=comments),
+        it is then paginated by offset_pagination_class.
+        """
+        order_by = queryset.query.order_by
+        return not order_by or order_by[0].lstrip('-') == self.keyset_field
+
+    def include_count(self, request):
+        return request.query_params.get(self.count_query_param, '').lower() not in ('false', '0', 'no')
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.query_params[self.page_size_query_param], strict=True,
+                                 cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_count(self, queryset):
+        if self.known_count is not None:
+            return self.known_count
+        return queryset.count()
+
+    def get_descending(self, queryset):
+        for field in queryset.query.order_by or [self.ordering]:
+            if field.lstrip('-') == self.keyset_field:
+                return field.startswith('-')
+        return self.ordering.startswith('-')
+
+    def get_position(self, row):
+        # Rows are model instances, or dicts when the view pages .values() (app_articles.fast_serializers).
+        if isinstance(row, dict):
+            return row[self.keyset_field], row['id']
+        return getattr(row, self.keyset_field), row.pk
+
+    def get_position_filter(self, position, reverse=False):
+        value, pk = position
+        lookup = 'lt' if self.descending != reverse else 'gt'
+        return Q(**{f'{self.keyset_field}__{lookup}': value}) | Q(**{self.keyset_field: value, f'pk__{lookup}': pk})
+
+    def format_keyset_value(self, value):
+        return value.isoformat()
+
+    def parse_keyset_value(self, raw):
+        """
+        Value of keyset_field written in a cursor by format_keyset_value. Returns None, or raises ValueError, when raw
+        is not valid.
+        """
+        return parse_datetime(raw)
+
+    def encode_cursor(self, position, backwards):
+        value, pk = position
+        raw = f'{self.format_keyset_value(value)}|{pk}|{int(backwards)}'
+        return urlsafe_b64encode(raw.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        """
+        Returns ((<keyset_field>, id), backwards) of the requested cursor, or (None, False) if there is no cursor.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            value, pk, backwards = urlsafe_b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            value = self.parse_keyset_value(value)
+            position = (value, int(pk))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position, backwards == '1'
+
+    def get_link(self, position, backwards):
+        if position is None:
+            return None
+        url = remove_query_param(self.base_url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, backwards))
+
+    def get_next_link(self):
+        return self.get_link(self.next_position, backwards=False)
+
+    def get_previous_link(self):
+        return self.get_link(self.previous_position, backwards=True)
+
+
+class ArticlesOffsetPagination(LimitOffsetPagination):
     default_limit = 5
     limit_query_param = 'limit'
     offset_query_param = 'offset'
     max_limit = 6
 
 
-class ArticleCommentsPagination(LimitOffsetPagination):
+class ArticlesPagination(KeysetPagination):
+    page_size = 5
+    max_page_size = 6
+    ordering = '-created'
+    offset_pagination_class = ArticlesOffsetPagination
+
+
+class ArticleCommentsOffsetPagination(LimitOffsetPagination):
     default_limit = 10
     limit_query_param = 'limit'
     offset_query_param = 'offset'
     max_limit = 20
 
 
+class ArticleCommentsPagination(KeysetPagination):
+    page_size = 10
+    max_page_size = 20
+    ordering = 'created'
+    offset_pagination_class = ArticleCommentsOffsetPagination
+
+
 class UsersPagination(PageNumberPagination):
     page_query_param = 'page'
     page_size_query_param = 'size'
     page_size = 10
     max_page_size = 12
+
+
+class ReportCountPagination(KeysetPagination):
+    """
+    Keyset pagination on (report_count, id), most reported first: the moderation queue of ReportsPagination.
+    """
+    page_size = 10
+    page_size_query_param = 'size'
+    max_page_size = 50
+    keyset_field = 'report_count'
+    ordering = '-report_count'
+
+    def include_count(self, request):
+        return False
+
+    def format_keyset_value(self, value):
+        return str(value)
+
+    def parse_keyset_value(self, raw):
+        return int(raw)
+
+
+class ReportsPagination(CursorPagination):
+    """
+    Reports by id, most recent article first. ?sort=reports pages the moderation queue with ReportCountPagination:
+    CursorPagination only puts the first ordering field in its cursors, and report_count is neither unique nor stable.
+    """
+    page_size = 10
+    page_size_query_param = 'size'
+    max_page_size = 50
+    # Articles ids are unique and never change, so they are a safe cursor.
+    ordering = '-id'
+    sort_query_param = 'sort'
+    reports_pagination_class = ReportCountPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.reports_paginator = None
+        if request.query_params.get(self.sort_query_param) == 'reports':
+            self.reports_paginator = self.reports_pagination_class()
+            return self.reports_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.reports_paginator is not None:
+            return self.reports_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -1,17 +1,16 @@
 from rest_framework.permissions import BasePermission
-from app_articles.models import Article
 
 
 class PublicArticleOrLoggedUser(BasePermission):
     """
-    Allows access only to authenticated users.
-    """
+    Allows access to public articles to anyone, and to the rest of them only to authenticated users.
 
-    def has_permission(self, request, view):
-        pk_article = request.parser_context['kwargs']['pk']
-        article = Article.objects.get(pk=pk_article)
+    It is an object level permission: it is checked by get_object() on the article the view already fetched, so a
+    retrieve runs one single query, and a missing article is a 404 raised by get_object().
+    """
 
-        if article.is_public:
+    def has_object_permission(self, request, view, obj):
+        if obj.is_public:
             return True
         else:
             return bool(request.user and request.user.is_authenticated)
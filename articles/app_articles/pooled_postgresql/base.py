@@ -0,0 +1,9 @@
+from django.db.backends.postgresql import base
+
+from app_articles.connections import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    PostgreSQL backend with a pool of connections per process (app_articles.connections.ConnectionPool).
+    """
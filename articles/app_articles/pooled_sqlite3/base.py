@@ -0,0 +1,10 @@
+from django.db.backends.sqlite3 import base
+
+from app_articles.connections import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """
+    SQLite backend with a pool of connections per process (app_articles.connections.ConnectionPool), to try the pool
+    locally.
+    """
@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from app_articles.models import Article, CustomUser
+
+
+def reporters_prefetch():
+    """
+    Prefetch of the users that reported an article, loaded only with the columns the report shows. The reporters are
+    stored in `article.reporters`, so every article of a page is filled from one single query.
+    """
+    reporters = CustomUser.objects.only('id', 'username', 'email').order_by('id')
+    return Prefetch('users_reports', queryset=reporters, to_attr='reporters')
+
+
+def articles_reports(only_reported=False):
+    """
+    Returns the queryset that feeds every report: articles with their denormalized `report_count` and their
+    reporters prefetched. Evaluating a page of it costs two queries, no matter how many articles or reporters there
+    are. When only_reported is True, articles without reports are discarded in SQL (WHERE report_count > 0).
+    """
+    queryset = Article.objects.only('id', 'report_count')
+    if only_reported:
+        queryset = queryset.filter(report_count__gt=0)
+    return queryset.prefetch_related(reporters_prefetch())
+
+
+def rebuild_report_counts(article_ids=None):
+    """
+    Recomputes Article.report_count from the users_reports table with a single UPDATE ... SET report_count =
+    (SELECT COUNT(*) ...) statement. If article_ids is None every article is rebuilt. Their `changed_at` is bumped, so
+    the incremental exports send the new counts.
+    Returns the number of updated articles.
+    """
+    through = Article.users_reports.through
+    reports = through.objects.filter(article=OuterRef('pk')).order_by().values('article')
+    count = reports.annotate(count=Count('id')).values('count')
+
+    articles = Article.objects.all()
+    if article_ids is not None:
+        articles = articles.filter(pk__in=article_ids)
+    return articles.update(report_count=Coalesce(Subquery(count), 0), changed_at=timezone.now())
+
+
+def report_articles(user, article_ids):
+    """
+    Reports every article in article_ids on behalf of user, in four statements whatever the number of articles or of
+    previous reporters:
+        1) One SELECT ... FOR UPDATE that locks the articles, in pk order. A concurrent report of the same articles
+           waits here until this one is committed, so both can not see an article as not reported yet.
+        2) One SELECT that finds which articles exist and, through an EXISTS probe, which were already reported by user.
+        3) One INSERT into the users_reports table (ignore_conflicts keeps it idempotent).
+        4) One UPDATE that increments report_count of the newly reported articles, and bumps their `changed_at`.
+    bulk_create does not send m2m_changed, so report_count is incremented here instead of in update_report_count.
+
+    Returns a tuple (reported, already_reported, not_found) with the articles ids of each group.
+    """
+    through = Article.users_reports.through
+    article_ids = list(dict.fromkeys(article_ids))
+    already_reported_by_user = Exists(through.objects.filter(article=OuterRef('pk'), customuser=user.pk))
+
+    with transaction.atomic():
+        # The lock is taken by its own statement: the probe below must run with a snapshot taken after the wait.
+        list(Article.objects.select_for_update().filter(pk__in=article_ids).order_by('pk').values_list('pk', flat=True))
+        found = dict(Article.objects.filter(pk__in=article_ids)
+                     .annotate(already_reported=already_reported_by_user)
+                     .values_list('pk', 'already_reported'))
+        reported = [pk for pk in article_ids if found.get(pk) is False]
+        if reported:
+            through.objects.bulk_create([through(article_id=pk, customuser_id=user.pk) for pk in reported],
+                                        ignore_conflicts=True)
+            Article.objects.filter(pk__in=reported).update(report_count=F('report_count') + 1,
+                                                           changed_at=timezone.now())
+
+    already_reported = [pk for pk in article_ids if found.get(pk) is True]
+    not_found = [pk for pk in article_ids if pk not in found]
+    return reported, already_reported, not_found
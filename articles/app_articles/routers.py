@@ -0,0 +1,109 @@
+import hashlib
+import random
+from contextlib import contextmanager
+
+from asgiref.local import Local
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Routing state of the request being served (see use_replicas), per thread and per asyncio task.
+_state = Local()
+
+
+@contextmanager
+def use_replicas(enabled=True):
+    """
+    Within the block, ReplicaRouter sends the reads to the replicas when enabled is True (the primary otherwise).
+    Yields the state, whose `wrote` is True once a write was routed to the primary inside the block.
+    Outside of any block (management commands, shell, tests...) everything runs on the primary.
+    """
+    previous = getattr(_state, 'current', None)
+    state = _state.current = RoutingState(enabled)
+    try:
+        yield state
+    finally:
+        _state.current = previous
+
+
+class RoutingState:
+    def __init__(self, replicas):
+        self.replicas = replicas
+        self.wrote = False
+
+
+class ReplicaRouter:
+    """
+    Sends the reads to one of the DATABASE_REPLICAS (chosen at random per query) and the writes to the primary
+    (default), when enabled by use_replicas (ReplicaRoutingMiddleware enables it for the safe requests of the clients
+    not pinned to the primary). Once a write is routed in a request, its later reads go to the primary too, and so do
+    the reads inside a transaction of the primary.
+    The replicas get their schema from the replication, so they are never migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = getattr(_state, 'current', None)
+        if state is None or not state.replicas or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = getattr(_state, 'current', None)
+        if state is not None:
+            state.replicas = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+def get_pin_cache():
+    return caches[settings.DATABASE_REPLICA_PIN_CACHE_ALIAS]
+
+
+def pin_cache_key(request):
+    """
+    Key of the client of request in the pins cache: its token (Authorization header) when it has one, else its
+    session, else its address.
+    """
+    client = (request.headers.get('Authorization')
+              or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+              or request.META.get('REMOTE_ADDR'))
+    return client_pin_cache_key(client)
+
+
+def client_pin_cache_key(client):
+    return f"db:pin:{hashlib.md5(repr(client).encode('utf-8')).hexdigest()}"
+
+
+def issued_token(response):
+    """
+    Token sent in the body of response, e.g. by POST /api/login/: the client sends it in its next requests.
+    """
+    data = getattr(response, 'data', None)
+    token = data.get('token') if isinstance(data, dict) else None
+    return token if isinstance(token, str) else None
+
+
+def pin_to_primary(request, response=None):
+    """
+    Sends every read of the client of request to the primary for DATABASE_REPLICA_PIN_SECONDS, so that it reads its
+    own writes while the replicas catch up. When response issues a token (login), the client is pinned under it too,
+    as its next requests are keyed by it: they must not authenticate against a replica that lacks the token.
+    """
+    keys = [pin_cache_key(request)]
+    token = issued_token(response)
+    if token is not None:
+        keys.append(client_pin_cache_key(f'Token {token}'))
+    get_pin_cache().set_many(dict.fromkeys(keys, True), timeout=settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(request):
+    return bool(get_pin_cache().get(pin_cache_key(request)))
@@ -0,0 +1,143 @@
+import re
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, Count, F, IntegerField, Sum, TextField, Value, When
+from django.utils.html import escape
+
+# Words too common to be worth indexing (the inverted engine only, PostgreSQL has its own dictionaries).
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on', 'or', 'that',
+    'the', 'this', 'to', 'was', 'with',
+])
+# Terms longer than ArticleSearchTerm.term are not indexed.
+MAX_TERM_LENGTH = 64
+# A match in the title weighs TITLE_WEIGHT times a match in the text.
+TITLE_WEIGHT = 3
+# Words of text shown around the first match by highlight().
+EXCERPT_WORDS = 30
+# Markers of the matches in the ts_headline output, turned into <b></b> by escape_headline() once the text is escaped.
+HEADLINE_START = '\x02'
+HEADLINE_STOP = '\x03'
+
+WORD_RE = re.compile(r'\w+')
+
+
+def search_engine():
+    """
+    'postgres': tsvectors stored in ArticleSearchDocument, behind a GIN index.
+    'inverted': terms stored in ArticleSearchTerm, for the other databases (e.g. SQLite while developing).
+    """
+    if settings.SEARCH_ENGINE != 'auto':
+        return settings.SEARCH_ENGINE
+    return 'postgres' if connection.vendor == 'postgresql' else 'inverted'
+
+
+def tokenize(text):
+    return [word for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS and len(word) <= MAX_TERM_LENGTH]
+
+
+def index_article(article):
+    """
+    (Re)indexes the title and text of the article, called from the post_save of Article. Deleted articles leave the
+    index through the CASCADE of their ArticleSearchDocument / ArticleSearchTerm rows.
+    """
+    if search_engine() == 'postgres':
+        _index_postgres(article)
+    else:
+        _index_inverted(article)
+
+
+def _index_postgres(article):
+    from django.contrib.postgres.search import SearchVector
+    from app_articles.models import ArticleSearchDocument
+
+    config = settings.SEARCH_CONFIG
+    vector = (SearchVector(Value(article.title, output_field=TextField()), weight='A', config=config)
+              + SearchVector(Value(article.text, output_field=TextField()), weight='B', config=config))
+    if not ArticleSearchDocument.objects.filter(article_id=article.pk).update(vector=vector):
+        ArticleSearchDocument.objects.create(article_id=article.pk, vector=vector)
+
+
+def _index_inverted(article):
+    from app_articles.models import ArticleSearchTerm
+
+    terms = [ArticleSearchTerm(term=term, article_id=article.pk, field=field, frequency=frequency)
+             for field, text in ((ArticleSearchTerm.TITLE, article.title), (ArticleSearchTerm.TEXT, article.text))
+             for term, frequency in Counter(tokenize(text)).items()]
+    ArticleSearchTerm.objects.filter(article_id=article.pk).delete()
+    ArticleSearchTerm.objects.bulk_create(terms)
+
+
+def search_articles(queryset, query):
+    """
+    Filters the articles of queryset matching every term of query, best matches first.
+    Every article is annotated with its 'rank'; on PostgreSQL also with its 'title_highlight' and 'text_highlight'
+    (ts_headline, to be escaped by escape_headline()), on the inverted engine they are computed by highlight() once
+    the page is known.
+    """
+    if search_engine() == 'postgres':
+        return _search_postgres(queryset, query)
+    return _search_inverted(queryset, query)
+
+
+def _search_postgres(queryset, query):
+    from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+
+    config = settings.SEARCH_CONFIG
+    search_query = SearchQuery(query, config=config)
+    options = {'config': config, 'start_sel': HEADLINE_START, 'stop_sel': HEADLINE_STOP, 'max_words': EXCERPT_WORDS}
+    return queryset.filter(search_document__vector=search_query).annotate(
+        rank=SearchRank(F('search_document__vector'), search_query),
+        title_highlight=SearchHeadline('title', search_query, highlight_all=True, **options),
+        text_highlight=SearchHeadline('text', search_query, **options),
+    ).order_by('-rank', '-created', '-id')
+
+
+def _search_inverted(queryset, query):
+    from app_articles.models import ArticleSearchTerm
+
+    terms = set(tokenize(query))
+    if not terms:
+        return queryset.none()
+
+    # filter() and annotate() on search_terms share the join, so only the rows of the searched terms are aggregated.
+    return queryset.filter(search_terms__term__in=terms).annotate(
+        matched=Count('search_terms__term', distinct=True),
+        rank=Sum(F('search_terms__frequency') * Case(
+            When(search_terms__field=ArticleSearchTerm.TITLE, then=Value(TITLE_WEIGHT)),
+            default=Value(1), output_field=IntegerField(),
+        )),
+    ).filter(matched=len(terms)).order_by('-rank', '-created', '-id')
+
+
+def highlight(text, query, excerpt=False):
+    """
+    Escapes text and wraps the words matching query in <b></b>. With excerpt, only EXCERPT_WORDS words around the
+    first match are kept, like ts_headline does.
+    """
+    terms = set(tokenize(query))
+    words = text.split()
+    if excerpt and len(words) > EXCERPT_WORDS:
+        first = next((i for i, word in enumerate(words) if terms.intersection(tokenize(word))), 0)
+        start = max(0, min(first - EXCERPT_WORDS // 3, len(words) - EXCERPT_WORDS))
+        text = ' '.join(words[start:start + EXCERPT_WORDS])
+
+    parts = []
+    last = 0
+    for match in WORD_RE.finditer(text):
+        word = escape(match.group(0))
+        parts.append(escape(text[last:match.start()]))
+        parts.append(f'<b>{word}</b>' if match.group(0).lower() in terms else word)
+        last = match.end()
+    parts.append(escape(text[last:]))
+    return ''.join(parts)
+
+
+def escape_headline(headline):
+    """
+    Escapes a ts_headline output of _search_postgres, whose matches are wrapped in HEADLINE_START and HEADLINE_STOP,
+    and wraps them in <b></b> like highlight() does.
+    """
+    return escape(headline).replace(HEADLINE_START, '<b>').replace(HEADLINE_STOP, '</b>')
@@ -1,12 +1,17 @@
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.relations import PrimaryKeyRelatedField
 
 from .exceptions import UserNotFound
+from .fieldsets import SparseFieldsetsSerializerMixin
 from .models import CustomUser, Article, UserManager, ArticleComment
+from .activity import rebuild_comment_counts
+from .search import escape_headline, highlight
+from .threads import MAX_DEPTH, fill_comment_paths
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     """
     FACT:
     Every not specified field in corresponding serializers, will not be taken into account, even if they are sent in the
@@ -41,11 +46,42 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
-class ArticleSerializer(serializers.ModelSerializer):
+class UserImportSerializer(UserSerializer):
+    """
+    Validates one row of a users import (app_articles.user_import.UserImporter). The unique validators of username
+    and email are left out: the importer checks them for a whole chunk of rows with one query.
+    """
+
+    class Meta(UserSerializer.Meta):
+        extra_kwargs = dict(UserSerializer.Meta.extra_kwargs, username={'validators': []}, email={'validators': []})
+
+
+class ReporterSerializer(serializers.ModelSerializer):
+    """
+    Slim representation of a user who reported an article. It only reads the columns loaded by
+    app_articles.reports.reporters_prefetch, so no extra query is done per user.
+    """
+
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'username', 'email']
+        read_only_fields = fields
+
+
+class ReportBatchSerializer(serializers.Serializer):
+    articles = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500)
+
+
+class ArticleSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Article
-        fields = ['id', 'title', 'text', 'created', 'updated', 'author', 'is_public']
-        read_only_fields = ['author']  # 'id', 'created' and 'updated', are already read_only.
+        fields = ['id', 'title', 'text', 'created', 'updated', 'author', 'is_public', 'comment_count', 'reply_count',
+                  'last_comment_at', 'summary']
+        # 'id', 'created' and 'updated', are already read_only.
+        read_only_fields = ['author', 'comment_count', 'reply_count', 'last_comment_at', 'summary']
+        # See SparseFieldsetsSerializerMixin.
+        optional_fields = ['summary']
+        summary_fields = {'text': 'summary'}
 
     """
     Representation:
@@ -65,8 +101,30 @@ class ArticleSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ArticleSearchSerializer(ArticleSerializer):
+    """
+    Search results: the article, its relevance and its title and text with the matching words in <b></b>.
+    """
+    rank = serializers.FloatField(read_only=True)
+    title_highlight = serializers.SerializerMethodField()
+    text_highlight = serializers.SerializerMethodField()
+
+    class Meta(ArticleSerializer.Meta):
+        fields = ArticleSerializer.Meta.fields + ['rank', 'title_highlight', 'text_highlight']
+
+    def get_title_highlight(self, obj):
+        if hasattr(obj, 'title_highlight'):  # PostgreSQL engine, computed by ts_headline.
+            return escape_headline(obj.title_highlight)
+        return highlight(obj.title, self.context['query'])
+
+    def get_text_highlight(self, obj):
+        if hasattr(obj, 'text_highlight'):
+            return escape_headline(obj.text_highlight)
+        return highlight(obj.text, self.context['query'], excerpt=True)
+
+
 # TODO TENGO QUE SEPARAR EN RESPONDER ARTICULOS Y RESPONDER COMENTARIOS
-class ArticleCommentSerializer(serializers.ModelSerializer):
+class ArticleCommentSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ArticleComment
         fields = ['id', 'message', 'created', 'updated', 'likes', 'dislikes',
@@ -103,11 +161,11 @@ class ArticleCommentSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         # Author_comment is a read_only field, here we set the author depending on the user who is making the request.
-        validated_data['author_comment'] = CustomUser.objects.get(username=self.context['request'].user.username)
+        validated_data['author_comment'] = self.context['request'].user
         return super().create(validated_data)
 
 
-class ReplyCommentSerializer(serializers.ModelSerializer):
+class ReplyCommentSerializer(SparseFieldsetsSerializerMixin, serializers.ModelSerializer):
 
     comment_reply = PrimaryKeyRelatedField(allow_null=False, queryset=ArticleComment.objects.all(), required=True)
 
@@ -123,6 +181,8 @@ class ReplyCommentSerializer(serializers.ModelSerializer):
         if self.instance and self.instance.comment_reply != value:
             raise ValidationError("You may not edit the article. Try to remove the comment and create a new one for "
                                   "the new Article.")
+        if self.instance is None and value.depth >= MAX_DEPTH:
+            raise ValidationError(f"Replies may not be nested more than {MAX_DEPTH} levels deep.")
         return value
     """
     # TODO: Porque pasa esto?
@@ -152,8 +212,80 @@ class ReplyCommentSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         # Author_comment is a read_only field, here we set the author depending on the user who is making the request.
-        validated_data['author_comment'] = CustomUser.objects.get(username=self.context['request'].user.username)
+        validated_data['author_comment'] = self.context['request'].user
         validated_data['is_reply'] = True
-        validated_data['article'] = validated_data['comment_reply'].article
+        validated_data['article_id'] = validated_data['comment_reply'].article_id
         return super().create(validated_data)
 
+
+class BulkCommentListSerializer(serializers.ListSerializer):
+    """
+    Validates and creates a whole batch of comments and replies with a fixed number of queries:
+    one to check the commented articles, one in_bulk to resolve the article of every replied comment, the
+    bulk_create INSERTs, the UPDATEs setting their thread paths and the one rebuilding the comment counts of their
+    articles, all of them in one transaction.
+    """
+    max_comments = 1000
+
+    def to_internal_value(self, data):
+        # Done here and not in validate(), which would turn the errors of each row into a single 'non_field_errors'.
+        if isinstance(data, list) and len(data) > self.max_comments:
+            raise ValidationError({'non_field_errors': [f"You may not import more than {self.max_comments} comments "
+                                                        f"at once."]})
+        attrs = super().to_internal_value(data)
+
+        article_ids = {row['article'] for row in attrs if 'article' in row}
+        reply_ids = {row['comment_reply'] for row in attrs if 'comment_reply' in row}
+        self.articles = set(Article.objects.filter(pk__in=article_ids).values_list('pk', flat=True))
+        self.replied_comments = ArticleComment.objects.only('id', 'article_id', 'depth').in_bulk(reply_ids)
+
+        errors = []
+        for row in attrs:
+            if 'article' in row and row['article'] not in self.articles:
+                errors.append({'article': [f"Invalid pk \"{row['article']}\" - object does not exist."]})
+            elif 'comment_reply' in row and row['comment_reply'] not in self.replied_comments:
+                errors.append({'comment_reply': [f"Invalid pk \"{row['comment_reply']}\" - object does not exist."]})
+            elif 'comment_reply' in row and self.replied_comments[row['comment_reply']].depth >= MAX_DEPTH:
+                errors.append({'comment_reply': [f"Replies may not be nested more than {MAX_DEPTH} levels deep."]})
+            else:
+                errors.append({})
+        if any(errors):
+            raise ValidationError(errors)
+        return attrs
+
+    def create(self, validated_data):
+        author = self.context['request'].user
+        comments = []
+        for row in validated_data:
+            if 'comment_reply' in row:
+                replied_comment = self.replied_comments[row['comment_reply']]
+                comments.append(ArticleComment(message=row['message'], author_comment=author, is_reply=True,
+                                               comment_reply=replied_comment, article_id=replied_comment.article_id))
+            else:
+                comments.append(ArticleComment(message=row['message'], author_comment=author,
+                                               article_id=row['article']))
+
+        with transaction.atomic():
+            comments = ArticleComment.objects.bulk_create(comments, batch_size=500)
+            article_ids = {comment.article_id for comment in comments}
+            fill_comment_paths(article_ids)
+            rebuild_comment_counts(article_ids)
+        return comments
+
+
+class BulkCommentSerializer(serializers.Serializer):
+    """
+    A row of the comments import: a comment of an article ({"message", "article"}) or a reply to a comment
+    ({"message", "comment_reply"}).
+    """
+    message = serializers.CharField()
+    article = serializers.IntegerField(min_value=1, required=False)
+    comment_reply = serializers.IntegerField(min_value=1, required=False)
+
+    class Meta:
+        list_serializer_class = BulkCommentListSerializer
+
+    def validate(self, attrs):
+        if ('article' in attrs) == ('comment_reply' in attrs):
+            raise ValidationError("Send either an article (comment) or a comment_reply (reply).")
+        return attrs
@@ -0,0 +1,76 @@
+"""
+Fixtures of the tests, created with one bulk_create per model instead of one save() (and its signals) per object.
+Use them from setUpTestData(), so that they are created once per TestCase class:
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('Admin', is_staff=True)
+        cls.users = create_users(['Pablo', 'Maria'])
+        cls.articles = create_articles(cls.admin, 3, is_public=True)
+"""
+
+from functools import lru_cache
+
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.db import connection
+from rest_framework.authtoken.models import Token
+
+from ..cache import invalidate_articles_list
+from ..models import Article, CustomUser, make_summary
+
+
+def hash_password(password):
+    # Users sharing a password share its hash, hashed once per test run and hasher (tests may override the hasher).
+    hasher = get_hasher()
+    return _hash_password(password, hasher.algorithm, getattr(hasher, 'iterations', None))
+
+
+@lru_cache(maxsize=None)
+def _hash_password(password, algorithm, iterations):
+    return make_password(password)
+
+
+def bulk_create(model, objs, unique_field):
+    """
+    Saves objs with bulk_create() and sets their pks: returned by the INSERT where the backend can (PostgreSQL), read
+    back by unique_field otherwise.
+    """
+    model.objects.bulk_create(objs, batch_size=500)
+    if not connection.features.can_return_rows_from_bulk_insert:
+        values = [getattr(obj, unique_field) for obj in objs]
+        pks = dict(model.objects.filter(**{f'{unique_field}__in': values}).values_list(unique_field, 'pk'))
+        for obj in objs:
+            obj.pk = pks[getattr(obj, unique_field)]
+    return objs
+
+
+def create_users(usernames, **fields):
+    """
+    Creates a user per username, with the defaults of the tests (email <username>@g.com, password <username>, male,
+    senior...) overridden by fields, and its token (as the post_save of CustomUser would). Returns them in order.
+    """
+    password = fields.pop('password', None)
+    defaults = {'gender': 'M', 'birth': '2000-12-12T06:55:00Z', 'level': 'SR'}
+    defaults.update(fields)
+    users = [CustomUser(username=username, email=f'{username}@g.com', password=hash_password(password or username),
+                        **defaults)
+             for username in usernames]
+    bulk_create(CustomUser, users, 'username')
+    Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in users])
+    return users
+
+
+def create_user(username, **fields):
+    return create_users([username], **fields)[0]
+
+
+def create_articles(author, count, title='Title example', text='Text example', **fields):
+    """
+    Creates count articles of author titled '<title> <n>', with their summary. bulk_create() sends no post_save, so
+    the search index is not built: the search tests create their articles with save().
+    """
+    articles = [Article(title=f'{title} {i}', text=text, summary=make_summary(text, 200), author=author, **fields)
+                for i in range(count)]
+    bulk_create(Article, articles, 'title')
+    invalidate_articles_list()
+    return articles
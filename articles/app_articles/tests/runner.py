@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the tests with MD5 as the preferred password hasher, thousands of times faster than the tuned hashers of
+    PASSWORD_HASHERS. It lives here, and not in the settings, so that no deployment can downgrade its passwords to MD5.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.fast_hasher = override_settings(
+            PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'] + settings.PASSWORD_HASHERS)
+        self.fast_hasher.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.fast_hasher.disable()
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,250 @@
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from .factories import create_articles, create_user
+
+
+# python manage.py test app_articles.tests.tests_articles.CreateArticleTestCase
+class CreateArticleTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = create_user('Pablo', is_staff=True)
+        cls.id_user = user.pk
+        cls.token = user.auth_token.key
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
+
+    def test_create_an_article(self):
+        article_json = {
+            'title': "Title example",
+            'text': 'Text example',
+            'is_public': True
+        }
+        response = self.client.post('/articles/', article_json, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['title'], article_json['title'])
+        self.assertEqual(response.json()['text'], article_json['text'])
+        self.assertEqual(response.json()['author'], self.id_user)
+
+    def test_try_create_article_missing_fields(self):
+        article_json = {}
+        response = self.client.post('/articles/', article_json, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'title': ['This field is required.'], 'text': ['This field is required.'],
+                                           'is_public': ['This field is required.']})
+
+    def test_try_create_an_article_twice(self):
+        article_json = {
+            'title': "Title example",
+            'text': 'Text example',
+            'is_public': True
+        }
+        response_1 = self.client.post('/articles/', article_json, format='json')
+        response_2 = self.client.post('/articles/', article_json, format='json')
+        self.assertEqual(response_1.status_code, 201)
+        self.assertEqual(response_2.status_code, 400)
+
+    def test_try_create_an_article_not_staff(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + create_user('Maria').auth_token.key)
+        article_json = {
+            'title': "Title example",
+            'text': 'Text example',
+            'is_public': True
+        }
+        response = self.client.post('/articles/', article_json, format='json')
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ArticlesTestCase(APITestCase):
+    """
+    Three public articles ('Title example <n>') and two private ones ('Private title <n>') of a staff user.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        user = create_user('Pablo', is_staff=True)
+        cls.id_user = user.pk
+        cls.token = user.auth_token.key
+        cls.public_articles = create_articles(user, 3, is_public=True)
+        cls.private_articles = create_articles(user, 2, title='Private title', is_public=False)
+        cls.all_articles = cls.public_articles + cls.private_articles
+
+    def setUp(self):
+        get_cache().clear()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
+
+
+# python manage.py test app_articles.tests.tests_articles.GetAllArticlesTestCase
+class GetAllArticlesTestCase(ArticlesTestCase):
+    def test_get_all_articles(self):
+        response = self.client.get('/articles/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(sorted(article.pk for article in self.all_articles),
+                         sorted(article['id'] for article in response.json()['results']))
+        self.assertEqual(len(self.all_articles), response.json()['count'])
+
+    def test_get_all_articles_no_credentials(self):
+        # Anonymous users only get the public articles.
+        self.client.credentials()
+        response = self.client.get('/articles/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(sorted(article.pk for article in self.public_articles),
+                         sorted(article['id'] for article in response.json()['results']))
+
+    def test_get_all_articles_asc_or_desc(self):
+        ids = sorted(article.pk for article in self.all_articles)
+
+        response_asc = self.client.get('/articles/', HTTP_SORT='ASC')
+        response_desc = self.client.get('/articles/', HTTP_SORT='DESC')
+
+        self.assertEqual(ids, [article['id'] for article in response_asc.json()['results']])
+        self.assertEqual(ids[::-1], [article['id'] for article in response_desc.json()['results']])
+
+
+# python manage.py test app_articles.tests.tests_articles.GetOneArticleTestCase
+class GetOneArticleTestCase(ArticlesTestCase):
+    def test_get_one_article(self):
+        article = self.private_articles[0]
+        response = self.client.get(f'/articles/{article.pk}/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((article.pk, article.title, article.text, self.id_user, False),
+                         tuple(response.json()[field] for field in ('id', 'title', 'text', 'author', 'is_public')))
+
+    def test_get_one_public_article_no_credentials(self):
+        self.client.credentials()
+        response = self.client.get(f'/articles/{self.public_articles[0].pk}/')
+
+        self.assertEqual(200, response.status_code)
+
+    def test_try_get_one_private_article_no_credentials(self):
+        self.client.credentials(HTTP_AUTHORIZATION='BAD TOKEN')
+        response = self.client.get(f'/articles/{self.private_articles[0].pk}/')
+
+        self.assertEqual('Authentication credentials were not provided.', response.json()['detail'])
+        self.assertEqual(401, response.status_code)
+
+    def test_try_get_one_article_bad_id(self):
+        response = self.client.get('/articles/non_existent_article/')
+
+        self.assertEqual(404, response.status_code)
+
+
+# python manage.py test app_articles.tests.tests_articles.EditOneArticleTestCase
+class EditOneArticleTestCase(ArticlesTestCase):
+    def test_edit_one_article(self):
+        article = self.all_articles[0]
+        new_article_json = {
+            'title': "New title example",
+            'text': 'New text example',
+            'is_public': False
+        }
+        response = self.client.put(f'/articles/{article.pk}/', new_article_json)
+
+        self.assertEqual(response.status_code, 200)
+        for field in new_article_json:
+            self.assertEqual(response.json()[field], new_article_json[field])
+
+    def test_try_edit_one_article_no_body(self):
+        article = self.all_articles[0]
+        new_article_json = {}
+        response = self.client.put(f'/articles/{article.pk}/', new_article_json, format='json')
+
+        self.assertEqual(response.json(), {'title': ['This field is required.'], 'text': ['This field is required.'],
+                                           'is_public': ['This field is required.']})
+        self.assertEqual(response.status_code, 400)
+
+    def test_try_edit_one_article_repeated_title(self):
+        article_1 = self.all_articles[0]
+        article_2 = self.all_articles[1]
+        new_article_json = {
+            'title': article_2.title,
+            'text': 'New text example',
+            'is_public': True
+        }
+        response = self.client.put(f'/articles/{article_1.pk}/', new_article_json)
+
+        self.assertEqual(response.json(), {'title': ['article with this title already exists.']})
+        self.assertEqual(response.status_code, 400)
+
+    def test_try_edit_one_article_bad_id(self):
+        new_article_json = {
+            'title': 'New title example',
+            'text': 'New text example',
+            'is_public': True
+        }
+        response = self.client.put('/articles/bad_id/', new_article_json)
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'detail': 'Not found.'})
+
+    def test_try_edit_one_article_no_credentials(self):
+        self.client.credentials(HTTP_AUTHORIZATION='BAD TOKEN')
+
+        article = self.all_articles[0]
+        new_article_json = {
+            'title': "New title example",
+            'text': 'New text example',
+            'is_public': True
+        }
+        response = self.client.put(f'/articles/{article.pk}/', new_article_json)
+
+        self.assertEqual('Authentication credentials were not provided.', response.json()['detail'])
+        self.assertEqual(401, response.status_code)
+
+
+# python manage.py test app_articles.tests.tests_articles.DeleteOneArticleTestCase
+class DeleteOneArticleTestCase(ArticlesTestCase):
+    def test_delete_one_article(self):
+        response = self.client.delete(f'/articles/{self.all_articles[0].pk}/')
+        self.assertEqual(204, response.status_code)
+
+    def test_try_delete_one_article_twice(self):
+        response_1 = self.client.delete(f'/articles/{self.all_articles[0].pk}/')
+        response_2 = self.client.delete(f'/articles/{self.all_articles[0].pk}/')
+        self.assertEqual(204, response_1.status_code)
+        self.assertEqual(404, response_2.status_code)
+
+    def test_try_delete_non_existent_article(self):
+        response = self.client.delete('/articles/NON-EXISTENT-ID/')
+        self.assertEqual(404, response.status_code)
+
+    def test_try_delete_an_article_no_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION='BAD TOKEN')
+
+        response = self.client.delete(f'/articles/{self.all_articles[0].pk}/')
+        self.assertEqual(401, response.status_code)
+
+
+# python manage.py test app_articles.tests.tests_articles.PartialModifyOneArticleTestCase
+class PartialModifyOneArticleTestCase(ArticlesTestCase):
+    def test_partial_modify_one_article(self):
+        article = self.all_articles[0]
+        update_field = {
+            'text': 'New text patch'
+        }
+        response = self.client.patch(f'/articles/{article.pk}/', update_field, format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(update_field['text'], response.json()['text'])
+
+    def test_try_partial_modify_an_article_unique_field_already_used(self):
+        article_1 = self.all_articles[0]
+        article_2 = self.all_articles[1]
+        update_field = {
+            'title': article_2.title
+        }
+        response = self.client.patch(f'/articles/{article_1.pk}/', update_field, format='json')
+
+        self.assertEqual(400, response.status_code)
+        self.assertEqual(response.json(), {'title': ['article with this title already exists.']})
+
+    def test_try_partial_modify_non_existent_article(self):
+        response = self.client.patch('/articles/NON-EXISTENT-ID/', {})
+        self.assertEqual(404, response.status_code)
@@ -0,0 +1,97 @@
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..authentication import (CachedTokenAuthentication, LocalTokenCache, get_token_cache, local_token_cache,
+                              token_cache_key)
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_authentication.CachedTokenAuthenticationTestCase
+class CachedTokenAuthenticationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+
+    def setUp(self):
+        local_token_cache.clear()
+        get_token_cache().clear()
+        self.token = Token.objects.get(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+
+    def test_token_is_looked_up_once(self):
+        # Token lookup and user retrieve.
+        with self.assertNumQueries(2):
+            self.client.get(f'/users/{self.user.username}/')
+        # Only the user retrieve, the token comes from the cache.
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/users/{self.user.username}/')
+        self.assertEqual(200, response.status_code)
+
+    def test_token_from_shared_cache(self):
+        self.client.get(f'/users/{self.user.username}/')
+        local_token_cache.clear()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/users/{self.user.username}/')
+        self.assertEqual(200, response.status_code)
+
+    def test_try_use_deleted_token(self):
+        self.client.get(f'/users/{self.user.username}/')
+        self.token.delete()
+
+        response = self.client.get(f'/users/{self.user.username}/')
+        self.assertEqual(401, response.status_code)
+
+    def test_try_use_token_of_deactivated_user(self):
+        self.client.get(f'/users/{self.user.username}/')
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(f'/users/{self.user.username}/')
+        self.assertEqual(401, response.status_code)
+
+    def test_password_is_not_cached(self):
+        self.client.get(f'/users/{self.user.username}/')
+
+        user_values, created = get_token_cache().get(token_cache_key(self.token.key))
+        self.assertEqual(CachedTokenAuthentication.CACHED_USER_FIELDS, list(user_values))
+        self.assertEqual(self.token.created, created)
+
+    def test_each_request_gets_its_own_instances(self):
+        authentication = CachedTokenAuthentication()
+        user_1, token_1 = authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user_2, token_2 = authentication.authenticate_credentials(self.token.key)
+
+        self.assertEqual((self.user.pk, self.user.username, False), (user_2.pk, str(user_2), user_2.is_staff))
+        self.assertIs(user_2, token_2.user)
+        self.assertIsNot(user_1, user_2)
+        self.assertIsNot(user_1._state.fields_cache, user_2._state.fields_cache)
+        # The rest of the fields are loaded on demand.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.user.email, user_2.email)
+
+    def test_try_use_bad_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token BAD')
+        response = self.client.get(f'/users/{self.user.username}/')
+        self.assertEqual(401, response.status_code)
+
+
+# python manage.py test app_articles.tests.tests_authentication.LocalTokenCacheTestCase
+class LocalTokenCacheTestCase(APITestCase):
+    @override_settings(AUTH_TOKEN_LOCAL_CACHE_SIZE=2)
+    def test_least_recently_used_entry_is_dropped(self):
+        cache = LocalTokenCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual([1, None, 3], [cache.get('a'), cache.get('b'), cache.get('c')])
+
+    @override_settings(AUTH_TOKEN_LOCAL_CACHE_TIMEOUT=-1)
+    def test_disabled_local_cache(self):
+        cache = LocalTokenCache()
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
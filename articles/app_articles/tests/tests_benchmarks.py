@@ -0,0 +1,100 @@
+import io
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from ..benchmarks import BENCHMARK_PASSWORD, BenchmarkData, compare_baselines, seed_dataset, summarize
+from ..models import Article, ArticleComment, CustomUser, make_summary
+from .factories import create_articles, create_user
+
+
+# python manage.py test app_articles.tests.tests_benchmarks.SeedDatasetTestCase
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class SeedDatasetTestCase(APITestCase):
+    def test_seed_dataset(self):
+        created = seed_dataset(users=3, articles_per_user=2, comments_per_article=2, reply_depth=2,
+                               reports_per_article=2)
+
+        self.assertEqual({'users': 3, 'articles': 6, 'comments': 36, 'reports': 12}, created)
+        article = Article.objects.order_by('pk').first()
+        self.assertEqual((6, 4, 2), (article.comment_count, article.reply_count, article.report_count))
+        self.assertEqual(make_summary(article.text, 200), article.summary)
+        self.assertEqual(2, ArticleComment.objects.filter(article=article, comment_reply=None).count())
+        self.assertEqual(2, ArticleComment.objects.filter(article=article, path__regex=r'^\d{30}$').count())
+        self.assertTrue(CustomUser.objects.get(username='bench_user_0').is_staff)
+
+        response = self.client.post('/api/login/', {'username': 'bench_user_1', 'password': BENCHMARK_PASSWORD})
+        self.assertEqual(200, response.status_code)
+        data = BenchmarkData()
+        self.assertEqual(response.data['token'], data.user(1)[2])
+        self.assertTrue(data.article_ids)
+
+    def test_seed_again_replaces_dataset(self):
+        seed_dataset(users=2, articles_per_user=1, comments_per_article=1, reply_depth=0, reports_per_article=0)
+        seed_dataset(users=2, articles_per_user=1, comments_per_article=1, reply_depth=0, reports_per_article=0)
+
+        self.assertEqual(2, CustomUser.objects.count())
+        self.assertEqual(2, Article.objects.count())
+
+
+def figures(**values):
+    result = {'requests': 100, 'errors': 0, 'throughput': 100.0, 'mean_ms': 10.0, 'p50_ms': 10.0, 'p95_ms': 20.0,
+              'p99_ms': 30.0, 'queries_mean': 2.0, 'queries_max': 2}
+    result.update(values)
+    return {'scenarios': {'articles.list': result}}
+
+
+# python manage.py test app_articles.tests.tests_benchmarks.CompareBaselinesTestCase
+class CompareBaselinesTestCase(APITestCase):
+    def test_summarize(self):
+        samples = [(i / 1000, 200 if i <= 98 else 500, 2) for i in range(1, 101)]
+
+        result = summarize(samples, elapsed=2.0)
+
+        self.assertEqual((100, 2, 50.0), (result['requests'], result['errors'], result['throughput']))
+        self.assertEqual((51.0, 96.0, 100.0), (result['p50_ms'], result['p95_ms'], result['p99_ms']))
+        self.assertEqual((2, 2), (result['queries_mean'], result['queries_max']))
+
+    def test_no_regressions_within_threshold(self):
+        self.assertEqual([], compare_baselines(figures(), figures(throughput=95.0, p95_ms=21.0), threshold=10))
+
+    def test_regressions(self):
+        regressions = compare_baselines(figures(), figures(throughput=80.0, p99_ms=40.0, queries_max=3, errors=1),
+                                        threshold=10)
+
+        self.assertEqual([
+            'articles.list: throughput 100.0 -> 80.0 requests/s',
+            'articles.list: p99_ms 30.0 -> 40.0',
+            'articles.list: queries per request 2 -> 3',
+            'articles.list: errors 0 -> 1',
+        ], regressions)
+
+    def test_new_scenarios_are_not_compared(self):
+        current = figures(throughput=1.0)
+        current['scenarios']['login'] = current['scenarios'].pop('articles.list')
+
+        self.assertEqual([], compare_baselines(figures(), current, threshold=10))
+
+
+# python manage.py test app_articles.tests.tests_benchmarks.BenchmarkAsgiTestCase
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class BenchmarkAsgiTestCase(APITransactionTestCase):
+    """
+    The handlers of the command serve the requests from threads of their own, which only see committed data.
+    """
+
+    def test_benchmark_asgi(self):
+        user = create_user('Pablo')
+        article = create_articles(user, 3, is_public=True)[0]
+        paths = ['/articles/', f'/articles/{article.pk}/']
+        stdout = io.StringIO()
+
+        call_command('benchmark_asgi', '--path', paths[0], '--path', paths[1], '--requests', '4', '--concurrency', '2',
+                     '--token', user.auth_token.key, stdout=stdout)
+
+        lines = stdout.getvalue().splitlines()
+        self.assertEqual([f'{handler} {path}' for path in paths for handler in ('WSGI', 'ASGI')],
+                         [line.split(':')[0] for line in lines])
+        for line in lines:
+            self.assertRegex(line, r': \d+ requests/s, p50 \d+\.\d ms, p99 \d+\.\d ms, statuses \[200\]$')
@@ -0,0 +1,70 @@
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from ..models import Article
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_cache.ArticlesListCacheTestCase
+class ArticlesListCacheTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.public_article = Article.objects.create(title='Public title', text='Text example', is_public=True,
+                                                    author=cls.user)
+        cls.private_article = Article.objects.create(title='Private title', text='Text example', is_public=False,
+                                                     author=cls.user)
+
+    def setUp(self):
+        get_cache().clear()
+
+    def test_get_articles_from_cache(self):
+        response_1 = self.client.get('/articles/')
+        with self.assertNumQueries(0):
+            response_2 = self.client.get('/articles/')
+
+        self.assertEqual('MISS', response_1['X-Cache'])
+        self.assertEqual('HIT', response_2['X-Cache'])
+        self.assertEqual(response_1.json(), response_2.json())
+
+    def test_cache_depends_on_auth_state_sort_and_pagination(self):
+        anonymous = self.client.get('/articles/')
+        self.client.force_authenticate(self.user)
+        logged = self.client.get('/articles/')
+        logged_asc = self.client.get('/articles/', HTTP_SORT='ASC')
+        logged_limit = self.client.get('/articles/', {'limit': 1})
+
+        self.assertEqual(['MISS'] * 4, [response['X-Cache'] for response in (anonymous, logged, logged_asc,
+                                                                             logged_limit)])
+        self.assertEqual(1, anonymous.json()['count'])
+        self.assertEqual(2, logged.json()['count'])
+        self.assertEqual([self.public_article.pk, self.private_article.pk],
+                         [article['id'] for article in logged_asc.json()['results']])
+        self.assertEqual(1, len(logged_limit.json()['results']))
+
+    def test_cache_is_invalidated_on_save(self):
+        self.client.get('/articles/')
+        self.private_article.is_public = True
+        self.private_article.save()
+
+        response = self.client.get('/articles/')
+
+        self.assertEqual('MISS', response['X-Cache'])
+        self.assertEqual(2, response.json()['count'])
+
+    def test_cache_is_invalidated_on_delete(self):
+        self.client.get('/articles/')
+        self.public_article.delete()
+
+        response = self.client.get('/articles/')
+
+        self.assertEqual('MISS', response['X-Cache'])
+        self.assertEqual(0, response.json()['count'])
+
+    def test_try_get_cached_articles_bad_token(self):
+        self.client.get('/articles/')
+        self.client.credentials(HTTP_AUTHORIZATION='Token BAD')
+
+        response = self.client.get('/articles/')
+
+        self.assertEqual(401, response.status_code)
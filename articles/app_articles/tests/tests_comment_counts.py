@@ -0,0 +1,183 @@
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models.signals import pre_delete
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from ..cache import get_cache
+from ..models import Article, ArticleComment
+from .factories import create_articles, create_user
+
+
+# python manage.py test app_articles.tests.tests_comment_counts.CommentCountsTestCase
+class CommentCountsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.articles = create_articles(cls.user, 3, is_public=True)
+
+    def setUp(self):
+        get_cache().clear()
+        self.client.force_authenticate(self.user)
+
+    def comment(self, article, comment_reply=None):
+        return ArticleComment.objects.create(message='Message', article=article, author_comment=self.user,
+                                             comment_reply=comment_reply, is_reply=comment_reply is not None)
+
+    def counts(self, article):
+        return Article.objects.values_list('comment_count', 'reply_count', 'last_comment_at').get(pk=article.pk)
+
+    def test_counts_follow_creates(self):
+        article = self.articles[0]
+        comment = self.comment(article)
+        reply = self.comment(article, comment)
+        self.comment(article, reply)
+
+        self.assertEqual((3, 2, ArticleComment.objects.latest('created').created), self.counts(article))
+
+    def test_save_does_not_overwrite_counts(self):
+        article = Article.objects.get(pk=self.articles[0].pk)
+        self.comment(article)
+
+        article.text = 'New text'
+        article.save()
+
+        self.assertEqual(1, self.counts(article)[0])
+
+    def test_list_sorted_by_comments(self):
+        self.comment(self.articles[1])
+        self.comment(self.articles[1])
+        self.comment(self.articles[2])
+
+        response = self.client.get('/articles/', {'sort': 'comments'})
+
+        self.assertEqual(200, response.status_code)
+        results = response.data['results']
+        self.assertEqual([self.articles[1].pk, self.articles[2].pk, self.articles[0].pk], [a['id'] for a in results])
+        self.assertEqual([2, 1, 0], [article['comment_count'] for article in results])
+
+    def test_list_sorted_by_activity(self):
+        self.comment(self.articles[2])
+        self.comment(self.articles[0])
+
+        response = self.client.get('/articles/', {'sort': 'activity'})
+
+        self.assertEqual([self.articles[0].pk, self.articles[2].pk], [a['id'] for a in response.data['results']])
+
+    def test_list_bad_sort(self):
+        response = self.client.get('/articles/', {'sort': 'title'})
+
+        self.assertEqual(400, response.status_code)
+
+    def test_list_is_not_stale_after_comment(self):
+        self.client.get('/articles/')
+
+        self.comment(self.articles[0])
+
+        response = self.client.get('/articles/')
+        self.assertEqual('MISS', response['X-Cache'])
+        counts = {article['id']: article['comment_count'] for article in response.data['results']}
+        self.assertEqual(1, counts[self.articles[0].pk])
+
+    def test_reconcile_comment_counts(self):
+        self.comment(self.articles[0])
+        Article.objects.update(comment_count=7, reply_count=7)
+
+        call_command('reconcile_comment_counts', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual((1, 0), self.counts(self.articles[0])[:2])
+        self.assertEqual((0, 0, None), self.counts(self.articles[1]))
+
+
+# python manage.py test app_articles.tests.tests_comment_counts.CommentDeleteCountsTestCase
+class CommentDeleteCountsTestCase(APITransactionTestCase):
+    """
+    The deletes of these tests are committed or rolled back for real, which never happens inside a TestCase.
+    """
+
+    def setUp(self):
+        self.user = create_user('Pablo')
+        self.articles = create_articles(self.user, 2, is_public=True)
+
+    def comment(self, article, comment_reply=None):
+        return ArticleComment.objects.create(message='Message', article=article, author_comment=self.user,
+                                             comment_reply=comment_reply, is_reply=comment_reply is not None)
+
+    def counts(self, article):
+        return Article.objects.values_list('comment_count', 'reply_count', 'last_comment_at').get(pk=article.pk)
+
+    def article_updates(self, queries):
+        return [query['sql'] for query in queries if query['sql'].startswith('UPDATE "app_articles_article"')]
+
+    def test_counts_follow_deletes(self):
+        article = self.articles[0]
+        comment = self.comment(article)
+        reply = self.comment(article, comment)
+        self.comment(article, reply)
+
+        # Deleting the comment deletes its replies by CASCADE, the article is rebuilt once.
+        with CaptureQueriesContext(connection) as queries:
+            ArticleComment.objects.get(pk=comment.pk).delete()
+
+        self.assertEqual(1, len(self.article_updates(queries)))
+        self.assertEqual((0, 0, None), self.counts(article))
+
+    def test_last_comment_at_after_deleting_the_latest(self):
+        article = self.articles[0]
+        first = self.comment(article)
+        latest = self.comment(article)
+
+        ArticleComment.objects.get(pk=latest.pk).delete()
+
+        self.assertEqual((1, 0, first.created), self.counts(article))
+
+    def test_deleting_an_article_does_not_rebuild_it(self):
+        comment = self.comment(self.articles[0])
+        for _ in range(5):
+            comment = self.comment(self.articles[0], comment)
+
+        with CaptureQueriesContext(connection) as queries:
+            Article.objects.get(pk=self.articles[0].pk).delete()
+
+        self.assertEqual([], self.article_updates(queries))
+
+    def test_counts_are_rebuilt_in_the_transaction_of_the_delete(self):
+        comment = self.comment(self.articles[0])
+
+        with transaction.atomic():
+            ArticleComment.objects.get(pk=comment.pk).delete()
+            self.assertEqual((0, 0, None), self.counts(self.articles[0]))
+
+        self.assertEqual((0, 0, None), self.counts(self.articles[0]))
+
+    def test_rolled_back_delete_keeps_the_counts(self):
+        comment = self.comment(self.articles[0], self.comment(self.articles[0]))
+        counts = self.counts(self.articles[0])
+        try:
+            with transaction.atomic():
+                ArticleComment.objects.get(pk=comment.comment_reply_id).delete()
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertEqual((2, 1), counts[:2])
+        self.assertEqual(counts, self.counts(self.articles[0]))
+
+    def test_delete_after_a_failed_delete(self):
+        comments = [self.comment(article) for article in self.articles]
+
+        # The delete fails after its rows were collected, and their post_delete is never sent.
+        def fail(**kwargs):
+            raise ValueError
+
+        pre_delete.connect(fail, sender=ArticleComment)
+        try:
+            with self.assertRaises(ValueError):
+                comments[0].delete()
+        finally:
+            pre_delete.disconnect(fail, sender=ArticleComment)
+
+        ArticleComment.objects.get(pk=comments[1].pk).delete()
+
+        self.assertEqual(1, self.counts(self.articles[0])[0])
+        self.assertEqual(0, self.counts(self.articles[1])[0])
@@ -0,0 +1,106 @@
+from rest_framework.test import APITestCase
+
+from ..models import Article, ArticleComment
+from ..threads import MAX_DEPTH
+from .factories import create_articles, create_user
+
+
+# python manage.py test app_articles.tests.tests_comments.CreateCommentTestCase
+class CreateCommentTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                             author=cls.user)
+        cls.comment = ArticleComment.objects.create(message='Message', article=cls.article, author_comment=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_create_a_comment(self):
+        # Article validation, INSERT, UPDATE of its thread path and UPDATE of the comment counts of the article, the
+        # author is the authenticated user.
+        with self.assertNumQueries(4):
+            response = self.client.post('/articles-comments/', {'message': 'New message', 'article': self.article.pk},
+                                        format='json')
+
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(self.user.pk, response.json()['author_comment'])
+
+    def test_create_a_reply(self):
+        # The replied comment is loaded by the validation, so its path is known by the UPDATE of the thread path.
+        with self.assertNumQueries(4):
+            response = self.client.post('/reply/articles-comments/', {'message': 'Reply',
+                                                                      'comment_reply': self.comment.pk}, format='json')
+
+        self.assertEqual(201, response.status_code)
+        self.assertEqual(self.article.pk, response.json()['article'])
+        self.assertTrue(response.json()['is_reply'])
+
+    def test_try_create_a_reply_too_deep(self):
+        ArticleComment.objects.filter(pk=self.comment.pk).update(depth=MAX_DEPTH)
+
+        response = self.client.post('/reply/articles-comments/', {'message': 'Reply', 'comment_reply': self.comment.pk},
+                                    format='json')
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn('comment_reply', response.json())
+
+
+# python manage.py test app_articles.tests.tests_comments.BulkCommentsTestCase
+class BulkCommentsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.articles = create_articles(cls.user, 2, is_public=True)
+        cls.comment = ArticleComment.objects.create(message='Message', article=cls.articles[1],
+                                                    author_comment=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_import_comments_and_replies(self):
+        rows = [{'message': f'Message {i}', 'article': self.articles[0].pk} for i in range(20)]
+        rows += [{'message': f'Reply {i}', 'comment_reply': self.comment.pk} for i in range(20)]
+
+        # Articles check, replied comments in_bulk, and inside the savepoint one INSERT, the thread paths (comments
+        # without path, paths of their replied comments and one UPDATE) and one UPDATE of the comment counts.
+        with self.assertNumQueries(9):
+            response = self.client.post('/articles-comments/bulk/', rows, format='json')
+
+        self.assertEqual(201, response.status_code)
+        self.assertEqual({'Created': 40}, response.json())
+        replies = ArticleComment.objects.filter(comment_reply=self.comment)
+        self.assertEqual(20, replies.count())
+        self.assertEqual({(self.articles[1].pk, True, self.user.pk)},
+                         set(replies.values_list('article', 'is_reply', 'author_comment')))
+
+    def test_try_import_comments_with_bad_rows(self):
+        rows = [
+            {'message': 'Message', 'article': self.articles[0].pk},
+            {'message': 'Message', 'article': 999999},
+            {'message': 'Reply', 'comment_reply': 999999},
+        ]
+        response = self.client.post('/articles-comments/bulk/', rows, format='json')
+
+        self.assertEqual(400, response.status_code)
+        errors = response.json()
+        self.assertEqual({}, errors[0])
+        self.assertIn('article', errors[1])
+        self.assertIn('comment_reply', errors[2])
+        self.assertEqual(1, ArticleComment.objects.count())
+
+    def test_try_import_a_reply_too_deep(self):
+        ArticleComment.objects.filter(pk=self.comment.pk).update(depth=MAX_DEPTH)
+        rows = [{'message': 'Reply', 'comment_reply': self.comment.pk}]
+        response = self.client.post('/articles-comments/bulk/', rows, format='json')
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn('comment_reply', response.json()[0])
+
+    def test_try_import_a_comment_and_reply_at_once(self):
+        rows = [{'message': 'Message', 'article': self.articles[0].pk, 'comment_reply': self.comment.pk}]
+        response = self.client.post('/articles-comments/bulk/', rows, format='json')
+
+        self.assertEqual(400, response.status_code)
+        self.assertIn('non_field_errors', response.json()[0])
@@ -0,0 +1,122 @@
+from unittest.mock import patch
+
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from ..models import Article, ArticleComment
+from ..serializers import ArticleSerializer, ArticleCommentSerializer
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_conditional.ConditionalRetrieveTestCase
+class ConditionalRetrieveTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                             author=cls.user)
+        cls.comment = ArticleComment.objects.create(message='Message', article=cls.article, author_comment=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_get_article_not_modified(self):
+        response = self.client.get(f'/articles/{self.article.pk}/')
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with patch.object(ArticleSerializer, 'to_representation') as to_representation:
+            not_modified = self.client.get(f'/articles/{self.article.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(304, not_modified.status_code)
+        self.assertEqual(response['ETag'], not_modified['ETag'])
+        to_representation.assert_not_called()
+
+    def test_get_article_if_modified_since(self):
+        response = self.client.get(f'/articles/{self.article.pk}/')
+        not_modified = self.client.get(f'/articles/{self.article.pk}/',
+                                       HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(304, not_modified.status_code)
+
+    def test_get_edited_article(self):
+        response = self.client.get(f'/articles/{self.article.pk}/')
+        self.article.text = 'New text example'
+        self.article.save()
+
+        modified = self.client.get(f'/articles/{self.article.pk}/', HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(200, modified.status_code)
+        self.assertNotEqual(response['ETag'], modified['ETag'])
+        self.assertEqual('New text example', modified.json()['text'])
+
+    def test_get_comment_not_modified(self):
+        response = self.client.get(f'/articles-comments/{self.comment.pk}/')
+
+        with patch.object(ArticleCommentSerializer, 'to_representation') as to_representation:
+            not_modified = self.client.get(f'/articles-comments/{self.comment.pk}/',
+                                           HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(304, not_modified.status_code)
+        to_representation.assert_not_called()
+
+
+# python manage.py test app_articles.tests.tests_conditional.ConditionalListTestCase
+class ConditionalListTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                             author=cls.user)
+        cls.comments = [ArticleComment.objects.create(message=f'Message {i}', article=cls.article,
+                                                      author_comment=cls.user) for i in range(3)]
+
+    def setUp(self):
+        get_cache().clear()
+        self.client.force_authenticate(self.user)
+
+    def test_get_articles_not_modified(self):
+        response = self.client.get('/articles/')
+        # Served from the cached page and its validators.
+        with self.assertNumQueries(0):
+            not_modified = self.client.get('/articles/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(304, not_modified.status_code)
+
+        get_cache().clear()
+        not_modified = self.client.get('/articles/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(304, not_modified.status_code)
+
+    def test_get_articles_validators_depend_on_page(self):
+        response_1 = self.client.get('/articles/')
+        response_2 = self.client.get('/articles/', HTTP_SORT='ASC')
+        self.assertNotEqual(response_1['ETag'], response_2['ETag'])
+
+    def test_get_comments_not_modified(self):
+        response = self.client.get('/articles-comments/')
+        # Just MAX(updated) and COUNT(*).
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/articles-comments/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(304, not_modified.status_code)
+
+    def test_get_comments_after_edit_and_delete(self):
+        response = self.client.get('/articles-comments/')
+
+        self.comments[0].message = 'New message'
+        self.comments[0].save()
+        edited = self.client.get('/articles-comments/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(200, edited.status_code)
+
+        self.comments[1].delete()
+        deleted = self.client.get('/articles-comments/', HTTP_IF_NONE_MATCH=edited['ETag'])
+        self.assertEqual(200, deleted.status_code)
+        self.assertEqual(2, deleted.json()['count'])
+
+    def test_list_ignores_if_modified_since(self):
+        # Deleting any comment but the latest keeps MAX(updated): the list has no Last-Modified to revalidate.
+        response = self.client.get('/articles-comments/')
+        self.assertNotIn('Last-Modified', response)
+
+        self.comments[0].delete()
+        response = self.client.get('/articles-comments/', HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(2, response.json()['count'])
@@ -0,0 +1,80 @@
+import sqlite3
+import threading
+
+from django.test import SimpleTestCase
+
+from ..connections import ConnectionPool
+from ..exceptions import DatabasePoolExhausted
+
+
+def connect():
+    return sqlite3.connect(':memory:', check_same_thread=False)
+
+
+# python manage.py test app_articles.tests.tests_connections.ConnectionPoolTestCase
+class ConnectionPoolTestCase(SimpleTestCase):
+    def test_reuse_released_connection(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        connection = pool.acquire(connect)
+        pool.release(connection)
+
+        self.assertIs(connection, pool.acquire(connect))
+        stats = pool.get_stats()
+        self.assertEqual((1, 1, 1, 0), (stats['created'], stats['reused'], stats['in_use'], stats['idle']))
+
+    def test_open_connections_up_to_max_size(self):
+        pool = ConnectionPool(max_size=2, timeout=1)
+        connections = [pool.acquire(connect), pool.acquire(connect)]
+
+        self.assertIsNot(connections[0], connections[1])
+        self.assertEqual(2, pool.get_stats()['peak'])
+
+    def test_try_acquire_from_exhausted_pool(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.acquire(connect)
+
+        with self.assertLogs('app_articles.connections', 'WARNING'):
+            with self.assertRaises(DatabasePoolExhausted):
+                pool.acquire(connect)
+        stats = pool.get_stats()
+        self.assertEqual((1, 1, 1), (stats['waits'], stats['exhausted'], stats['size']))
+
+    def test_wait_for_released_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=5)
+        connection = pool.acquire(connect)
+        threading.Timer(0.05, pool.release, [connection]).start()
+
+        self.assertIs(connection, pool.acquire(connect))
+        stats = pool.get_stats()
+        self.assertEqual((1, 0), (stats['waits'], stats['exhausted']))
+        self.assertGreater(stats['wait_seconds'], 0)
+
+    def test_release_rolls_back(self):
+        pool = ConnectionPool(max_size=1, timeout=1)
+        connection = pool.acquire(connect)
+        connection.execute('CREATE TABLE example (id INTEGER)')
+        connection.commit()
+        connection.execute('INSERT INTO example VALUES (1)')
+        pool.release(connection)
+
+        self.assertEqual([(0,)], pool.acquire(connect).execute('SELECT COUNT(*) FROM example').fetchall())
+
+    def test_discard_unusable_idle_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=1, check_interval=0)
+        connection = pool.acquire(connect)
+        pool.release(connection)
+        connection.close()
+
+        self.assertIsNot(connection, pool.acquire(connect))
+        stats = pool.get_stats()
+        self.assertEqual((2, 1, 1), (stats['created'], stats['discarded'], stats['size']))
+
+    def test_failed_connect_frees_its_room(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+
+        def failing_connect():
+            raise sqlite3.OperationalError('unable to open database file')
+
+        with self.assertRaises(sqlite3.OperationalError):
+            pool.acquire(failing_connect)
+        self.assertIsNotNone(pool.acquire(connect))
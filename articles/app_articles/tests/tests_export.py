@@ -0,0 +1,135 @@
+import gzip
+import json
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from ..models import Article, ArticleComment, DeletedRow
+from ..reports import report_articles
+from .factories import create_user
+
+
+def read_lines(content):
+    return [json.loads(line) for line in content.decode('utf-8').splitlines()]
+
+
+# python manage.py test app_articles.tests.tests_export.ExportTestCase
+class ExportTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo', is_staff=True)
+        cls.articles = [Article.objects.create(title=f'Title example {i}', text='Text example', is_public=i == 0,
+                                               author=cls.user) for i in range(3)]
+        cls.comment = ArticleComment.objects.create(message='Message', article=cls.articles[0],
+                                                    author_comment=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_export_all(self):
+        response = self.client.get('/export/')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual('application/x-ndjson', response['Content-Type'])
+        rows = read_lines(b''.join(response.streaming_content))
+        self.assertEqual(['article'] * 3 + ['comment'], [row['type'] for row in rows])
+        self.assertEqual(self.articles[1].title, rows[1]['title'])
+        self.assertEqual(self.articles[0].pk, rows[3]['article'])
+
+    def test_export_updated_after(self):
+        updated_after = timezone.now()
+        self.articles[2].text = 'New text example'
+        self.articles[2].save()
+
+        response = self.client.get('/export/', {'type': 'article', 'updated__gt': updated_after.isoformat()})
+
+        rows = read_lines(b''.join(response.streaming_content))
+        self.assertEqual([self.articles[2].pk], [row['id'] for row in rows])
+
+    def test_export_reported_after(self):
+        updated_after = timezone.now()
+        self.articles[1].users_reports.add(self.user)
+        report_articles(self.user, [self.articles[2].pk])
+
+        response = self.client.get('/export/', {'type': 'article', 'updated__gt': updated_after.isoformat()})
+
+        rows = read_lines(b''.join(response.streaming_content))
+        self.assertEqual([(self.articles[1].pk, 1), (self.articles[2].pk, 1)],
+                         [(row['id'], row['report_count']) for row in rows])
+        # Reports are not content edits, `updated` is left untouched.
+        self.assertEqual([self.articles[1].updated, self.articles[2].updated],
+                         list(Article.objects.filter(pk__in=[self.articles[1].pk, self.articles[2].pk])
+                              .order_by('pk').values_list('updated', flat=True)))
+
+    def test_export_gzip(self):
+        response = self.client.get('/export/', {'gzip': 'true'})
+
+        self.assertEqual('gzip', response['Content-Encoding'])
+        rows = read_lines(gzip.decompress(b''.join(response.streaming_content)))
+        self.assertEqual(4, len(rows))
+
+    def test_try_export_bad_parameters(self):
+        self.assertEqual(400, self.client.get('/export/', {'type': 'user'}).status_code)
+        self.assertEqual(400, self.client.get('/export/', {'updated__gt': 'yesterday'}).status_code)
+
+    def test_try_export_not_admin(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(401, self.client.get('/export/').status_code)
+
+    def test_export_command(self):
+        with tempfile.NamedTemporaryFile(suffix='.ndjson.gz') as file:
+            call_command('export_corpus', output=file.name, gzip=True, types=['comment'], chunk_size=1)
+            rows = read_lines(gzip.decompress(file.read()))
+
+        self.assertEqual([self.comment.pk], [row['id'] for row in rows])
+
+
+# python manage.py test app_articles.tests.tests_export.ExportDeletedRowsTestCase
+class ExportDeletedRowsTestCase(APITestCase):
+    def setUp(self):
+        self.user = create_user('Pablo', is_staff=True)
+        self.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                              author=self.user)
+        self.comments = [ArticleComment.objects.create(message=f'Message {i}', article=self.article,
+                                                       author_comment=self.user) for i in range(3)]
+        self.client.force_authenticate(self.user)
+
+    def test_export_deleted_after(self):
+        updated_after = timezone.now()
+        # The comments are deleted by CASCADE, their tombstones are written with one INSERT.
+        with CaptureQueriesContext(connection) as queries:
+            Article.objects.get(pk=self.article.pk).delete()
+
+        self.assertEqual(1, sum(query['sql'].startswith('INSERT INTO "app_articles_deletedrow"')
+                                for query in queries.captured_queries))
+        response = self.client.get('/export/', {'updated__gt': updated_after.isoformat()})
+
+        rows = read_lines(b''.join(response.streaming_content))
+        self.assertEqual([('article', self.article.pk)] + [('comment', comment.pk) for comment in self.comments],
+                         [(row['type'], row['id']) for row in rows])
+        self.assertTrue(all('deleted' in row for row in rows))
+
+    def test_full_export_has_no_tombstones(self):
+        self.comments[0].delete()
+
+        response = self.client.get('/export/', {'type': 'comment'})
+
+        rows = read_lines(b''.join(response.streaming_content))
+        self.assertEqual([comment.pk for comment in self.comments[1:]], [row['id'] for row in rows])
+        self.assertEqual(1, DeletedRow.objects.count())
+
+    def test_rolled_back_delete_has_no_tombstone(self):
+        try:
+            with transaction.atomic():
+                Article.objects.get(pk=self.article.pk).delete()
+                self.assertEqual(4, DeletedRow.objects.count())
+                raise ValueError
+        except ValueError:
+            pass
+
+        self.assertTrue(Article.objects.filter(pk=self.article.pk).exists())
+        self.assertEqual(0, DeletedRow.objects.count())
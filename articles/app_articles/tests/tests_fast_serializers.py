@@ -0,0 +1,62 @@
+import json
+from unittest import mock
+
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from ..fast_serializers import ValuesSerializer
+from ..models import Article, ArticleComment
+from ..serializers import ArticleSearchSerializer, ArticleSerializer
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_fast_serializers.FastReadTestCase
+class FastReadTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.articles = [Article.objects.create(title=f'Title example {i}', text='Text example', is_public=i % 2 == 0,
+                                               author=cls.user) for i in range(8)]
+        comment = ArticleComment.objects.create(message='Message', article=cls.articles[0], author_comment=cls.user)
+        ArticleComment.objects.create(message='Reply', article=cls.articles[0], author_comment=cls.user,
+                                      comment_reply=comment, is_reply=True)
+
+    def setUp(self):
+        get_cache().clear()
+        self.client.force_authenticate(self.user)
+
+    def assertSameAsStock(self, url, params=None):
+        fast = self.client.get(url, params)
+        stock = self.client.get(url, {**(params or {}), 'fast': 'false'})
+
+        self.assertEqual(200, fast.status_code)
+        self.assertEqual(json.loads(stock.content)['results'], json.loads(fast.content)['results'])
+        return json.loads(fast.content)
+
+    def test_articles(self):
+        data = self.assertSameAsStock('/articles/')
+
+        # The keyset pagination works on .values() rows too.
+        next_page = self.client.get(data['next'])
+        self.assertEqual(200, next_page.status_code)
+        self.assertEqual(3, len(next_page.data['results']))
+
+    def test_articles_skip_model_serializer(self):
+        with mock.patch.object(ArticleSerializer, 'to_representation', side_effect=AssertionError):
+            response = self.client.get('/articles/')
+
+        self.assertEqual(200, response.status_code)
+
+    def test_articles_sparse_fieldsets(self):
+        self.assertSameAsStock('/articles/', {'summary': 'true', 'exclude': 'author'})
+
+    def test_comments_and_replies(self):
+        self.assertSameAsStock('/articles-comments/', {'article': self.articles[0].pk})
+        self.assertSameAsStock('/reply/articles-comments/')
+
+    def test_users(self):
+        self.assertSameAsStock('/users/')
+
+    def test_serializers_with_method_fields_are_not_compiled(self):
+        self.assertIsNotNone(ValuesSerializer.compile(ArticleSerializer()))
+        self.assertIsNone(ValuesSerializer.compile(ArticleSearchSerializer()))
@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from ..models import Article, ArticleComment, make_summary
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_fieldsets.SparseFieldsetsTestCase
+class SparseFieldsetsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.article = Article.objects.create(title='Title example', text='Long text example ' * 50, is_public=True,
+                                             author=cls.user)
+        cls.comment = ArticleComment.objects.create(message='Message', article=cls.article, author_comment=cls.user)
+
+    def setUp(self):
+        get_cache().clear()
+        self.client.force_authenticate(self.user)
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/articles/', {'fields': 'id,title'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([{'id': self.article.pk, 'title': 'Title example'}], response.data['results'])
+        # The text is not even read.
+        self.assertFalse(any('"text"' in query['sql'] for query in queries.captured_queries))
+
+    def test_retrieve_fields_runs_one_query(self):
+        # is_public is read by the permission check, it must not be loaded by a second query.
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/articles/{self.article.pk}/', {'fields': 'title'})
+
+        self.assertEqual({'title': 'Title example'}, response.data)
+
+    def test_exclude(self):
+        response = self.client.get(f'/articles/{self.article.pk}/', {'exclude': 'text,author'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn('text', response.data)
+        self.assertNotIn('author', response.data)
+        self.assertEqual('Title example', response.data['title'])
+
+    def test_summary(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/articles/', {'summary': 'true'})
+
+        article = response.data['results'][0]
+        self.assertNotIn('text', article)
+        self.assertEqual(make_summary(self.article.text, Article.SUMMARY_LENGTH), article['summary'])
+        self.assertTrue(article['summary'].endswith('example…'))
+        self.assertFalse(any('"text"' in query['sql'] for query in queries.captured_queries))
+
+    def test_summary_is_optional(self):
+        response = self.client.get('/articles/')
+
+        self.assertNotIn('summary', response.data['results'][0])
+        self.assertIn('text', response.data['results'][0])
+
+    def test_unknown_field(self):
+        response = self.client.get('/articles/', {'fields': 'id,body'})
+
+        self.assertEqual(400, response.status_code)
+
+    def test_comments_and_users_fields(self):
+        response = self.client.get('/articles-comments/', {'fields': 'id,message'})
+        self.assertEqual([{'id': self.comment.pk, 'message': 'Message'}], response.data['results'])
+
+        response = self.client.get('/users/', {'fields': 'username'})
+        self.assertEqual([{'username': 'Pablo'}], response.data['results'])
+
+        response = self.client.get('/users/Pablo/', {'exclude': 'email'})
+        self.assertNotIn('email', response.data)
+
+    def test_writes_keep_every_field(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.post('/articles/?fields=id', {'title': 'New title', 'text': 'New text',
+                                                             'is_public': True}, format='json')
+
+        self.assertEqual(201, response.status_code)
+        self.assertEqual('New text', response.data['text'])
+        self.assertEqual('New text', Article.objects.get(pk=response.data['id']).summary)
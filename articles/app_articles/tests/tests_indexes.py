@@ -0,0 +1,99 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from ..models import Article, ArticleComment
+from .factories import create_user
+
+
+def explain(sql):
+    """
+    Returns the query plan of sql as a single string, for the database used by the tests.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # The seeded dataset is small, so the planner could rightly prefer a sequential scan.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql)
+        else:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+        return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+
+# python manage.py test app_articles.tests.tests_indexes.ListIndexesTestCase
+class ListIndexesTestCase(APITestCase):
+    """
+    Asserts that the list endpoints are served by the indexes declared in Article.Meta and ArticleComment.Meta.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        Article.objects.bulk_create([Article(title=f'Title example {i}', text='Text example', is_public=i % 2 == 0,
+                                             author=cls.user) for i in range(200)])
+        cls.article = Article.objects.first()
+        ArticleComment.objects.bulk_create([
+            ArticleComment(message=f'Message {i}', article_id=article_id, author_comment=cls.user)
+            for i, article_id in enumerate(Article.objects.values_list('pk', flat=True)[:50])
+        ])
+        cls.comment = ArticleComment.objects.first()
+        ArticleComment.objects.bulk_create([
+            ArticleComment(message=f'Reply {i}', article=cls.article, author_comment=cls.user, is_reply=True,
+                           comment_reply=cls.comment) for i in range(50)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def setUp(self):
+        # The articles list is cached, and these tests explain the queries it runs.
+        get_cache().clear()
+
+    def assertListUsesIndex(self, index, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(200, response.status_code)
+
+        plans = [explain(query['sql']) for query in queries.captured_queries
+                 if query['sql'].startswith('SELECT') and 'COUNT(*)' not in query['sql']]
+        self.assertTrue(any(index in plan for plan in plans), plans)
+
+    def test_public_articles_list_uses_index(self):
+        self.assertListUsesIndex('article_public_created_idx', '/articles/', {'count': 'false'})
+
+    def test_public_articles_next_page_uses_index(self):
+        next_page = self.client.get('/articles/', {'count': 'false'}).json()['next']
+        self.assertListUsesIndex('article_public_created_idx', next_page)
+
+    def test_articles_list_uses_index(self):
+        self.client.force_authenticate(self.user)
+        self.assertListUsesIndex('article_created_idx', '/articles/', {'count': 'false'})
+
+    def test_comments_of_an_article_list_uses_index(self):
+        self.client.force_authenticate(self.user)
+        self.assertListUsesIndex('comment_article_created_idx', '/articles-comments/',
+                                 {'count': 'false', 'article': self.article.pk})
+
+    def test_replies_list_uses_partial_index(self):
+        self.client.force_authenticate(self.user)
+        self.assertListUsesIndex('comment_is_reply_created_idx', '/reply/articles-comments/', {'count': 'false'})
+
+    def test_replies_of_a_comment_list_uses_index(self):
+        self.client.force_authenticate(self.user)
+        self.assertListUsesIndex('comment_reply_created_idx', '/reply/articles-comments/',
+                                 {'count': 'false', 'comment_reply': self.comment.pk})
+
+    def test_most_discussed_articles_list_uses_index(self):
+        self.client.force_authenticate(self.user)
+        self.assertListUsesIndex('article_comment_count_idx', '/articles/', {'sort': 'comments'})
+
+    def test_recently_discussed_articles_list_uses_partial_index(self):
+        self.client.force_authenticate(self.user)
+        self.assertListUsesIndex('article_last_comment_idx', '/articles/', {'sort': 'activity'})
+
+    def test_moderation_queue_uses_index(self):
+        self.assertListUsesIndex('article_report_count_idx', '/report/', {'sort': 'reports'})
+
+    def test_moderation_queue_next_page_uses_index(self):
+        next_page = self.client.get('/report/', {'sort': 'reports'}).json()['next']
+        self.assertListUsesIndex('article_report_count_idx', next_page)
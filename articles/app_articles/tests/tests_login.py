@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from ..backends import password_verifier
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_login.LoginTestCase
+# The tests hash with MD5 (app_articles.tests.runner), these ones check the policy of the PBKDF2 hasher.
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000, PASSWORD_HASHERS=['app_articles.hashers.TunedPBKDF2PasswordHasher'])
+class LoginTestCase(APITestCase):
+    def setUp(self):
+        self.user = create_user('Pablo')
+
+    def test_login_user(self):
+        response = self.client.post('/api/login/', {'username': 'Pablo', 'password': 'Pablo'}, format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.user.pk, response.json()['user_id'])
+
+    def test_try_login_user_bad_password(self):
+        response = self.client.post('/api/login/', {'username': 'Pablo', 'password': 'Bad'}, format='json')
+        self.assertEqual(400, response.status_code)
+
+    def test_try_login_non_existent_user(self):
+        response = self.client.post('/api/login/', {'username': 'Nobody', 'password': 'Pablo'}, format='json')
+        self.assertEqual(400, response.status_code)
+
+    def test_password_is_rehashed_on_login_when_policy_changes(self):
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.client.post('/api/login/', {'username': 'Pablo', 'password': 'Pablo'}, format='json')
+
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+        self.assertTrue(self.user.check_password('Pablo'))
+
+    def test_password_is_not_rehashed_with_bad_password(self):
+        password = self.user.password
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.client.post('/api/login/', {'username': 'Pablo', 'password': 'Bad'}, format='json')
+
+        self.user.refresh_from_db()
+        self.assertEqual(password, self.user.password)
+
+    def test_try_login_when_all_hashing_slots_are_busy(self):
+        password_verifier.start()
+        with patch.object(password_verifier.slots, 'acquire', return_value=False):
+            response = self.client.post('/api/login/', {'username': 'Pablo', 'password': 'Pablo'}, format='json')
+
+        self.assertEqual(503, response.status_code)
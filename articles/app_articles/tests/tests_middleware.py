@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from ..exceptions import QueryBudgetExceeded
+from ..middleware import QueryBudgetMiddleware
+from ..models import CustomUser, Article
+from ..views.article_comment_views import ArticleCommentViewSet
+from ..views.article_views import ArticleViewSet
+from .factories import create_articles, create_user
+
+
+# python manage.py test app_articles.tests.tests_middleware.QueryBudgetMiddlewareTestCase
+class QueryBudgetMiddlewareTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        create_articles(cls.user, 3, is_public=True)
+
+    def setUp(self):
+        # The articles list is cached, and these tests count the queries it runs.
+        get_cache().clear()
+
+    def test_query_headers(self):
+        response = self.client.get('/articles/')
+
+        # COUNT(*) and the page of articles.
+        self.assertEqual('2', response['X-DB-Queries'])
+        self.assertRegex(response['Server-Timing'], r'^db;dur=\d+\.\d\d;desc="2 queries"$')
+        self.assertEqual('default=2', response['X-DB-Queries-By-Alias'])
+        self.assertNotIn('X-DB-Duplicate-Queries', response)
+
+    def test_try_get_articles_over_query_budget(self):
+        with patch.object(ArticleViewSet, 'query_budget', {'list': 1}):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'ArticleViewSet.list ran 2 queries, its budget is 1.'):
+                self.client.get('/articles/')
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_get_articles_over_query_budget_without_raising(self):
+        with patch.object(ArticleViewSet, 'query_budget', {'list': 1}):
+            with self.assertLogs('app_articles.middleware', 'WARNING'):
+                response = self.client.get('/articles/')
+        self.assertEqual(200, response.status_code)
+
+    def test_streamed_queries_count_in_the_budget(self):
+        self.client.force_authenticate(self.user)
+        article = Article.objects.first()
+
+        with patch.object(ArticleCommentViewSet, 'query_budget', {'tree': 1}):
+            response = self.client.get('/articles-comments/tree/', {'article': article.pk})
+            # The view only checked the article, the tree is read while streaming.
+            self.assertEqual('1', response['X-DB-Queries'])
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'ArticleCommentViewSet.tree ran 2 queries'):
+                b''.join(response.streaming_content)
+
+    @override_settings(QUERY_N_PLUS_ONE_THRESHOLD=3)
+    def test_detect_repeated_queries(self):
+        def n_plus_one_view(request):
+            for article in Article.objects.all():
+                CustomUser.objects.get(pk=article.author_id)
+            return HttpResponse()
+
+        middleware = QueryBudgetMiddleware(n_plus_one_view)
+        with self.assertLogs('app_articles.middleware', 'WARNING') as logs:
+            response = middleware(RequestFactory().get('/'))
+
+        self.assertEqual('4', response['X-DB-Queries'])
+        self.assertEqual('3', response['X-DB-Duplicate-Queries'])
+        self.assertIn('Possible N+1 in GET /: query repeated 3 times', logs.output[0])
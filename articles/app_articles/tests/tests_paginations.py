@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from ..cache import get_cache
+from ..models import Article, ArticleComment
+from .factories import create_articles, create_user
+
+
+# python manage.py test app_articles.tests.tests_paginations.ArticlesKeysetPaginationTestCase
+class ArticlesKeysetPaginationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.articles = create_articles(cls.user, 5, is_public=True)
+
+    def setUp(self):
+        # The articles list is cached, and some of these tests count the queries it runs.
+        get_cache().clear()
+
+    def walk(self, url, params=None, **headers):
+        ids = []
+        response = self.client.get(url, params, **headers)
+        while True:
+            self.assertEqual(200, response.status_code)
+            ids += [article['id'] for article in response.json()['results']]
+            if response.json()['next'] is None:
+                return ids, response
+            response = self.client.get(response.json()['next'], **headers)
+
+    def test_get_all_articles_by_pages(self):
+        ids, _ = self.walk('/articles/', {'limit': 2})
+        self.assertEqual([article.pk for article in reversed(self.articles)], ids)
+
+    def test_get_all_articles_by_pages_asc(self):
+        ids, _ = self.walk('/articles/', {'limit': 2}, HTTP_SORT='ASC')
+        self.assertEqual([article.pk for article in self.articles], ids)
+
+    def test_get_previous_page(self):
+        first_page = self.client.get('/articles/', {'limit': 2}).json()
+        self.assertIsNone(first_page['previous'])
+
+        second_page = self.client.get(first_page['next']).json()
+        previous_page = self.client.get(second_page['previous']).json()
+
+        self.assertEqual(first_page['results'], previous_page['results'])
+
+    def test_get_articles_with_and_without_count(self):
+        response = self.client.get('/articles/', {'limit': 2})
+        self.assertEqual(5, response.json()['count'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/articles/', {'limit': 2, 'count': 'false'})
+        self.assertNotIn('count', response.json())
+        self.assertFalse(any('COUNT(*)' in query['sql'] for query in queries.captured_queries))
+
+    def test_get_articles_offset_pagination(self):
+        response = self.client.get('/articles/', {'limit': 2, 'offset': 2})
+
+        self.assertEqual(5, response.json()['count'])
+        self.assertEqual([self.articles[2].pk, self.articles[1].pk],
+                         [article['id'] for article in response.json()['results']])
+        self.assertIn('offset=4', response.json()['next'])
+
+    def test_try_get_articles_bad_cursor(self):
+        response = self.client.get('/articles/', {'cursor': 'bad cursor'})
+        self.assertEqual(404, response.status_code)
+
+
+# python manage.py test app_articles.tests.tests_paginations.ArticleCommentsKeysetPaginationTestCase
+class ArticleCommentsKeysetPaginationTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        article = Article.objects.create(title='Title example', text='Text example', is_public=True, author=cls.user)
+        cls.comments = [ArticleComment.objects.create(message=f'Message {i}', article=article,
+                                                      author_comment=cls.user) for i in range(5)]
+
+    def test_get_all_comments_by_pages(self):
+        self.client.force_authenticate(self.user)
+
+        ids = []
+        response = self.client.get('/articles-comments/', {'limit': 3, 'count': 'false'})
+        while response.json()['next'] is not None:
+            ids += [comment['id'] for comment in response.json()['results']]
+            response = self.client.get(response.json()['next'])
+        ids += [comment['id'] for comment in response.json()['results']]
+
+        self.assertEqual([comment.pk for comment in self.comments], ids)
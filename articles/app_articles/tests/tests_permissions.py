@@ -0,0 +1,33 @@
+from rest_framework.test import APITestCase
+
+from ..models import Article
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_permissions.PublicArticleOrLoggedUserTestCase
+class PublicArticleOrLoggedUserTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.public_article = Article.objects.create(title='Public title', text='Text example', is_public=True,
+                                                    author=cls.user)
+        cls.private_article = Article.objects.create(title='Private title', text='Text example', is_public=False,
+                                                     author=cls.user)
+
+    def test_get_public_article_no_credentials(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/articles/{self.public_article.pk}/')
+        self.assertEqual(200, response.status_code)
+
+    def test_try_get_private_article_no_credentials(self):
+        response = self.client.get(f'/articles/{self.private_article.pk}/')
+        self.assertEqual(401, response.status_code)
+
+    def test_get_private_article(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get(f'/articles/{self.private_article.pk}/')
+        self.assertEqual(200, response.status_code)
+
+    def test_try_get_non_existent_article(self):
+        response = self.client.get('/articles/999999/')
+        self.assertEqual(404, response.status_code)
@@ -0,0 +1,128 @@
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from ..counters import counter_buffer
+from ..models import Article, ArticleComment, CommentReaction
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_reactions.ReactionsTestCase
+class ReactionsTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                             author=cls.user)
+        cls.comment = ArticleComment.objects.create(message='Message', article=cls.article, author_comment=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.url = f'/articles-comments/{self.comment.pk}/'
+
+    def counters(self):
+        return ArticleComment.objects.values_list('likes', 'dislikes').get(pk=self.comment.pk)
+
+    def test_like_is_idempotent(self):
+        self.assertEqual(201, self.client.post(self.url + 'like/').status_code)
+        self.assertEqual(200, self.client.post(self.url + 'like/').status_code)
+
+        self.assertEqual((1, 0), self.counters())
+        self.assertEqual(1, CommentReaction.objects.filter(comment=self.comment, user=self.user).count())
+
+    def test_switch_and_undo(self):
+        self.client.post(self.url + 'like/')
+        self.assertEqual(201, self.client.post(self.url + 'dislike/').status_code)
+        self.assertEqual((0, 1), self.counters())
+
+        self.assertEqual(200, self.client.delete(self.url + 'like/').status_code)
+        self.assertEqual(204, self.client.delete(self.url + 'dislike/').status_code)
+        self.assertEqual((0, 0), self.counters())
+
+    def test_like_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        self.client.post(self.url + 'like/')
+
+        self.assertNotEqual(etag, self.client.get(self.url)['ETag'])
+
+    def test_like_unknown_comment(self):
+        response = self.client.post('/articles-comments/0/like/')
+
+        self.assertEqual(404, response.status_code)
+
+    def test_counters_above_small_integer_range(self):
+        ArticleComment.objects.filter(pk=self.comment.pk).update(likes=2 ** 40)
+
+        self.client.post(self.url + 'like/')
+
+        self.assertEqual((2 ** 40 + 1, 0), self.counters())
+
+    def test_editing_a_comment_keeps_its_counters(self):
+        self.client.post(self.url + 'like/')
+
+        response = self.client.patch(self.url, {'message': 'Edited message'}, format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual((1, 0), self.counters())
+
+    def test_saving_a_stale_comment_keeps_its_counters(self):
+        comment = ArticleComment.objects.get(pk=self.comment.pk)
+        self.client.post(self.url + 'like/')
+
+        comment.message = 'Edited message'
+        comment.save()
+
+        self.assertEqual((1, 0), self.counters())
+
+    def test_rebuild_comment_counters(self):
+        self.client.post(self.url + 'like/')
+        ArticleComment.objects.filter(pk=self.comment.pk).update(likes=10, dislikes=3)
+        other = ArticleComment.objects.create(message='Other message', article=self.article, author_comment=self.user)
+        updated = dict(ArticleComment.objects.values_list('pk', 'updated'))
+
+        call_command('rebuild_comment_counters', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual((1, 0), self.counters())
+        # Only the corrected comment is written, and its ETag changes.
+        self.assertGreater(ArticleComment.objects.get(pk=self.comment.pk).updated, updated[self.comment.pk])
+        self.assertEqual(updated[other.pk], ArticleComment.objects.get(pk=other.pk).updated)
+
+
+# python manage.py test app_articles.tests.tests_reactions.CounterBufferTestCase
+@override_settings(COMMENT_COUNTERS_FLUSH_INTERVAL=60)
+class CounterBufferTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                             author=cls.user)
+        cls.comments = [ArticleComment.objects.create(message=f'Message {i}', article=cls.article,
+                                                      author_comment=cls.user) for i in range(2)]
+
+    def tearDown(self):
+        counter_buffer.flush()
+
+    def test_flush_coalesces_deltas(self):
+        for _ in range(100):
+            counter_buffer.add(self.comments[0].pk, likes=1)
+        counter_buffer.add(self.comments[1].pk, dislikes=1)
+        counter_buffer.add(self.comments[1].pk, likes=1, dislikes=-1)
+
+        # One UPDATE for every buffered comment (in a savepoint, since the test runs in a transaction).
+        with self.assertNumQueries(3):
+            self.assertEqual(2, counter_buffer.flush())
+
+        counters = dict((pk, (likes, dislikes)) for pk, likes, dislikes in
+                        ArticleComment.objects.values_list('pk', 'likes', 'dislikes'))
+        self.assertEqual({self.comments[0].pk: (100, 0), self.comments[1].pk: (1, 0)}, counters)
+        self.assertIsNone(counter_buffer.timer)
+
+    @override_settings(COMMENT_COUNTERS_MAX_BUFFER=2)
+    def test_full_buffer_is_flushed(self):
+        counter_buffer.add(self.comments[0].pk, likes=1)
+        self.assertEqual(0, ArticleComment.objects.get(pk=self.comments[0].pk).likes)
+
+        counter_buffer.add(self.comments[1].pk, likes=1)
+
+        self.assertEqual([1, 1], list(ArticleComment.objects.order_by('pk').values_list('likes', flat=True)))
@@ -0,0 +1,96 @@
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from rest_framework.response import Response
+
+from ..middleware import ReplicaRoutingMiddleware
+from ..models import Article
+from ..routers import ReplicaRouter, use_replicas
+
+
+def read_alias_view(request):
+    response = HttpResponse()
+    response['X-Read-Alias'] = Article.objects.all().db
+    return response
+
+
+# python manage.py test app_articles.tests.tests_replicas.ReplicaRouterTestCase
+@override_settings(DATABASE_REPLICAS=['replica_1', 'replica_2'])
+class ReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_read_from_primary_outside_requests(self):
+        self.assertEqual('default', self.router.db_for_read(Article))
+
+    def test_read_from_replicas(self):
+        with use_replicas():
+            self.assertIn(self.router.db_for_read(Article), ['replica_1', 'replica_2'])
+
+    def test_read_from_primary_after_a_write(self):
+        with use_replicas() as state:
+            self.assertEqual('default', self.router.db_for_write(Article))
+            self.assertEqual('default', self.router.db_for_read(Article))
+        self.assertTrue(state.wrote)
+
+    def test_read_from_primary_when_disabled(self):
+        with use_replicas(False):
+            self.assertEqual('default', self.router.db_for_read(Article))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_read_from_primary_without_replicas(self):
+        with use_replicas():
+            self.assertEqual('default', self.router.db_for_read(Article))
+
+    def test_migrate_primary_only(self):
+        self.assertTrue(self.router.allow_migrate('default', 'app_articles'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'app_articles'))
+
+
+# python manage.py test app_articles.tests.tests_replicas.ReplicaRoutingMiddlewareTestCase
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class ReplicaRoutingMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.factory = RequestFactory()
+
+    def request(self, method, view=read_alias_view, **headers):
+        return ReplicaRoutingMiddleware(view)(self.factory.generic(method, '/', **headers))
+
+    def test_get_reads_from_replica(self):
+        self.assertEqual('replica_1', self.request('GET')['X-Read-Alias'])
+
+    def test_post_reads_from_primary(self):
+        self.assertEqual('default', self.request('POST')['X-Read-Alias'])
+
+    def test_read_your_writes(self):
+        self.request('POST', HTTP_AUTHORIZATION='Token a')
+
+        self.assertEqual('default', self.request('GET', HTTP_AUTHORIZATION='Token a')['X-Read-Alias'])
+        # Other clients keep reading from the replicas.
+        self.assertEqual('replica_1', self.request('GET', HTTP_AUTHORIZATION='Token b')['X-Read-Alias'])
+
+    def test_login_pins_issued_token(self):
+        self.request('POST', lambda request: Response({'token': 'a'}))
+
+        self.assertEqual('default', self.request('GET', HTTP_AUTHORIZATION='Token a')['X-Read-Alias'])
+
+    def test_get_that_writes_pins_to_primary(self):
+        def write_view(request):
+            ReplicaRouter().db_for_write(Article)
+            return HttpResponse()
+
+        self.request('GET', write_view, HTTP_AUTHORIZATION='Token a')
+
+        self.assertEqual('default', self.request('GET', HTTP_AUTHORIZATION='Token a')['X-Read-Alias'])
+
+    def test_failed_write_does_not_pin(self):
+        self.request('POST', lambda request: HttpResponse(status=400), HTTP_AUTHORIZATION='Token a')
+
+        self.assertEqual('replica_1', self.request('GET', HTTP_AUTHORIZATION='Token a')['X-Read-Alias'])
+
+    @override_settings(DATABASE_REPLICA_PIN_SECONDS=0)
+    def test_pin_expires(self):
+        self.request('POST', HTTP_AUTHORIZATION='Token a')
+
+        self.assertEqual('replica_1', self.request('GET', HTTP_AUTHORIZATION='Token a')['X-Read-Alias'])
@@ -0,0 +1,174 @@
+from io import StringIO
+
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from ..models import Article
+from .factories import create_articles, create_user, create_users
+
+
+# python manage.py test app_articles.tests.tests_reports.ReportAllArticlesTestCase
+class ReportAllArticlesTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_users([f'Reporter{i}' for i in range(3)])
+        cls.articles = create_articles(cls.users[0], 4, is_public=True)
+        # Article i is reported by the first i users.
+        for i, article in enumerate(cls.articles):
+            article.users_reports.add(*cls.users[:i])
+
+    def test_get_all_reports(self):
+        response = self.client.get('/report/')
+
+        self.assertEqual(200, response.status_code)
+        results = response.json()['results']
+        self.assertEqual([article.pk for article in reversed(self.articles)], [row['Article'] for row in results])
+        for row in results:
+            index = [article.pk for article in self.articles].index(row['Article'])
+            self.assertEqual(index, row[f'Reports for Article {row["Article"]}'])
+            self.assertEqual(sorted(user.username for user in self.users[:index]),
+                             sorted(user['username'] for user in row['Users']))
+
+    def test_get_all_reports_does_not_depend_on_number_of_articles(self):
+        # One query for the page of articles and one for all of their reporters.
+        with self.assertNumQueries(2):
+            self.client.get('/report/')
+
+    def test_get_only_reported_articles(self):
+        response = self.client.get('/report/', {'only_reported': 'true'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn(self.articles[0].pk, [row['Article'] for row in response.json()['results']])
+        self.assertEqual(3, len(response.json()['results']))
+
+    def test_get_all_reports_paginated(self):
+        response = self.client.get('/report/', {'size': 3})
+        self.assertEqual(3, len(response.json()['results']))
+
+        response = self.client.get(response.json()['next'])
+        self.assertEqual([self.articles[0].pk], [row['Article'] for row in response.json()['results']])
+
+    def test_get_moderation_queue_paginated(self):
+        # Most articles share report_count=0: the pages must neither repeat nor skip them.
+        articles = self.articles + create_articles(self.users[0], 5, title='Unreported', is_public=True)
+        expected = [article.pk for article in reversed(self.articles[1:])]
+        expected += sorted((article.pk for article in articles if article not in self.articles[1:]), reverse=True)
+
+        seen = []
+        response = self.client.get('/report/', {'sort': 'reports', 'size': 2})
+        while True:
+            seen += [row['Article'] for row in response.json()['results']]
+            if response.json()['next'] is None:
+                break
+            response = self.client.get(response.json()['next'])
+
+        self.assertEqual(expected, seen)
+
+
+# python manage.py test app_articles.tests.tests_reports.ReportCountTestCase
+class ReportCountTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = create_users([f'Reporter{i}' for i in range(3)])
+        cls.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                             author=cls.users[0])
+
+    def test_report_increments_report_count(self):
+        for user in self.users:
+            self.client.force_authenticate(user)
+            self.client.post(f'/report/{self.article.pk}')
+
+        self.article.refresh_from_db()
+        self.assertEqual(3, self.article.report_count)
+        response = self.client.get(f'/report/{self.article.pk}')
+        self.assertEqual(3, response.json()[f'Reports for Article {self.article.pk}'])
+
+    def test_remove_and_clear_reports_update_report_count(self):
+        self.article.users_reports.add(*self.users)
+        self.users[0].reports_users.remove(self.article)
+        self.article.refresh_from_db()
+        self.assertEqual(2, self.article.report_count)
+
+        self.article.users_reports.clear()
+        self.article.refresh_from_db()
+        self.assertEqual(0, self.article.report_count)
+
+    def test_saving_a_stale_article_keeps_report_count(self):
+        self.article.users_reports.add(self.users[0])
+        self.article.title = 'New title example'
+        self.article.save()
+
+        self.article.refresh_from_db()
+        self.assertEqual(1, self.article.report_count)
+
+    def test_rebuild_report_counts_command(self):
+        self.article.users_reports.add(*self.users)
+        Article.objects.update(report_count=0)
+
+        call_command('rebuild_report_counts', stdout=StringIO())
+
+        self.article.refresh_from_db()
+        self.assertEqual(3, self.article.report_count)
+
+    def test_get_moderation_queue(self):
+        other_article = Article.objects.create(title='Other title example', text='Text example', is_public=True,
+                                               author=self.users[0])
+        other_article.users_reports.add(*self.users)
+        self.article.users_reports.add(self.users[0])
+
+        response = self.client.get('/report/', {'sort': 'reports'})
+
+        self.assertEqual([other_article.pk, self.article.pk], [row['Article'] for row in response.json()['results']])
+
+
+# python manage.py test app_articles.tests.tests_reports.ReportArticleTestCase
+class ReportArticleTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Reporter')
+        cls.articles = create_articles(cls.user, 3, is_public=True)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_report_an_article_twice(self):
+        response_1 = self.client.post(f'/report/{self.articles[0].pk}')
+        response_2 = self.client.post(f'/report/{self.articles[0].pk}')
+
+        self.assertEqual(200, response_1.status_code)
+        self.assertEqual(400, response_2.status_code)
+        self.articles[0].refresh_from_db()
+        self.assertEqual(1, self.articles[0].report_count)
+
+    def test_try_report_non_existent_article(self):
+        response = self.client.post('/report/999999')
+        self.assertEqual(404, response.status_code)
+
+    def test_try_report_an_article_no_credentials(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(f'/report/{self.articles[0].pk}')
+        self.assertEqual(401, response.status_code)
+
+    def test_report_does_not_load_previous_reporters(self):
+        self.articles[0].users_reports.add(*create_users([f'Reporter{i}' for i in range(5)]))
+        # Lock, probe, insert and counter update, plus the savepoint of the transaction and its release.
+        with self.assertNumQueries(6):
+            self.client.post(f'/report/{self.articles[0].pk}')
+
+    def test_report_many_articles(self):
+        self.articles[0].users_reports.add(self.user)
+        ids = [article.pk for article in self.articles] + [999999]
+
+        response = self.client.post('/report/batch/', {'articles': ids}, format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({
+            'Reported': ids[1:3],
+            'Already reported': ids[:1],
+            'Not found': [999999]
+        }, response.json())
+        self.assertEqual([1, 1, 1], [article.report_count for article in Article.objects.order_by('pk')])
+
+    def test_try_report_many_articles_no_body(self):
+        response = self.client.post('/report/batch/', {}, format='json')
+        self.assertEqual(400, response.status_code)
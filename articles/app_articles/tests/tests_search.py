@@ -0,0 +1,94 @@
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from ..models import Article, ArticleSearchTerm
+from ..search import HEADLINE_START, HEADLINE_STOP, escape_headline, highlight, tokenize
+from .factories import create_user
+
+
+# python manage.py test app_articles.tests.tests_search.SearchTestCase
+class SearchTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.in_title = Article.objects.create(title='Django performance', text='Indexes and caches.', is_public=True,
+                                              author=cls.user)
+        cls.in_text = Article.objects.create(title='Databases', text='Tuning Django queries for performance.',
+                                             is_public=True, author=cls.user)
+        cls.private = Article.objects.create(title='Private performance notes', text='Django internals.',
+                                             is_public=False, author=cls.user)
+
+    def search(self, query, **params):
+        return self.client.get('/articles/search/', {'q': query, **params})
+
+    def test_search_ranks_title_matches_first(self):
+        self.client.force_authenticate(self.user)
+        response = self.search('django performance')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(3, response.data['count'])
+        ids = [article['id'] for article in response.data['results']]
+        self.assertEqual(self.in_text.pk, ids[-1])
+        self.assertEqual({self.in_title.pk, self.private.pk}, set(ids[:2]))
+
+    def test_search_requires_every_term(self):
+        self.client.force_authenticate(self.user)
+        response = self.search('django caches')
+
+        self.assertEqual([self.in_title.pk], [article['id'] for article in response.data['results']])
+
+    def test_anonymous_only_finds_public_articles(self):
+        response = self.search('performance')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({self.in_title.pk, self.in_text.pk}, {article['id'] for article in response.data['results']})
+
+    def test_search_highlights_matches(self):
+        response = self.search('queries')
+
+        result = response.data['results'][0]
+        self.assertEqual('Databases', result['title_highlight'])
+        self.assertEqual('Tuning Django <b>queries</b> for performance.', result['text_highlight'])
+
+    def test_search_without_query(self):
+        response = self.client.get('/articles/search/')
+
+        self.assertEqual(400, response.status_code)
+
+    def test_index_follows_updates_and_deletes(self):
+        article = Article.objects.get(pk=self.in_text.pk)
+        article.text = 'Nothing to see here.'
+        article.save()
+        self.assertEqual([], self.search('queries').data['results'])
+        self.assertEqual([article.pk], [result['id'] for result in self.search('nothing').data['results']])
+
+        Article.objects.filter(pk=article.pk).delete()
+        self.assertFalse(ArticleSearchTerm.objects.filter(article_id=article.pk).exists())
+
+    def test_rebuild_search_index(self):
+        ArticleSearchTerm.objects.all().delete()
+
+        call_command('rebuild_search_index', stdout=open('/dev/null', 'w'))
+
+        self.assertEqual(2, self.search('performance').data['count'])
+
+
+# python manage.py test app_articles.tests.tests_search.HighlightTestCase
+class HighlightTestCase(APITestCase):
+    def test_tokenize_drops_stopwords(self):
+        self.assertEqual(['django', 'rest', 'framework'], tokenize('Django and the REST framework'))
+
+    def test_highlight_escapes_text(self):
+        self.assertEqual('&lt;i&gt;<b>Django</b>&lt;/i&gt;', highlight('<i>Django</i>', 'django'))
+
+    def test_escape_headline(self):
+        headline = f'<i>{HEADLINE_START}Django{HEADLINE_STOP}</i>'
+        self.assertEqual('&lt;i&gt;<b>Django</b>&lt;/i&gt;', escape_headline(headline))
+
+    def test_highlight_excerpt(self):
+        text = ' '.join(['word'] * 50 + ['match'] + ['word'] * 50)
+
+        excerpt = highlight(text, 'match', excerpt=True)
+
+        self.assertEqual(30, len(excerpt.split()))
+        self.assertIn('<b>match</b>', excerpt)
@@ -0,0 +1,83 @@
+import json
+
+from rest_framework.test import APITestCase
+
+from ..models import Article, ArticleComment
+from ..threads import fill_comment_paths
+from .factories import create_user
+
+
+def read_tree(response):
+    return json.loads(b''.join(response.streaming_content))
+
+
+# python manage.py test app_articles.tests.tests_threads.CommentTreeTestCase
+class CommentTreeTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('Pablo')
+        cls.article = Article.objects.create(title='Title example', text='Text example', is_public=True,
+                                             author=cls.user)
+        cls.first = ArticleComment.objects.create(message='First', article=cls.article, author_comment=cls.user)
+        cls.second = ArticleComment.objects.create(message='Second', article=cls.article, author_comment=cls.user)
+        cls.reply = ArticleComment.objects.create(message='Reply', article=cls.article, author_comment=cls.user,
+                                                  comment_reply=cls.first, is_reply=True)
+        cls.nested = ArticleComment.objects.create(message='Nested', article=cls.article, author_comment=cls.user,
+                                                   comment_reply_id=cls.reply.pk, is_reply=True)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_paths(self):
+        nested = ArticleComment.objects.get(pk=self.nested.pk)
+
+        self.assertEqual(2, nested.depth)
+        self.assertEqual(f'{self.first.pk:010d}{self.reply.pk:010d}{self.nested.pk:010d}', nested.path)
+
+    def test_tree(self):
+        # Only the article check runs inside the view, the tree itself is read while streaming.
+        with self.assertNumQueries(2):
+            tree = read_tree(self.client.get('/articles-comments/tree/', {'article': self.article.pk}))
+
+        self.assertEqual(self.article.pk, tree['article'])
+        self.assertEqual(['First', 'Second'], [comment['message'] for comment in tree['replies']])
+        reply = tree['replies'][0]['replies'][0]
+        self.assertEqual('Reply', reply['message'])
+        self.assertEqual(['Nested'], [comment['message'] for comment in reply['replies']])
+        self.assertEqual(0, tree['more_replies'])
+
+    def test_tree_is_not_routed_under_replies(self):
+        response = self.client.get('/reply/articles-comments/tree/', {'article': self.article.pk})
+        self.assertEqual(404, response.status_code)
+
+        response = self.client.post(f'/reply/articles-comments/{self.reply.pk}/like/')
+        self.assertEqual(404, response.status_code)
+
+    def test_tree_limits(self):
+        tree = read_tree(self.client.get('/articles-comments/tree/', {'article': self.article.pk, 'depth': 2,
+                                                                      'breadth': 1}))
+
+        self.assertEqual(['First'], [comment['message'] for comment in tree['replies']])
+        self.assertEqual(1, tree['more_replies'])
+        self.assertEqual([], tree['replies'][0]['replies'][0]['replies'])
+
+    def test_subtree(self):
+        tree = read_tree(self.client.get('/articles-comments/tree/', {'comment': self.first.pk}))
+
+        self.assertEqual(self.first.pk, tree['comment'])
+        self.assertEqual(['Reply'], [comment['message'] for comment in tree['replies']])
+        self.assertEqual(['Nested'], [comment['message'] for comment in tree['replies'][0]['replies']])
+
+    def test_tree_of_unknown_article(self):
+        response = self.client.get('/articles-comments/tree/', {'article': 0})
+
+        self.assertEqual(404, response.status_code)
+
+    def test_fill_comment_paths(self):
+        ArticleComment.objects.update(path='', depth=0)
+
+        self.assertEqual(4, fill_comment_paths([self.article.pk]))
+
+        nested = ArticleComment.objects.get(pk=self.nested.pk)
+        self.assertEqual(2, nested.depth)
+        self.assertEqual(f'{self.first.pk:010d}{self.reply.pk:010d}{self.nested.pk:010d}', nested.path)
@@ -0,0 +1,101 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from ..models import CustomUser
+from .factories import create_user
+
+
+def user_row(username, **fields):
+    row = {
+        "username": username,
+        "email": f"{username}@g.com",
+        "gender": "M",
+        "birth": "2000-12-12T06:55:00Z",
+        "level": "SR",
+        "password": username
+    }
+    row.update(fields)
+    return row
+
+
+# python manage.py test app_articles.tests.tests_user_import.BulkUsersTestCase
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class BulkUsersTestCase(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('Admin', is_staff=True)
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def test_register_many_users(self):
+        rows = [user_row(f'User{i}') for i in range(5)]
+        response = self.client.post('/users/bulk/', rows, format='json')
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'Created': 5, 'Errors': []}, response.json())
+        self.assertEqual(5, Token.objects.filter(user__username__startswith='User').count())
+        login = self.client.post('/api/login/', {'username': 'User3', 'password': 'User3'}, format='json')
+        self.assertEqual(200, login.status_code)
+
+    def test_register_many_users_with_bad_rows(self):
+        rows = [
+            user_row('User0'),
+            user_row('Admin'),
+            user_row('User0', email='Other@g.com'),
+            {'username': 'User3'},
+            user_row('User4', level='BAD'),
+            user_row('User5'),
+        ]
+        response = self.client.post('/users/bulk/', rows, format='json')
+
+        self.assertEqual(2, response.json()['Created'])
+        self.assertEqual([1, 2, 3, 4], [error['row'] for error in response.json()['Errors']])
+        self.assertIn('username', response.json()['Errors'][0]['errors'])
+        self.assertIn('username', response.json()['Errors'][1]['errors'])
+        self.assertIn('password', response.json()['Errors'][2]['errors'])
+        self.assertIn('level', response.json()['Errors'][3]['errors'])
+        self.assertEqual({'User0', 'User5'}, set(CustomUser.objects.filter(username__startswith='User')
+                                                 .values_list('username', flat=True)))
+
+    def test_try_register_many_users_not_admin(self):
+        self.client.force_authenticate(None)
+        response = self.client.post('/users/bulk/', [user_row('User0')], format='json')
+        self.assertEqual(401, response.status_code)
+
+
+# python manage.py test app_articles.tests.tests_user_import.ImportUsersCommandTestCase
+@override_settings(PASSWORD_PBKDF2_ITERATIONS=1000)
+class ImportUsersCommandTestCase(APITestCase):
+    def test_import_users_from_ndjson_in_chunks(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson') as file:
+            for i in range(7):
+                file.write(json.dumps(user_row(f'User{i}')) + '\n')
+            file.write('not json\n')
+            file.flush()
+
+            stdout, stderr = StringIO(), StringIO()
+            call_command('import_users', file.name, chunk_size=3, processes=2, stdout=stdout, stderr=stderr)
+
+        self.assertIn('Created 7 users, 1 rows with errors.', stdout.getvalue())
+        self.assertIn('Row 7:', stderr.getvalue())
+        self.assertEqual(7, Token.objects.count())
+        self.assertTrue(CustomUser.objects.get(username='User6').check_password('User6'))
+
+    def test_import_users_from_csv(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv') as file:
+            file.write('username,email,gender,birth,level,password,first_name\n')
+            file.write('User0,User0@g.com,M,2000-12-12T06:55:00Z,SR,User0,\n')
+            file.write('User1,User1@g.com,F,2000-12-12T06:55:00Z,JR,User1,Maria\n')
+            file.flush()
+
+            call_command('import_users', file.name, processes=0, stdout=StringIO(), stderr=StringIO())
+
+        self.assertEqual('Maria', CustomUser.objects.get(username='User1').first_name)
+        self.assertEqual(2, CustomUser.objects.count())
@@ -1,9 +1,9 @@
 import io
 
-from rest_framework.test import APIClient, APITestCase
+from rest_framework.test import APITestCase
 from rest_framework.parsers import JSONParser
 
-from ..models import CustomUser, Article
+from .factories import create_user
 
 """
 TO add any type of header, we have to add them in the request method as a key word argument.
@@ -34,12 +34,6 @@ class UserRegistrationTestCase(APITestCase):
         pass
     """
 
-    @classmethod
-    def tearDownClass(cls):
-        CustomUser.objects.all().delete()
-        Article.objects.all().delete()
-        super().tearDownClass()
-
     def test_create_user(self):
         user_data = {
             "username": "Pablo",
@@ -84,23 +78,8 @@ class UserRegistrationTestCase(APITestCase):
 # python manage.py test app_articles.tests.tests_users.UserLoginTestCase
 class UserLoginTestCase(APITestCase):
     @classmethod
-    def setUpClass(cls):
-        client = APIClient()
-        user_data = {
-            "username": "Pablo",
-            "email": "Pablo@g.com",
-            "gender": "M",
-            "birth": "2000-12-12T06:55:00Z",
-            "level": "SR",
-            "password": "Pablo"
-        }
-        client.post('/users/', user_data, format='json')
-
-    @classmethod
-    def tearDownClass(cls):
-        CustomUser.objects.all().delete()
-        Article.objects.all().delete()
-        super().tearDownClass()
+    def setUpTestData(cls):
+        user = create_user('Pablo')
 
     def test_login_user(self):
         credentials = {
@@ -135,28 +114,9 @@ class UserLoginTestCase(APITestCase):
 class GetAllUsersTestCase(APITestCase):
 
     @classmethod
-    def setUpClass(cls):
-        client = APIClient()
-        user_data = {
-            "username": "Pablo",
-            "email": "Pablo@g.com",
-            "gender": "M",
-            "birth": "2000-12-12T06:55:00Z",
-            "level": "SR",
-            "password": "Pablo"
-        }
-        client.post('/users/', user_data, format='json')
-        credentials = {
-            "username": "Pablo",
-            "password": "Pablo"
-        }
-        response = client.post('/api/login/', credentials, format='json')
-        cls.token = response.json()['token']
-
-    @classmethod
-    def tearDownClass(cls):
-        CustomUser.objects.all().delete()
-        Article.objects.all().delete()
+    def setUpTestData(cls):
+        user = create_user('Pablo')
+        cls.token = user.auth_token.key
 
     def test_get_all_users(self):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
@@ -182,28 +142,9 @@ class GetAllUsersTestCase(APITestCase):
 class GetOneUserTestCase(APITestCase):
 
     @classmethod
-    def setUpClass(cls):
-        client = APIClient()
-        user_data = {
-            "username": "Pablo",
-            "email": "Pablo@g.com",
-            "gender": "M",
-            "birth": "2000-12-12T06:55:00Z",
-            "level": "SR",
-            "password": "Pablo"
-        }
-        client.post('/users/', user_data, format='json')
-        credentials = {
-            "username": "Pablo",
-            "password": "Pablo"
-        }
-        response = client.post('/api/login/', credentials, format='json')
-        cls.token = response.json()['token']
-
-    @classmethod
-    def tearDownClass(cls):
-        CustomUser.objects.all().delete()
-        Article.objects.all().delete()
+    def setUpTestData(cls):
+        user = create_user('Pablo')
+        cls.token = user.auth_token.key
 
     def test_get_one_user(self):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
@@ -229,34 +170,12 @@ class GetOneUserTestCase(APITestCase):
 
 # python manage.py test app_articles.tests.tests_users.EditOneUserTestCase
 class EditOneUserTestCase(APITestCase):
-    def setUp(self):
-        """
-        Code below does not go in a setUpClass because I will edit the user, so I want to create it again from
-        scratch for the next test.
-        """
-        user_data = {
-            "username": "Pablo",
-            "email": "Pablo@g.com",
-            "gender": "M",
-            "birth": "2000-12-12T06:55:00Z",
-            "level": "SR",
-            "password": "Pablo",
-            "is_staff": True
-        }
-        self.client.post('/users/', user_data, format='json')
-        credentials = {
-            "username": "Pablo",
-            "password": "Pablo"
-        }
-        response = self.client.post('/api/login/', credentials, format='json')
-        self.token = response.json()['token']
-
-    # TODO: Why don't I need a tearDown to delete the user?
-
     @classmethod
-    def tearDownClass(cls):
-        CustomUser.objects.all().delete()
-        Article.objects.all().delete()
+    def setUpTestData(cls):
+        # Every test runs in a transaction rolled back at its end, so a user edited or deleted by a test is
+        # back for the next one.
+        user = create_user('Pablo', is_staff=True)
+        cls.token = user.auth_token.key
 
     def test_edit_one_user(self):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
@@ -336,34 +255,13 @@ class EditOneUserTestCase(APITestCase):
 
 # python manage.py test app_articles.tests.tests_users.DeleteOneUserTestCase
 class DeleteOneUserTestCase(APITestCase):
-    def setUp(self):
-        """
-        Code below does not go in a setUpClass because I will delete the user, so I want to create it again from
-        scratch for the next test.
-        """
-        user_data = {
-            "username": "Pablo",
-            "email": "Pablo@g.com",
-            "gender": "M",
-            "birth": "2000-12-12T06:55:00Z",
-            "level": "SR",
-            "password": "Pablo",
-            "is_staff": True
-        }
-        user = self.client.post('/users/', user_data, format='json')
-        self.id_user = user.json()['id']
-
-        credentials = {
-            "username": "Pablo",
-            "password": "Pablo"
-        }
-        response = self.client.post('/api/login/', credentials, format='json')
-        self.token = response.json()['token']
-
     @classmethod
-    def tearDownClass(cls):
-        CustomUser.objects.all().delete()
-        Article.objects.all().delete()
+    def setUpTestData(cls):
+        # Every test runs in a transaction rolled back at its end, so a user edited or deleted by a test is
+        # back for the next one.
+        user = create_user('Pablo', is_staff=True)
+        cls.id_user = user.pk
+        cls.token = user.auth_token.key
 
     def test_delete_one_user(self):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
@@ -391,12 +289,11 @@ class DeleteOneUserTestCase(APITestCase):
 
 # python manage.py test app_articles.tests.tests_users.PartialModifyOneUserTestCase
 class PartialModifyOneUserTestCase(APITestCase):
-    def setUp(self):
-        """
-        Code below does not go in a setUpClass because I will edit the user, so I want to create it again from
-        scratch for the next test.
-        """
-        self.user_data = {
+    @classmethod
+    def setUpTestData(cls):
+        # Every test runs in a transaction rolled back at its end, so a user edited or deleted by a test is
+        # back for the next one.
+        cls.user_data = {
             "username": "Pablo",
             "email": "Pablo@g.com",
             "gender": "M",
@@ -405,18 +302,8 @@ class PartialModifyOneUserTestCase(APITestCase):
             "password": "Pablo",
             "is_staff": True
         }
-        self.client.post('/users/', self.user_data, format='json')
-        credentials = {
-            "username": "Pablo",
-            "password": "Pablo"
-        }
-        response = self.client.post('/api/login/', credentials, format='json')
-        self.token = response.json()['token']
-
-    @classmethod
-    def tearDownClass(cls):
-        CustomUser.objects.all().delete()
-        Article.objects.all().delete()
+        user = create_user('Pablo', is_staff=True)
+        cls.token = user.auth_token.key
 
     def test_partial_modify_one_user(self):
         self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token)
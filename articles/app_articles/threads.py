@@ -0,0 +1,135 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Subquery, Value
+from django.db.models.functions import Concat
+
+# Every comment has a materialized path: the path of its replied comment followed by its own zero padded id. Sorting
+# the comments of an article by path lists them depth first, each one right before its replies (oldest first).
+PATH_SEGMENT_WIDTH = 10
+# Deepest reply accepted (a comment has depth 0). It bounds the path to 1010 characters, well below the size of an
+# index row (about 2.7 kB in PostgreSQL): an INSERT whose path could not be indexed would fail.
+MAX_DEPTH = 100
+
+# Fields of every comment of the tree, its replies are nested in 'replies'.
+TREE_FIELDS = ['id', 'message', 'created', 'updated', 'likes', 'dislikes', 'author_comment']
+
+
+def path_segment(pk):
+    return f'{pk:0{PATH_SEGMENT_WIDTH}d}'
+
+
+def set_comment_path(comment):
+    """
+    Sets the path and depth of a just created comment (post_save of ArticleComment) with a single UPDATE. When the
+    replied comment is not loaded, its path and depth are read by subqueries of that UPDATE, and they are left
+    deferred on the instance.
+    """
+    from app_articles.models import ArticleComment
+
+    segment = path_segment(comment.pk)
+    comment_queryset = ArticleComment.objects.filter(pk=comment.pk)
+    if comment.comment_reply_id is None:
+        comment_queryset.update(path=segment, depth=0)
+        comment.path, comment.depth = segment, 0
+    elif ArticleComment.comment_reply.is_cached(comment):
+        comment.path = comment.comment_reply.path + segment
+        comment.depth = comment.comment_reply.depth + 1
+        comment_queryset.update(path=comment.path, depth=comment.depth)
+    else:
+        replied = ArticleComment.objects.filter(pk=comment.comment_reply_id)
+        comment_queryset.update(path=Concat(Subquery(replied.values('path')), Value(segment)),
+                                depth=Subquery(replied.values('depth')) + 1)
+        comment.__dict__.pop('path', None)
+        comment.__dict__.pop('depth', None)
+
+
+def fill_comment_paths(article_ids=None):
+    """
+    Sets the path and depth of the comments that have none (path ''), e.g. after a bulk_create, which does not send
+    post_save. Returns the number of comments updated.
+    A comment is always created after the comment it replies to, so walking them by id meets every replied comment
+    before its replies.
+    """
+    from app_articles.models import ArticleComment
+
+    queryset = ArticleComment.objects.all()
+    if article_ids is not None:
+        queryset = queryset.filter(article_id__in=article_ids)
+    missing = list(queryset.filter(path='').order_by('pk').values_list('pk', 'comment_reply_id'))
+
+    missing_ids = {pk for pk, _ in missing}
+    replied_ids = {replied_id for _, replied_id in missing if replied_id is not None} - missing_ids
+    paths = {pk: (path, depth) for pk, path, depth in
+             ArticleComment.objects.filter(pk__in=replied_ids).values_list('pk', 'path', 'depth')}
+
+    comments = []
+    for pk, replied_id in missing:
+        if replied_id is None:
+            path, depth = path_segment(pk), 0
+        else:
+            replied_path, replied_depth = paths[replied_id]
+            path, depth = replied_path + path_segment(pk), replied_depth + 1
+        paths[pk] = (path, depth)
+        comments.append(ArticleComment(pk=pk, path=path, depth=depth))
+
+    ArticleComment.objects.bulk_update(comments, ['path', 'depth'], batch_size=500)
+    return len(comments)
+
+
+def comment_tree_lines(queryset, root, max_depth, max_breadth, chunk_size=1000, batch_size=64 * 1024):
+    """
+    Yields the JSON of a comments tree, {<root>..., "replies": [{<comment>..., "replies": [...]}, ...]}, built
+    while reading queryset (the comments of the tree sorted by path) with a single query, so the memory used does not
+    grow with the size of the thread.
+
+    root: (dict of the keys of the root object, path of the root, depth of the root).
+    max_depth: levels of replies below the root. Deeper replies are filtered out by the query.
+    max_breadth: replies listed per comment. The rest of them (and their replies) are skipped, their number is sent
+        in "more_replies".
+    """
+    root_data, root_path, root_depth = root
+    queryset = queryset.filter(depth__lte=root_depth + max_depth).order_by('path')
+    rows = queryset.values('path', 'depth', *TREE_FIELDS).iterator(chunk_size=chunk_size)
+
+    # One [path, depth, listed replies, skipped replies] per comment being written, the root first.
+    stack = [[root_path, root_depth, 0, 0]]
+    skipped_path = None
+    batch = [json.dumps(root_data, cls=DjangoJSONEncoder)[:-1] + (', ' if root_data else '') + '"replies": [']
+    size = 0
+
+    for row in rows:
+        path = row.pop('path')
+        depth = row.pop('depth')
+        if skipped_path is not None and path.startswith(skipped_path):
+            continue
+        skipped_path = None
+
+        while stack[-1][1] >= depth:
+            batch.append(close_comment(stack.pop()))
+        parent = stack[-1]
+        if parent[2] >= max_breadth:
+            parent[3] += 1
+            skipped_path = path
+            continue
+
+        row['replies'] = []
+        data = json.dumps(row, cls=DjangoJSONEncoder)
+        batch.append((', ' if parent[2] else '') + data[:-2])
+        parent[2] += 1
+        stack.append([path, depth, 0, 0])
+
+        size += len(data)
+        if size >= batch_size:
+            yield ''.join(batch)
+            batch = []
+            size = 0
+
+    while stack:
+        batch.append(close_comment(stack.pop()))
+    yield ''.join(batch)
+
+
+def close_comment(frame):
+    _, _, _, skipped = frame
+    return f'], "more_replies": {skipped}}}'
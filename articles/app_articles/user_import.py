@@ -0,0 +1,124 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ValidationError
+
+from app_articles.hashers import hash_password_in_process
+from app_articles.models import CustomUser
+from app_articles.serializers import UserImportSerializer
+
+
+class UserImporter:
+    """
+    Imports users from an iterable of dicts (same fields as POST /users/), chunk by chunk, so the rows may be streamed
+    from a file or a request of any size:
+        - Every row is validated on its own with UserImportSerializer. Usernames and emails are checked against the
+          database with one query per chunk, and against the previous rows of the import.
+        - Passwords are hashed in a pool of `processes` processes (0 hashes in the current process, and so does a
+          daemonic process, which may not start children, e.g. a worker of manage.py test --parallel).
+        - Users, and their tokens, are created with one bulk_create per chunk. bulk_create does not send post_save, so
+          create_auth_token is not run and the tokens are created here.
+    A bad row never aborts the import, it is reported in `errors` as {'row': <index>, 'errors': {...}}.
+    """
+
+    def __init__(self, chunk_size=1000, processes=0):
+        self.chunk_size = chunk_size
+        self.processes = processes
+        self.validator = UserImportSerializer()
+        self.created = 0
+        self.errors = []
+        self.usernames = set()
+        self.emails = set()
+
+    def run(self, rows):
+        pool = None
+        if self.processes and not multiprocessing.current_process().daemon:
+            pool = ProcessPoolExecutor(max_workers=self.processes)
+        try:
+            rows = enumerate(rows)
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        # Rows of a chunk fail at different steps, errors are reported in the order of the rows.
+        self.errors.sort(key=lambda error: error['row'])
+        return {'created': self.created, 'errors': self.errors}
+
+    def add_error(self, index, errors):
+        self.errors.append({'row': index, 'errors': errors})
+
+    def validate_chunk(self, chunk):
+        valid = []
+        for index, row in chunk:
+            try:
+                data = self.validator.run_validation(row)
+            except ValidationError as error:
+                self.add_error(index, error.detail)
+                continue
+            data['username'] = CustomUser.normalize_username(data['username'])
+            data['email'] = CustomUser.objects.normalize_email(data['email'])
+            valid.append((index, data))
+
+        usernames = [data['username'] for _, data in valid]
+        emails = [data['email'] for _, data in valid]
+        taken_usernames = set(CustomUser.objects.filter(username__in=usernames).values_list('username', flat=True))
+        taken_emails = set(CustomUser.objects.filter(email__in=emails).values_list('email', flat=True))
+
+        unique = []
+        for index, data in valid:
+            errors = {}
+            if data['username'] in taken_usernames or data['username'] in self.usernames:
+                errors['username'] = ['custom user with this username already exists.']
+            if data['email'] in taken_emails or data['email'] in self.emails:
+                errors['email'] = ['custom user with this email address already exists.']
+            if errors:
+                self.add_error(index, errors)
+                continue
+            self.usernames.add(data['username'])
+            self.emails.add(data['email'])
+            unique.append((index, data))
+        return unique
+
+    def import_chunk(self, chunk, pool):
+        valid = self.validate_chunk(chunk)
+        passwords = [data.pop('password') for _, data in valid]
+        if pool is not None:
+            hashed = pool.map(hash_password_in_process, passwords, chunksize=64)
+        else:
+            hashed = map(make_password, passwords)
+        users = [(index, CustomUser(password=password, **data)) for (index, data), password in zip(valid, hashed)]
+
+        try:
+            with transaction.atomic():
+                self.create_users([user for _, user in users])
+        except IntegrityError:
+            # Some username or email was taken by a concurrent write after validate_chunk: one by one then, so that
+            # only the conflicting rows fail.
+            for index, user in users:
+                try:
+                    with transaction.atomic():
+                        self.create_users([user])
+                except IntegrityError as error:
+                    self.add_error(index, {'non_field_errors': [str(error)]})
+
+    def create_users(self, users):
+        # A failed chunk may have left the ids of its rolled back INSERT in the instances.
+        for user in users:
+            user.pk = None
+        CustomUser.objects.bulk_create(users)
+        if any(user.pk is None for user in users):
+            # Backends that can not return the ids of a bulk insert (e.g. SQLite).
+            ids = dict(CustomUser.objects.filter(username__in=[user.username for user in users])
+                       .values_list('username', 'pk'))
+            for user in users:
+                user.pk = ids[user.username]
+        Token.objects.bulk_create([Token(key=Token.generate_key(), user=user) for user in users])
+        self.created += len(users)
@@ -1,26 +1,153 @@
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT
 
+from app_articles.conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from app_articles.counters import remove_reaction, set_reaction
+from app_articles.fast_serializers import FastReadMixin
+from app_articles.fieldsets import SparseFieldsetsMixin
 from app_articles.paginations import ArticleCommentsPagination
-from app_articles.serializers import ArticleCommentSerializer, ReplyCommentSerializer
-from app_articles.models import ArticleComment
+from app_articles.serializers import ArticleCommentSerializer, ReplyCommentSerializer, BulkCommentSerializer
+from app_articles.threads import comment_tree_lines
+from app_articles.models import Article, ArticleComment, CommentReaction
 
 
-class ArticleCommentViewSet(viewsets.ModelViewSet):
+def positive_int_param(request, name, default, cutoff):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or int(value) == 0:
+        raise ValidationError({name: ['A valid positive integer is required.']})
+    return min(int(value), cutoff)
+
+
+class ArticleCommentViewSet(FastReadMixin, SparseFieldsetsMixin, ConditionalRetrieveMixin, ConditionalListMixin,
+                            viewsets.ModelViewSet):
     """
     A simple ViewSet for viewing and editing Article Comments.
+    The list may be narrowed to the comments of one article with ?article=<id>.
+    list and retrieve accept sparse fieldsets: ?fields= and ?exclude= (see app_articles.fieldsets).
+    list (If-None-Match) and retrieve (If-None-Match, If-Modified-Since) answer conditional GETs with 304 Not
+    Modified.
     """
     queryset = ArticleComment.objects.all()
     serializer_class = ArticleCommentSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = ArticleCommentsPagination
+    # Max SQL queries per action, checked by app_articles.middleware.QueryBudgetMiddleware.
+    # The budget of tree covers the queries run while its response is streamed.
+    query_budget = {'list': 3, 'retrieve': 2, 'tree': 2, 'like': 6, 'dislike': 6}
+    # Query parameters accepted by the list, each one is backed by an (<field>, created, id) index.
+    filter_query_params = ['article']
+    # Default and max levels of replies, and replies per comment, of the comments tree.
+    tree_depth = 10
+    tree_max_depth = 100
+    tree_breadth = 50
+    tree_max_breadth = 500
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+
+        for field in self.filter_query_params:
+            value = self.request.query_params.get(field)
+            if value is not None:
+                if not value.isdigit():
+                    raise ValidationError({field: ['A valid integer is required.']})
+                queryset = queryset.filter(**{field: value})
+        return queryset
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Imports many comments and replies in one request, all or none of them.
+        Body: [{"message": ..., "article": <id>} or {"message": ..., "comment_reply": <id>}, ...]
+        """
+        serializer = BulkCommentSerializer(data=request.data, many=True, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        comments = serializer.save()
+        return Response({"Created": len(comments)}, status=HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post', 'delete'])
+    def like(self, request, pk=None):
+        """
+        POST likes the comment, DELETE undoes the like. Each user likes or dislikes a comment once at most, so
+        repeating a request changes nothing (200 instead of 201/204).
+        """
+        return self.react(request, pk, CommentReaction.LIKE)
+
+    @action(detail=True, methods=['post', 'delete'])
+    def dislike(self, request, pk=None):
+        """
+        POST dislikes the comment, DELETE undoes the dislike. See like().
+        """
+        return self.react(request, pk, CommentReaction.DISLIKE)
+
+    def react(self, request, pk, value):
+        # Only the existence of the comment is checked, its row is neither loaded nor locked here.
+        if not pk.isdigit() or not self.get_queryset().filter(pk=pk).exists():
+            raise NotFound(f"Comment with ID: {pk} does not exist.")
+        pk = int(pk)
+
+        reaction = dict(CommentReaction.VALUES)[value].lower()
+        if request.method == 'DELETE':
+            if remove_reaction(request.user, pk, value):
+                return Response(status=HTTP_204_NO_CONTENT)
+            return Response({"Success": f"Comment with ID: {pk} was not {reaction}d."}, status=HTTP_200_OK)
+        if set_reaction(request.user, pk, value):
+            return Response({"Success": f"Comment with ID: {pk} {reaction}d."}, status=HTTP_201_CREATED)
+        return Response({"Success": f"Comment with ID: {pk} was already {reaction}d."}, status=HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def tree(self, request):
+        """
+        Streams the nested comments of ?article=<id>, or the replies below ?comment=<id>, read with a single query on
+        the materialized paths of the comments (see app_articles.threads).
+        ?depth=<n>: levels of replies. ?breadth=<n>: replies listed per comment, the number of the rest of them is
+        in "more_replies" and they can be fetched with ?comment=<id of their replied comment>.
+        """
+        depth = positive_int_param(request, 'depth', self.tree_depth, self.tree_max_depth)
+        breadth = positive_int_param(request, 'breadth', self.tree_breadth, self.tree_max_breadth)
+
+        comment_id = request.query_params.get('comment')
+        article_id = request.query_params.get('article')
+        if comment_id is not None:
+            if not comment_id.isdigit():
+                raise ValidationError({'comment': ['A valid integer is required.']})
+            comment = ArticleComment.objects.filter(pk=comment_id).values('article_id', 'path', 'depth').first()
+            if comment is None:
+                raise NotFound(f"Comment with ID: {comment_id} does not exist.")
+            queryset = ArticleComment.objects.filter(article_id=comment['article_id'], path__startswith=comment['path'],
+                                                     depth__gt=comment['depth'])
+            root = ({'comment': int(comment_id)}, comment['path'], comment['depth'])
+        elif article_id is not None:
+            if not article_id.isdigit():
+                raise ValidationError({'article': ['A valid integer is required.']})
+            if not Article.objects.filter(pk=article_id).exists():
+                raise NotFound(f"Article with ID: {article_id} does not exist.")
+            queryset = ArticleComment.objects.filter(article_id=article_id)
+            root = ({'article': int(article_id)}, '', -1)
+        else:
+            raise ValidationError({'article': ['Either article or comment is required.']})
+
+        return StreamingHttpResponse(comment_tree_lines(queryset, root, depth, breadth),
+                                     content_type='application/json')
 
 
-class ReplyCommentViewSet(viewsets.ModelViewSet):
+class ReplyCommentViewSet(ArticleCommentViewSet):
     """
     A simple ViewSet for viewing and editing Article reply comments.
+    The list may be narrowed with ?article=<id> and ?comment_reply=<id>.
     """
     queryset = ArticleComment.objects.filter(is_reply=True)
     serializer_class = ReplyCommentSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = ArticleCommentsPagination
+    filter_query_params = ['article', 'comment_reply']
+    # The actions on the whole comments table are only routed under /articles-comments/.
+    bulk = like = dislike = tree = None
@@ -1,12 +1,21 @@
+from django.conf import settings
 from django.db.models.query import QuerySet
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 
+from app_articles.cache import get_cache, articles_list_version, articles_list_cache_key
+from app_articles.conditional import (ConditionalRetrieveMixin, not_modified_response, queryset_validators,
+                                      set_validators)
 from app_articles.exceptions import NullRequest
-from app_articles.paginations import ArticlesPagination
+from app_articles.fast_serializers import FastReadMixin
+from app_articles.fieldsets import SparseFieldsetsMixin
+from app_articles.paginations import ArticlesOffsetPagination, ArticlesPagination
 from app_articles.permissions import PublicArticleOrLoggedUser
-from app_articles.serializers import ArticleSerializer
+from app_articles.search import search_articles
+from app_articles.serializers import ArticleSearchSerializer, ArticleSerializer
 from app_articles.models import Article
 
 
@@ -14,13 +23,27 @@ def is_logged(request):
     return bool(request.user and request.user.is_authenticated)
 
 
-class ArticleViewSet(viewsets.ModelViewSet):
+class ArticleViewSet(FastReadMixin, SparseFieldsetsMixin, ConditionalRetrieveMixin, viewsets.ModelViewSet):
     """
     A simple ViewSet for viewing and editing Articles.
+    The list is sorted by creation (Sort: ASC|DESC header), or with ?sort=comments (most discussed first) or
+    ?sort=activity (most recently commented first).
+    list and retrieve accept sparse fieldsets: ?fields=, ?exclude= and ?summary=true (see app_articles.fieldsets).
+    list (If-None-Match) and retrieve (If-None-Match, If-Modified-Since) answer conditional GETs with 304 Not
+    Modified.
     """
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
     pagination_class = ArticlesPagination
+    # Max SQL queries per action, checked by app_articles.middleware.QueryBudgetMiddleware.
+    query_budget = {'list': 3, 'retrieve': 2, 'search': 2}
+    # Columns read outside the serializer (see SparseFieldsetsMixin): is_public by PublicArticleOrLoggedUser.
+    sparse_fetch_fields = ['updated', 'is_public']
+    # ?sort=<name> of the list, each one backed by an index of Article. 'activity' only lists commented articles.
+    list_sorts = {
+        'comments': ('-comment_count', '-id'),
+        'activity': ('-last_comment_at', '-id'),
+    }
 
     def get_asc_or_desc(self, request, queryset):
         if request is None:
@@ -37,6 +60,18 @@ class ArticleViewSet(viewsets.ModelViewSet):
             queryset = queryset.order_by('-created')
         return queryset
 
+    def get_sorted(self, request, queryset):
+        sort = request.query_params.get('sort')
+        if sort is None:
+            return queryset
+        if sort not in self.list_sorts:
+            raise ValidationError({'sort': [f"Valid sorts are: {', '.join(self.list_sorts)}."]})
+
+        if sort == 'activity':
+            queryset = queryset.filter(last_comment_at__isnull=False)
+        # Not sorted by created, so the page is paginated by limit and offset (see KeysetPagination).
+        return queryset.order_by(*self.list_sorts[sort])
+
     def get_queryset(self):
         assert self.queryset is not None, (
                 "'%s' should either include a `queryset` attribute, "
@@ -46,6 +81,8 @@ class ArticleViewSet(viewsets.ModelViewSet):
 
         # what I added:
         queryset = self.get_asc_or_desc(self.request, self.queryset)
+        if self.action == 'list':
+            queryset = self.get_sorted(self.request, queryset)
 
         if isinstance(queryset, QuerySet):
             # Ensure queryset is re-evaluated on each request.
@@ -58,20 +95,44 @@ class ArticleViewSet(viewsets.ModelViewSet):
         """
         if self.action in ['retrieve']:
             permission_classes = [PublicArticleOrLoggedUser]
-        elif self.action in ['list']:
+        elif self.action in ['list', 'search']:
             permission_classes = []
         else:
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
     def list(self, request, *args, **kwargs):
+        """
+        Pages of the list are cached (see app_articles.cache) together with their validators, they are invalidated
+        whenever an Article is saved or deleted. So a cached page answers plain and conditional GETs with no query.
+        """
+        logged = is_logged(request)
+        cache = get_cache()
+        cache_key = articles_list_cache_key(request, logged, articles_list_version(cache))
+
+        cached = cache.get(cache_key)
+        if cached is not None:
+            data, etag = cached
+            response = not_modified_response(request, etag, None) or Response(data)
+            response['X-Cache'] = 'HIT'
+            return set_validators(response, etag, None)
 
         queryset = self.filter_queryset(self.get_queryset())
 
         # what I added:
-        if not is_logged(request):
+        if not logged:
             queryset = queryset.filter(is_public=True)
 
+        etag, count = queryset_validators(request, queryset, logged)
+        response = not_modified_response(request, etag, None)
+        if response is None:
+            self.paginator.known_count = count
+            response = self.list_articles(queryset)
+            cache.set(cache_key, (response.data, etag), settings.ARTICLES_LIST_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return set_validators(response, etag, None)
+
+    def list_articles(self, queryset):
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
@@ -80,3 +141,23 @@ class ArticleViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        GET /articles/search/?q=<words>: articles containing every word of q in their title or text, most relevant
+        first, with the matches highlighted (see app_articles.search). Anonymous users only find public articles.
+        Paginated with limit and offset, since the results are not sorted by creation date.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': ['This query parameter is required.']})
+
+        queryset = Article.objects.all()
+        if not is_logged(request):
+            queryset = queryset.filter(is_public=True)
+        queryset = search_articles(queryset, query)
+
+        paginator = ArticlesOffsetPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = ArticleSearchSerializer(page, many=True, context={'request': request, 'query': query})
+        return paginator.get_paginated_response(serializer.data)
@@ -0,0 +1,40 @@
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+
+from app_articles.export import EXPORTS, export_lines, gzip_lines
+
+
+class ExportView(APIView):
+    """
+    Streams every article and comment as NDJSON, for indexers and analytics jobs (admins only).
+
+    Query parameters:
+        type: 'article' or 'comment', both of them by default.
+        updated__gt: ISO 8601 datetime, only rows changed after it (content, counts or reports) are exported
+            (incremental export), followed by the tombstones of the rows deleted after it:
+            {"type": ..., "id": ..., "deleted": <datetime>}.
+        gzip=true: the body is gzipped on the fly (Content-Encoding: gzip).
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        types = request.query_params.getlist('type') or None
+        if types and any(name not in EXPORTS for name in types):
+            raise ValidationError({'type': [f"Valid types are: {', '.join(EXPORTS)}."]})
+
+        updated_after = request.query_params.get('updated__gt')
+        if updated_after is not None:
+            updated_after = parse_datetime(updated_after)
+            if updated_after is None:
+                raise ValidationError({'updated__gt': ['Expected an ISO 8601 datetime.']})
+
+        lines = export_lines(types, updated_after)
+        if request.query_params.get('gzip', '').lower() in ('true', '1', 'yes'):
+            response = StreamingHttpResponse(gzip_lines(lines), content_type='application/x-ndjson')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+        return response
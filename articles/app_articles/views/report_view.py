@@ -1,24 +1,40 @@
 from rest_framework.parsers import JSONParser
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.status import HTTP_404_NOT_FOUND, HTTP_400_BAD_REQUEST
 from app_articles.models import Article
-from app_articles.serializers import UserSerializer
+from app_articles.paginations import ReportsPagination
+from app_articles.reports import articles_reports, report_articles
+from app_articles.serializers import UserSerializer, ReporterSerializer, ReportBatchSerializer
+
+
+def query_param_is_true(request, name):
+    return request.query_params.get(name, '').lower() in ('true', '1', 'yes')
 
 
 class ReportViewOneArticle(APIView):
+    # Max SQL queries per http method, checked by app_articles.middleware.QueryBudgetMiddleware.
+    query_budget = {'get': 3, 'post': 7}
+
+    def get_permissions(self):
+        """
+        Anyone may read the reports of an article, but only logged users may report it.
+        """
+        permission_classes = [IsAuthenticated] if self.request.method == 'POST' else []
+        return [permission() for permission in permission_classes]
 
     def post(self, request, article_id):
-        try:
-            article = Article.objects.get(pk=article_id)
-        except Article.DoesNotExist:
+        # Lock, existence, duplicate check and insert are done by report_articles without loading the article reporters.
+        reported, already_reported, not_found = report_articles(self.request.user, [article_id])
+
+        if not_found:
             return Response({"Error": f"Article with ID: {article_id} does not exist."}, status=HTTP_404_NOT_FOUND)
 
-        if self.request.user in article.users_reports.all():
+        if already_reported:
             return Response({"Error": f"Article with ID: {article_id} was already reported by"
                                       f"you, {self.request.user}."}, status=HTTP_400_BAD_REQUEST)
         else:
-            article.users_reports.add(self.request.user)
             return Response({"Success": f"You, the user {self.request.user} has successfully reported the article"
                                         f" with ID: {article_id}. Thanks!"})
 
@@ -33,24 +49,53 @@ class ReportViewOneArticle(APIView):
 
         return Response(
             {
-                f"Reports for Article {article_id}": len(users.data),
+                f"Reports for Article {article_id}": article.report_count,
                 f"Users": users.data
             }
         )
 
 
 class ReportViewAll(APIView):
+    """
+    Reports of every article, built from two queries per page: one for the articles with their report count
+    and one for all of their reporters. Use ?only_reported=true to skip articles that were never reported and
+    ?sort=reports to get the moderation queue (most reported articles first).
+    """
+    pagination_class = ReportsPagination
+    query_budget = {'get': 3}
 
     def get(self, request):
-        response = {}
+        articles = articles_reports(only_reported=query_param_is_true(request, 'only_reported'))
 
-        articles = Article.objects.all()
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(articles, request, view=self)
 
-        for article in articles:
-            users = article.users_reports.all()
-            users = UserSerializer(users, many=True)
-            response[article.pk] = {
-                f"Reports for Article {article.pk}": len(users.data),
+        response = []
+        for article in page:
+            users = ReporterSerializer(article.reporters, many=True)
+            response.append({
+                "Article": article.pk,
+                f"Reports for Article {article.pk}": article.report_count,
                 f"Users": users.data
-            }
-        return Response(response)
+            })
+        return paginator.get_paginated_response(response)
+
+
+class ReportViewBatch(APIView):
+    """
+    Reports many articles in one request. Body: {"articles": [<article_id>, ...]}
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = {'post': 7}
+
+    def post(self, request):
+        serializer = ReportBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        reported, already_reported, not_found = report_articles(self.request.user,
+                                                                serializer.validated_data['articles'])
+        return Response({
+            "Reported": reported,
+            "Already reported": already_reported,
+            "Not found": not_found
+        })
@@ -3,11 +3,17 @@ from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 
+from app_articles.fast_serializers import FastReadMixin
+from app_articles.fieldsets import SparseFieldsetsMixin
 from app_articles.models import CustomUser
 from app_articles.paginations import UsersPagination
 from app_articles.serializers import UserSerializer
+from app_articles.user_import import UserImporter
 
 
 class LoginCustomAuthToken(ObtainAuthToken):
@@ -35,20 +41,23 @@ class LoginCustomAuthToken(ObtainAuthToken):
         })
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(FastReadMixin, SparseFieldsetsMixin, viewsets.ModelViewSet):
     """
     A simple ViewSet for viewing and editing CustomUsers.
+    list and retrieve accept sparse fieldsets: ?fields= and ?exclude= (see app_articles.fieldsets).
     """
     queryset = CustomUser.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = UsersPagination
+    # Max SQL queries per action, checked by app_articles.middleware.QueryBudgetMiddleware.
+    query_budget = {'list': 3, 'retrieve': 2}
 
     # retrieve() was override because we want to return a User depending on the username, not the id
     def retrieve(self, request, *args, **kwargs):
         # DOUBT: How to save the pk as username directly
         username = kwargs['pk'] if len(kwargs) == 1 else None
-        users_list = CustomUser.objects.all()
+        users_list = self.filter_queryset(self.get_queryset())
         user = get_object_or_404(users_list, username=username)
         serializer = self.get_serializer(user)
         return Response(serializer.data)
@@ -57,7 +66,7 @@ class UserViewSet(viewsets.ModelViewSet):
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         username = kwargs['pk'] if len(kwargs) == 1 else None
-        users_list = CustomUser.objects.all()
+        users_list = self.filter_queryset(self.get_queryset())
         instance = get_object_or_404(users_list, username=username)
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
@@ -70,6 +79,19 @@ class UserViewSet(viewsets.ModelViewSet):
 
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Registers many users in one request (admins only). Body: a list of users, with the same fields as POST /users/.
+        Bad rows do not abort the import, they are returned in 'Errors' with their index.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of users.']})
+
+        importer = UserImporter(chunk_size=settings.USER_IMPORT_CHUNK_SIZE, processes=settings.USER_IMPORT_PROCESSES)
+        result = importer.run(request.data)
+        return Response({'Created': result['created'], 'Errors': result['errors']})
+
     def get_permissions(self):
         """
         Instantiates and returns the list of permissions that this view requires.
@@ -10,8 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.1/ref/settings/
 """
 
+import sys
 from pathlib import Path
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -45,7 +47,7 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication'
+        'app_articles.authentication.CachedTokenAuthentication'
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 100
@@ -57,6 +59,9 @@ REST_FRAMEWORK = {
 """
 
 MIDDLEWARE = [
+    # First, so that the queries of every other middleware are counted too.
+    'app_articles.middleware.QueryBudgetMiddleware',
+    'app_articles.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -66,6 +71,12 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Query budget (app_articles.middleware.QueryBudgetMiddleware)
+QUERY_COUNT_HEADERS = config('QUERY_COUNT_HEADERS', default=True, cast=bool)
+QUERY_N_PLUS_ONE_THRESHOLD = config('QUERY_N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+# Raise instead of logging when a view goes over its query_budget. Always on while running the tests.
+QUERY_BUDGET_RAISE = config('QUERY_BUDGET_RAISE', default=sys.argv[1:2] == ['test'], cast=bool)
+
 ROOT_URLCONF = 'articles.urls'
 
 TEMPLATES = [
@@ -98,9 +109,135 @@ DATABASES = {
         'PASSWORD': config('DATABASE_PASSWORD'),
         'HOST': config('DATABASE_HOST'),
         'PORT': config('DATABASE_PORT'),
+        'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=60, cast=int),
+        # Runs sharing a database server (e.g. CI jobs) need a test database each. manage.py test --parallel N adds
+        # _1 ... _N to this name for its workers.
+        'TEST': {'NAME': config('DATABASE_TEST_NAME', default=None)},
+    }
+}
+
+# Persistent connections: every thread keeps its connection open for DATABASE_CONN_MAX_AGE seconds (0 opens one per
+# request). At the start of a request, a connection not checked for DATABASE_HEALTH_CHECK_INTERVAL seconds runs a
+# SELECT 1 and is reopened if it fails (app_articles.connections.check_connections), empty disables the checks.
+DATABASE_HEALTH_CHECK_INTERVAL = config('DATABASE_HEALTH_CHECK_INTERVAL', default='30',
+                                        cast=lambda value: float(value) if value else None)
+
+# Connection pool (app_articles.connections.ConnectionPool), for PostgreSQL and SQLite: DATABASE_POOL=True shares at
+# most DATABASE_POOL_MAX_SIZE connections between the threads of every process. The connections go back to the pool at
+# the end of every request, and a request waiting more than DATABASE_POOL_TIMEOUT seconds for one gets a 503.
+POOLED_DATABASE_ENGINES = {
+    'django.db.backends.postgresql': 'app_articles.pooled_postgresql',
+    'django.db.backends.postgresql_psycopg2': 'app_articles.pooled_postgresql',
+    'django.db.backends.sqlite3': 'app_articles.pooled_sqlite3',
+}
+if config('DATABASE_POOL', default=False, cast=bool):
+    if DATABASES['default']['ENGINE'] not in POOLED_DATABASE_ENGINES:
+        raise ImproperlyConfigured(f"DATABASE_POOL does not support the {DATABASES['default']['ENGINE']} engine, only "
+                                   f"{', '.join(POOLED_DATABASE_ENGINES)}.")
+    DATABASES['default'].update({
+        'ENGINE': POOLED_DATABASE_ENGINES[DATABASES['default']['ENGINE']],
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MAX_SIZE': config('DATABASE_POOL_MAX_SIZE', default=10, cast=int),
+            'TIMEOUT': config('DATABASE_POOL_TIMEOUT', default=5.0, cast=float),
+            'HEALTH_CHECK_INTERVAL': DATABASE_HEALTH_CHECK_INTERVAL,
+        },
+    })
+
+# Read replicas (app_articles.routers.ReplicaRouter): DATABASE_REPLICAS=2 adds the aliases replica_1 and replica_2, with
+# the settings of default but DATABASE_REPLICA_<n>_NAME, _HOST and _PORT. The GET requests read from them, and a client
+# that writes reads from default for DATABASE_REPLICA_PIN_SECONDS. E.g. locally with two SQLite files:
+# DATABASE_REPLICAS=1 DATABASE_REPLICA_1_NAME=replica.sqlite3, and python manage.py copy_sqlite_replicas to replicate.
+
+DATABASE_REPLICAS = []
+for number in range(1, config('DATABASE_REPLICAS', default=0, cast=int) + 1):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'NAME': config(f'DATABASE_REPLICA_{number}_NAME', default=DATABASES['default']['NAME']),
+        'HOST': config(f'DATABASE_REPLICA_{number}_HOST', default=DATABASES['default']['HOST']),
+        'PORT': config(f'DATABASE_REPLICA_{number}_PORT', default=DATABASES['default']['PORT']),
+        # The tests run on the test database only.
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['app_articles.routers.ReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=10, cast=int)
+DATABASE_REPLICA_PIN_CACHE_ALIAS = config('DATABASE_REPLICA_PIN_CACHE_ALIAS', default='default')
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+# Local memory by default (development and tests), e.g. CACHE_BACKEND=django.core.cache.backends.memcached.PyLibMCCache
+# and CACHE_LOCATION=127.0.0.1:11211 in production.
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='articles'),
     }
 }
 
+ARTICLES_CACHE_ALIAS = config('ARTICLES_CACHE_ALIAS', default='default')
+ARTICLES_LIST_CACHE_TIMEOUT = config('ARTICLES_LIST_CACHE_TIMEOUT', default=300, cast=int)
+
+
+# Articles search (app_articles.search): auto uses PostgreSQL full-text search on PostgreSQL and the inverted engine
+# elsewhere, 'postgres' or 'inverted' forces one of them. SEARCH_CONFIG is the PostgreSQL text search configuration.
+SEARCH_ENGINE = config('SEARCH_ENGINE', default='auto')
+SEARCH_CONFIG = config('SEARCH_CONFIG', default='english')
+
+
+# Likes and dislikes of the comments (app_articles.counters). With a flush interval (seconds), the counters are buffered
+# in every process and written in batches of COMMENT_COUNTERS_BATCH_SIZE comments, 0 writes them in the request.
+COMMENT_COUNTERS_FLUSH_INTERVAL = config('COMMENT_COUNTERS_FLUSH_INTERVAL', default=0.0, cast=float)
+COMMENT_COUNTERS_MAX_BUFFER = config('COMMENT_COUNTERS_MAX_BUFFER', default=1000, cast=int)
+COMMENT_COUNTERS_BATCH_SIZE = config('COMMENT_COUNTERS_BATCH_SIZE', default=500, cast=int)
+
+
+# Token authentication cache (app_articles.authentication.CachedTokenAuthentication)
+AUTH_TOKEN_CACHE_ALIAS = config('AUTH_TOKEN_CACHE_ALIAS', default='default')
+AUTH_TOKEN_CACHE_TIMEOUT = config('AUTH_TOKEN_CACHE_TIMEOUT', default=300, cast=int)
+AUTH_TOKEN_LOCAL_CACHE_SIZE = config('AUTH_TOKEN_LOCAL_CACHE_SIZE', default=1024, cast=int)
+# 0 disables the in-process tier.
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = config('AUTH_TOKEN_LOCAL_CACHE_TIMEOUT', default=30, cast=int)
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/3.1/topics/auth/passwords/
+# PASSWORD_HASHER: pbkdf2, argon2 (pip install django[argon2]) or bcrypt (pip install django[bcrypt]). Changing it, or
+# the work factors below, rehashes every password on its next successful login (app_articles.hashers).
+
+TUNED_PASSWORD_HASHERS = {
+    'pbkdf2': 'app_articles.hashers.TunedPBKDF2PasswordHasher',
+    'argon2': 'app_articles.hashers.TunedArgon2PasswordHasher',
+    'bcrypt': 'app_articles.hashers.TunedBCryptSHA256PasswordHasher',
+}
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2')
+# The preferred hasher first (used for new passwords), then the rest, so that every stored password can be checked.
+PASSWORD_HASHERS = [TUNED_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    hasher for name, hasher in TUNED_PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERATIONS = config('PASSWORD_PBKDF2_ITERATIONS', default=216000, cast=int)
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=512, cast=int)
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=2, cast=int)
+PASSWORD_BCRYPT_ROUNDS = config('PASSWORD_BCRYPT_ROUNDS', default=12, cast=int)
+# The tests hash the passwords with MD5, set by their runner only.
+TEST_RUNNER = 'app_articles.tests.runner.TestRunner'
+
+AUTHENTICATION_BACKENDS = ['app_articles.backends.PooledModelBackend']
+# Password hashing of the logins runs in a pool of LOGIN_HASH_WORKERS threads, with LOGIN_HASH_QUEUE logins waiting at
+# most. Logins beyond that, or waiting more than LOGIN_HASH_TIMEOUT seconds, get a 503.
+LOGIN_HASH_WORKERS = config('LOGIN_HASH_WORKERS', default=2, cast=int)
+LOGIN_HASH_QUEUE = config('LOGIN_HASH_QUEUE', default=16, cast=int)
+LOGIN_HASH_TIMEOUT = config('LOGIN_HASH_TIMEOUT', default=5.0, cast=float)
+
+
+# Bulk users registration (app_articles.user_import.UserImporter), 0 processes hashes passwords in the request process.
+USER_IMPORT_CHUNK_SIZE = config('USER_IMPORT_CHUNK_SIZE', default=1000, cast=int)
+USER_IMPORT_PROCESSES = config('USER_IMPORT_PROCESSES', default=0, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
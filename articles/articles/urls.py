@@ -2,7 +2,8 @@ from django.contrib import admin
 from django.urls import path
 from app_articles.views.user_views import UserViewSet, LoginCustomAuthToken
 from app_articles.views.article_views import ArticleViewSet
-from app_articles.views.report_view import ReportViewOneArticle, ReportViewAll
+from app_articles.views.report_view import ReportViewOneArticle, ReportViewAll, ReportViewBatch
+from app_articles.views.export_views import ExportView
 from app_articles.views.article_comment_views import ArticleCommentViewSet, ReplyCommentViewSet
 from rest_framework.routers import DefaultRouter
 
@@ -25,3 +26,5 @@ urlpatterns.append(path('admin/', admin.site.urls))
 urlpatterns.append(path('api/login/', LoginCustomAuthToken.as_view(), name='user_login'))
 urlpatterns.append(path('report/<int:article_id>', ReportViewOneArticle.as_view(), name='report_article_id'))
 urlpatterns.append(path('report/', ReportViewAll.as_view(), name='report_article_all'))
+urlpatterns.append(path('report/batch/', ReportViewBatch.as_view(), name='report_article_batch'))
+urlpatterns.append(path('export/', ExportView.as_view(), name='export'))